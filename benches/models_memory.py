@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""Benchmark the memory used by the models of the listings. It reports the
+bytes allocated per item to build the ``Db*`` objects returned by the
+``InventoryClient`` and the ``*Resp`` objects returned by the API."""
+
+import uuid
+import argparse
+import tracemalloc
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+
+from graph_asset_inventory_api.inventory import (
+    AssetID,
+    AssetTimeAttr,
+    DbAsset,
+    DbOwns,
+    DbParentOf,
+    DbTeam,
+    TeamTimeAttr,
+)
+from graph_asset_inventory_api.api import (
+    AssetResp,
+    OwnsResp,
+    ParentOfResp,
+    TeamResp,
+)
+
+
+def measure(build, num):
+    """Calls ``build(i)`` for every ``i`` in ``range(num)`` and returns the
+    mean number of bytes allocated per item that are still in use."""
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    items = [build(i) for i in range(num)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return (end - start) / num
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the memory used by the listing models.')
+    parser.add_argument(
+        '-n',
+        '--num',
+        type=int,
+        default=100000,
+        help='number of items per model',
+    )
+    args = parser.parse_args()
+
+    # The values are allocated before measuring, so only the models are
+    # accounted for.
+    vids = [str(uuid.uuid4()) for _ in range(args.num)]
+    identifiers = [f'identifier{i}' for i in range(args.num)]
+    now = datetime.now(timezone.utc)
+    times = [now + timedelta(seconds=i) for i in range(args.num)]
+
+    def dbasset(i):
+        time_attr = AssetTimeAttr(times[i], times[i], times[i])
+        return DbAsset(AssetID('type', identifiers[i]), vids[i], time_attr)
+
+    def dbteam(i):
+        return DbTeam(identifiers[i], identifiers[i], vids[i])
+
+    def dbparentof(i):
+        time_attr = AssetTimeAttr(times[i], times[i], times[i])
+        return DbParentOf(vids[i], vids[i], vids[i], time_attr)
+
+    def dbowns(i):
+        return DbOwns(vids[i], vids[i], vids[i], TeamTimeAttr(times[i]))
+
+    benchmarks = [
+        ('DbAsset', dbasset),
+        ('DbTeam', dbteam),
+        ('DbParentOf', dbparentof),
+        ('DbOwns', dbowns),
+        ('AssetResp', lambda i: AssetResp.from_dbasset(dbasset(i))),
+        ('TeamResp', lambda i: TeamResp.from_dbteam(dbteam(i))),
+        (
+            'ParentOfResp',
+            lambda i: ParentOfResp.from_dbparentof(dbparentof(i)),
+        ),
+        ('OwnsResp', lambda i: OwnsResp.from_dbowns(dbowns(i))),
+    ]
+    for name, build in benchmarks:
+        print(f'{name}: {measure(build, args.num):.0f} bytes/item')
+
+
+if __name__ == '__main__':
+    main()
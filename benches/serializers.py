@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+"""Benchmark the serialization of the elements returned by the list endpoints.
+It reports the CPU time per row spent converting the maps returned by gremlin
+into JSON through the ``Db*`` and ``*Resp`` objects, and through the
+serializers with and without validation."""
+
+import json
+import uuid
+import timeit
+import argparse
+from datetime import datetime, timedelta
+
+from gremlin_python.process.traversal import T, Direction
+
+from graph_asset_inventory_api.inventory import (
+    DbAsset,
+    DbOwns,
+    DbParentOf,
+    DbTeam,
+)
+from graph_asset_inventory_api.api import (
+    AssetResp,
+    OwnsResp,
+    ParentOfResp,
+    TeamResp,
+)
+from graph_asset_inventory_api.api.serializers import (
+    asset_dict,
+    owns_dict,
+    parent_of_dict,
+    serializer,
+    team_dict,
+)
+
+
+def element_maps(num):
+    """Returns ``num`` element maps of every kind, like the ones returned by
+    gremlin when using a ``elementMap`` step."""
+    now = datetime.utcnow()
+    vteams, vassets, eparentofs, eowns = [], [], [], []
+    for i in range(num):
+        vid = str(uuid.uuid4())
+        date = now + timedelta(seconds=i)
+        vteams.append({
+            T.id: vid,
+            T.label: 'Team',
+            'identifier': f'identifier{i}',
+            'name': f'name{i}',
+        })
+        vassets.append({
+            T.id: vid,
+            T.label: 'Asset',
+            'type': 'Hostname',
+            'identifier': f'host{i}.example.com',
+            'first_seen': date,
+            'last_seen': date,
+            'expiration': date,
+        })
+        eparentofs.append({
+            T.id: vid,
+            T.label: 'parent_of',
+            Direction.OUT: {T.id: vid, T.label: 'Asset'},
+            Direction.IN: {T.id: vid, T.label: 'Asset'},
+            'first_seen': date,
+            'last_seen': date,
+            'expiration': date,
+        })
+        eowns.append({
+            T.id: vid,
+            T.label: 'owns',
+            Direction.OUT: {T.id: vid, T.label: 'Team'},
+            Direction.IN: {T.id: vid, T.label: 'Asset'},
+            'start_time': date,
+        })
+    return vteams, vassets, eparentofs, eowns
+
+
+def measure(convert, elements, repeat):
+    """Returns the minimum CPU time in microseconds per element of converting
+    ``elements`` with ``convert`` and encoding them as JSON."""
+    def run():
+        for element in elements:
+            json.dumps(convert(element))
+
+    times = timeit.repeat(run, timer=timeit.time.process_time,
+                          number=1, repeat=repeat)
+    return min(times) / len(elements) * 1e6
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the serialization of the listings.')
+    parser.add_argument(
+        '-n',
+        '--num',
+        type=int,
+        default=10000,
+        help='number of rows per element kind',
+    )
+    parser.add_argument(
+        '-r',
+        '--repeat',
+        type=int,
+        default=5,
+        help='number of repetitions; the fastest one is reported',
+    )
+    args = parser.parse_args()
+
+    vteams, vassets, eparentofs, eowns = element_maps(args.num)
+    benchmarks = [
+        (
+            'team',
+            vteams,
+            lambda v: TeamResp.from_dbteam(DbTeam.from_vteam(v)).__dict__,
+            team_dict,
+        ),
+        (
+            'asset',
+            vassets,
+            lambda v: AssetResp.from_dbasset(DbAsset.from_vasset(v)).__dict__,
+            asset_dict,
+        ),
+        (
+            'parent_of',
+            eparentofs,
+            lambda e: ParentOfResp.from_dbparentof(
+                DbParentOf.from_eparentof(e)).__dict__,
+            parent_of_dict,
+        ),
+        (
+            'owns',
+            eowns,
+            lambda e: OwnsResp.from_dbowns(DbOwns.from_eowns(e)).__dict__,
+            owns_dict,
+        ),
+    ]
+    for name, elements, objects, to_dict in benchmarks:
+        before = measure(objects, elements, args.repeat)
+        strict = measure(serializer(to_dict), elements, args.repeat)
+        trusted = measure(serializer(to_dict, True), elements, args.repeat)
+        print(f'{name}: objects {before:.2f} us/row, '
+              f'strict {strict:.2f} us/row, '
+              f'trusted {trusted:.2f} us/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,26 @@
 """Provides a REST API to interact with an asset inventory."""
 
+import json
+import base64
+import binascii
+from datetime import datetime
+
+from graph_asset_inventory_api.inventory.fields import check_fields
+
+
+class _SlotsResp:
+    """Base class of the API responses of teams, assets and relationships.
+    They are built for every element of a listing, so they define
+    ``__slots__`` instead of having an instance dict. The ``__dict__``
+    property returns the dict of their fields, so they are serialized as
+    before."""
+
+    __slots__ = ()
+
+    @property
+    def __dict__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 # Teams.
 
@@ -23,9 +44,11 @@ class TeamReq:
         return self.identifier == o.identifier and self.name == o.name
 
 
-class TeamResp:
+class TeamResp(_SlotsResp):
     """Represents a team from the point of view of an API response."""
 
+    __slots__ = ('id', 'identifier', 'name')
+
     def __init__(self, id_, identifier, name):
         self.id = id_
         self.identifier = identifier
@@ -76,9 +99,18 @@ class AssetReq:
             self.timestamp == o.timestamp and self.expiration == o.expiration
 
 
-class AssetResp:
+class AssetResp(_SlotsResp):
     """Represents an asset from the point of view of an API response."""
 
+    __slots__ = (
+        'id',
+        'type',
+        'identifier',
+        'first_seen',
+        'last_seen',
+        'expiration',
+    )
+
     def __init__(self, id_, asset_id, time_attr):
         self.id = id_
         self.type = asset_id.type
@@ -137,10 +169,19 @@ class ParentOfReq:
             self.expiration == o.expiration
 
 
-class ParentOfResp:
+class ParentOfResp(_SlotsResp):
     """Represents a ``parent_of`` relationship from the point of view of an API
     response."""
 
+    __slots__ = (
+        'id',
+        'parent_id',
+        'child_id',
+        'first_seen',
+        'last_seen',
+        'expiration',
+    )
+
     def __init__(self, id_, parent_id, child_id, time_attr):
         self.id = id_
         self.parent_id = parent_id
@@ -206,10 +247,12 @@ class OwnsReq:
         return self.start_time == o.start_time and self.end_time == o.end_time
 
 
-class OwnsResp:
+class OwnsResp(_SlotsResp):
     """Represents an ``owns`` relationship from the point of view of an API
     response."""
 
+    __slots__ = ('id', 'team_id', 'asset_id', 'start_time', 'end_time')
+
     def __init__(self, id_, team_id, asset_id, time_attr):
         self.id = id_
         self.team_id = team_id
@@ -247,3 +290,175 @@ class OwnsResp:
             dbowns.asset_vid,
             dbowns.time_attr,
         )
+
+
+# Subgraphs.
+
+
+def subgraph_resp(dbsubgraph):
+    """Returns the dict of the response of a ``DbSubgraph``."""
+    return {
+        'teams': [TeamResp.from_dbteam(t).__dict__ for t in dbsubgraph.teams],
+        'assets': [
+            AssetResp.from_dbasset(a).__dict__ for a in dbsubgraph.assets
+        ],
+        'parent_of': [
+            ParentOfResp.from_dbparentof(po).__dict__
+            for po in dbsubgraph.parentofs
+        ],
+        'owns': [OwnsResp.from_dbowns(o).__dict__ for o in dbsubgraph.owns],
+        'truncated': dbsubgraph.truncated,
+    }
+
+
+# Jobs.
+
+
+class JobResp:
+    """Represents a bulk job from the point of view of an API response. The
+    ``progress`` of the job is a dict with the number of assets of the job,
+    ``assets_total``, the number of assets inserted without errors,
+    ``assets_done``, and the number of relationships created,
+    ``edges_done``."""
+
+    def __init__(
+        self,
+        id_,
+        status,
+        progress,
+        errors,
+        errors_total,
+        detail=None,
+    ):  # pylint: disable=too-many-arguments
+        self.id = id_
+        self.status = status
+        self.progress = progress
+        self.errors = errors
+        self.errors_total = errors_total
+        self.detail = detail
+
+    def __repr__(self):
+        return f'{{id: {self.id}, ' \
+               f'status: {self.status}, ' \
+               f'progress: {self.progress}, ' \
+               f'errors: {self.errors}, ' \
+               f'errors_total: {self.errors_total}, ' \
+               f'detail: {self.detail}}}'
+
+    def __str__(self):
+        return f'{self.id}-{self.status}'
+
+    def __eq__(self, o):
+        if not isinstance(self, o.__class__):
+            return False
+        return self.id == o.id and \
+            self.status == o.status and \
+            self.progress == o.progress and \
+            self.errors == o.errors and \
+            self.errors_total == o.errors_total and \
+            self.detail == o.detail
+
+    @classmethod
+    def from_state(cls, job_id, state):
+        """Creates a ``JobResp`` from the state of a job returned by
+        ``BulkJobSpool``."""
+        progress = {
+            'assets_total': state['assets_total'],
+            'assets_done': state['assets_done'],
+            'edges_done': state['edges_done'],
+        }
+        return cls(
+            job_id,
+            state['status'],
+            progress,
+            state['errors'],
+            state['errors_total'],
+            state.get('detail'),
+        )
+
+
+# Fields.
+
+
+def request_fields(fields, allowed):
+    """Returns the fields requested with the ``fields`` query parameter, as
+    returned by ``check_fields``, or ``None`` if the parameter was not
+    specified. If any field is not in ``allowed``, a ``ValueError`` exception
+    is raised."""
+    if fields is None:
+        return None
+    return check_fields(fields, allowed)
+
+
+def fields_resp(values):
+    """Returns the response of an element read with only some fields.
+    ``values`` is the dict of fields returned by the ``InventoryClient``."""
+    return {
+        field: value.isoformat() if isinstance(value, datetime) else value
+        for field, value in values.items()
+    }
+
+
+# Lookups.
+
+
+def lookup_resp(keys, found, to_dict):
+    """Returns the response of a lookup of ``keys``. ``found`` is the dict,
+    keyed by the elements of ``keys``, returned by the ``InventoryClient``.
+    The elements are converted with ``to_dict`` and returned in the order of
+    ``keys``. The keys that were not found are returned as ``None``."""
+    resp = []
+    for key in keys:
+        element = found.get(key)
+        resp.append(to_dict(element) if element is not None else None)
+    return resp
+
+
+def lookup_error(body, by_vid, by_key):
+    """Returns the error of a lookup request if ``body`` does not contain
+    exactly one of the lists ``by_vid`` and ``by_key``. Otherwise, it returns
+    ``None``."""
+    if (by_vid in body) == (by_key in body):
+        return f'exactly one of {by_vid} and {by_key} must be specified'
+    return None
+
+
+# Pagination.
+
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+"""Response header that contains the cursor of the next page."""
+
+
+def encode_cursor(id_):
+    """Returns the opaque cursor that points to the element with ID
+    ``id_``."""
+    return base64.urlsafe_b64encode(json.dumps(id_).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Returns the ID of the element pointed by ``cursor``. If ``cursor`` is
+    None, it returns None. If the cursor is not valid, a ``ValueError``
+    exception is raised."""
+    if cursor is None:
+        return None
+
+    try:
+        id_ = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error) as e:
+        raise ValueError('invalid cursor') from e
+
+    if isinstance(id_, bool) or not isinstance(id_, (str, int)):
+        raise ValueError('invalid cursor')
+
+    return id_
+
+
+def pagination_headers(ids, size, paginated):
+    """Returns the headers of the response of a paginated list endpoint.
+    ``ids`` is the list of IDs of the elements in the page. If the request was
+    ``paginated`` and the page is full, the ``X-Next-Cursor`` header contains
+    the cursor of the next page."""
+    if not paginated or len(ids) < size or len(ids) == 0:
+        return {}
+    return {NEXT_CURSOR_HEADER: encode_cursor(ids[-1])}
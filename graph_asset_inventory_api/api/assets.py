@@ -11,7 +11,22 @@ from graph_asset_inventory_api.inventory import (
     NotFoundError,
     ConflictError,
 )
-from graph_asset_inventory_api.api import AssetResp
+from graph_asset_inventory_api.api import (
+    AssetResp,
+    decode_cursor,
+    pagination_headers,
+    request_fields,
+    fields_resp,
+    lookup_resp,
+    lookup_error,
+    subgraph_resp,
+)
+from graph_asset_inventory_api.api.streaming import stream_list
+from graph_asset_inventory_api.api.serializers import (
+    app_serializer,
+    asset_dict,
+)
+from graph_asset_inventory_api.inventory.fields import ASSET_FIELDS
 
 
 def get_assets(
@@ -19,17 +34,74 @@ def get_assets(
     size=100,
     asset_type=None,
     asset_identifier=None,
-    valid_at=None
-):
-    """Request handler for the API endpoint ``GET /v1/assets``."""
+    valid_at=None,
+    cursor=None,
+    fields=None,
+):  # pylint: disable=too-many-arguments
+    """Request handler for the API endpoint ``GET /v1/assets``. If the
+    request is not paginated, the assets are streamed."""
     cli = get_inventory_client()
 
     if valid_at is not None:
         valid_at = dateutil.parser.isoparse(valid_at)
 
-    assets = cli.assets(page, size, asset_type, asset_identifier, valid_at)
+    try:
+        after = decode_cursor(cursor)
+        fields = request_fields(fields, ASSET_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
 
-    resp = [AssetResp.from_dbasset(t).__dict__ for t in assets]
+    # The asset vertices are serialized straight into the dicts of the
+    # response.
+    convert = app_serializer(asset_dict)
+    to_resp = None if fields is None else fields_resp
+
+    if page is None and after is None:
+        assets = cli.stream_assets(
+            asset_type,
+            asset_identifier,
+            valid_at,
+            fields=fields,
+            convert=convert,
+        )
+        return stream_list(assets, to_resp)
+
+    assets = cli.assets(
+        page,
+        size,
+        asset_type,
+        asset_identifier,
+        valid_at,
+        after=after,
+        fields=fields,
+        convert=convert,
+    )
+
+    resp = assets if to_resp is None else [to_resp(a) for a in assets]
+    headers = pagination_headers(
+        [a['id'] for a in resp], size, page is not None or after is not None)
+    return resp, 200, headers
+
+
+def post_assets_lookup(body):
+    """Request handler for the API endpoint ``POST /v1/assets/lookup``. The
+    assets are looked up by vertex ID or by type and identifier, using a
+    single traversal."""
+    cli = get_inventory_client()
+
+    err = lookup_error(body, 'ids', 'asset_ids')
+    if err is not None:
+        return connexion.problem(400, 'Bad Request', err)
+
+    if 'ids' in body:
+        keys = body['ids']
+        assets = cli.asset_vids(keys)
+    else:
+        keys = [AssetID(a['type'], a['identifier']) for a in body['asset_ids']]
+        assets = cli.asset_ids(keys)
+
+    resp = lookup_resp(
+        keys, assets, lambda a: AssetResp.from_dbasset(a).__dict__)
     return resp, 200
 
 
@@ -55,20 +127,43 @@ def post_assets(body):
     return resp, 201
 
 
-def get_assets_id(id):  # pylint: disable=redefined-builtin
+def get_assets_id(id, fields=None):  # pylint: disable=redefined-builtin
     """Request handler for the API endpoint ``GET /v1/assets/{id}``."""
     cli = get_inventory_client()
 
+    try:
+        fields = request_fields(fields, ASSET_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
+
     asset = None
     try:
-        asset = cli.asset(id)
+        asset = cli.asset(id, fields)
     except NotFoundError:
         return connexion.problem(404, 'Not Found', 'ID not found')
 
+    if fields is not None:
+        return fields_resp(asset), 200
+
     resp = AssetResp.from_dbasset(asset).__dict__
     return resp, 200
 
 
+# pylint: disable=redefined-builtin
+def get_assets_id_subgraph(id, depth=1, max_nodes=500):
+    """Request handler for the API endpoint ``GET
+    /v1/assets/{id}/subgraph``."""
+    cli = get_inventory_client()
+
+    subgraph = None
+    try:
+        subgraph = cli.subgraph(id, depth, max_nodes)
+    except NotFoundError:
+        return connexion.problem(404, 'Not Found', 'ID not found')
+
+    return subgraph_resp(subgraph), 200
+
+
 def delete_assets_id(id):  # pylint: disable=redefined-builtin
     """Request handler for the API endpoint ``DELETE /v1/assets/{id}``."""
     cli = get_inventory_client()
@@ -1,94 +1,344 @@
 """This module implements the request handler for the assets' bulk insert
 endpoint of the Asset Inventory API."""
 
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
 import dateutil.parser
 import connexion.problem
+from flask import current_app
 
-from graph_asset_inventory_api.context import get_inventory_client
+from graph_asset_inventory_api.context import (
+    get_inventory_client,
+    get_inventory_client_pool,
+    get_bulk_job_runner,
+)
 from graph_asset_inventory_api.inventory import (
     Asset,
     AssetID,
     ParentOf,
+    BatchItem,
     NotFoundError,
 )
+from graph_asset_inventory_api.inventory.pool import PoolExhaustedError
+from graph_asset_inventory_api.api import JobResp
+
+
+DEFAULT_CHUNK_SIZE = 10
+"""Default number of assets or relationships updated by every graph traversal.
+Every upsert adds around 3KB to the request, so the chunk size is bounded by
+the maximum request size accepted by the Gremlin server."""
+
+DEFAULT_ACQUIRE_TIMEOUT = 10
+"""Default number of seconds a bulk insert waits for every additional client
+of the pool."""
+
+LOOKUP_CHUNK_SIZE = 500
+"""Number of asset ids resolved by every graph traversal when looking up the
+parents that are not part of the bulk request."""
 
 
 class ApiBulkAssetInsert:
-    """This class implements the bulk insert functionality for assets."""
+    """This class implements the bulk insert functionality for assets.
+
+    If ``concurrency`` is greater than one, the work of every pass is split in
+    ``concurrency`` partitions that are processed in parallel. The first
+    partition is processed with ``inventory_client`` in the current thread and
+    every other one by a thread with its own ``InventoryClient`` acquired from
+    ``pool``. If a client cannot be acquired in ``acquire_timeout`` seconds, a
+    ``PoolExhaustedError`` exception is raised, so concurrent bulk inserts
+    holding a client never wait forever for each other. The assets are
+    partitioned by ``AssetID`` and the relationships by their child, so the
+    same asset is never updated by two threads at the same time, neither
+    directly nor by linking it to its parents. The
+    relationships are only created after all the assets have been updated and
+    all the parents have been resolved."""
+
+    def __init__(
+        self,
+        inventory_client,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        concurrency=1,
+        pool=None,
+        acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT,
+    ):  # pylint: disable=too-many-arguments
+        if chunk_size < 1:
+            raise ValueError('chunk size must be greater than zero')
+        if concurrency < 1:
+            raise ValueError('concurrency must be greater than zero')
+        if concurrency > 1 and pool is None:
+            raise ValueError('parallel mode requires a pool of clients')
 
-    def __init__(self, inventory_client):
         self.cli = inventory_client
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.pool = pool
+        self.acquire_timeout = acquire_timeout
         self.cache = {}
 
     def insert(self, assets_req):
-        """Insert assets in bulk mode."""
+        """Insert assets in bulk mode. The assets and relationships that appear
+        several times in the request are merged, so every one of them is
+        written once."""
         self._set_assets(assets_req)
+        self._resolve_parents(assets_req)
+        self._set_parents(self._parent_ofs(assets_req))
 
-        for asset_req in assets_req:
-            if 'parents' not in asset_req:
-                continue
+    def _set_assets(self, assets_req):
+        """Updates the assets in the bulk request. If the asset does not exist,
+        it is created. The occurrences of the same asset are merged before
+        sending the assets to the graph in chunks of ``chunk_size`` elements.
+        It also updates the internal cache with every operation."""
+        now = datetime.now(timezone.utc)
+        merged = _merge_time_attrs(
+            (AssetID(r['type'], r['identifier']), *_time_attrs(r, now))
+            for r in assets_req
+        )
+        upserts = [
+            BatchItem(Asset(asset_id), expiration, timestamp, first_seen)
+            for asset_id, (expiration, timestamp, first_seen) in merged.items()
+        ]
 
-            # ``child_id`` must be in the cache, given that all the assets are
-            # created or updated in the first pass.
-            child_id = AssetID(asset_req['type'], asset_req['identifier'])
-            child_vid = self.cache[child_id]
+        partitions = self._partition(upserts, lambda u: u.element.asset_id)
+        for vids in self._run(self._set_assets_partition, partitions):
+            self.cache.update(vids)
 
-            self._set_parents(child_vid, asset_req['parents'])
+    def _set_assets_partition(self, cli, upserts):
+        """Updates the assets of a partition in chunks of ``chunk_size``
+        elements using ``cli``. It returns the list of ``(asset_id, vid)``
+        tuples of the updated assets."""
+        vids = []
+        for start in range(0, len(upserts), self.chunk_size):
+            chunk = upserts[start:start + self.chunk_size]
+            updated_assets = cli.set_assets(chunk)
+            for item, (vid, _) in zip(chunk, updated_assets):
+                vids.append((item.element.asset_id, vid))
+        return vids
 
-    def _set_assets(self, assets_req):
-        """Updates the assets in the bulk request. If the asset does not exist,
-        it is created. It also updates the internal cache with every
-        operation."""
+    def _resolve_parents(self, assets_req):
+        """Looks up the parents in the bulk request that are not in the cache
+        and updates the cache with their vertex IDs. If any of the parents does
+        not exist, a ``NotFoundError`` exception is raised."""
+        missing = self._lookup_parents(assets_req)
+        if len(missing) > 0:
+            raise NotFoundError(', '.join(sorted(str(a) for a in missing)))
+
+    def _lookup_parents(self, assets_req):
+        """Looks up the parents in the bulk request that are not in the cache
+        and updates the cache with their vertex IDs. The asset ids are resolved
+        in chunks of ``LOOKUP_CHUNK_SIZE`` elements. It returns the set of
+        ``AssetID`` of the parents that do not exist."""
+        unknown = set()
         for asset_req in assets_req:
-            asset_id = AssetID(asset_req['type'], asset_req['identifier'])
-            asset = Asset(asset_id)
+            for parent_req in asset_req.get('parents', []):
+                parent_id = AssetID(
+                    parent_req['type'], parent_req['identifier'])
+                if parent_id not in self.cache:
+                    unknown.add(parent_id)
 
-            expiration = dateutil.parser.isoparse(asset_req['expiration'])
-            timestamp = None
-            if 'timestamp' in asset_req:
-                timestamp = dateutil.parser.isoparse(asset_req['timestamp'])
+        unknown = list(unknown)
+        partitions = self._partition(unknown, lambda a: a)
+        for vids in self._run(self._resolve_parents_partition, partitions):
+            self.cache.update(vids)
 
-            updated_asset, _ = self.cli.set_asset(asset, expiration, timestamp)
-            self.cache[asset_id] = updated_asset.vid
+        return {a for a in unknown if a not in self.cache}
 
-    def _set_parents(self, child_vid, parents_req):
+    @staticmethod
+    def _resolve_parents_partition(cli, asset_ids):
+        """Looks up the asset ids of a partition in chunks of
+        ``LOOKUP_CHUNK_SIZE`` elements using ``cli``. It returns the list of
+        ``(asset_id, vid)`` tuples of the assets found."""
+        vids = []
+        for start in range(0, len(asset_ids), LOOKUP_CHUNK_SIZE):
+            chunk = asset_ids[start:start + LOOKUP_CHUNK_SIZE]
+            for asset_id, asset in cli.asset_ids(chunk).items():
+                vids.append((asset_id, asset.vid))
+        return vids
+
+    def _parent_ofs(self, assets_req):
+        """Returns the list of ``BatchItem`` corresponding to the ``parent_of``
+        relationships in the bulk request. The occurrences of the same
+        relationship are merged."""
+        now = datetime.now(timezone.utc)
+
+        observations = []
+        for asset_req in assets_req:
+            child_id = AssetID(asset_req['type'], asset_req['identifier'])
+            for parent_req in asset_req.get('parents', []):
+                parent_id = AssetID(
+                    parent_req['type'], parent_req['identifier'])
+                observations.append(
+                    ((parent_id, child_id), *_time_attrs(parent_req, now)))
+
+        # The assets and the parents must be in the cache, given that all of
+        # them are created or resolved before creating the relationships.
+        return [
+            BatchItem(
+                ParentOf(self.cache[parent_id], self.cache[child_id]),
+                expiration,
+                timestamp,
+                first_seen,
+            )
+            for (parent_id, child_id), (expiration, timestamp, first_seen)
+            in _merge_time_attrs(observations).items()
+        ]
+
+    def _set_parents(self, parentofs):
         """Updates the ``parent_of`` relationships in the bulk request. If the
-        relationship does not exist, it is created."""
-        for parent_req in parents_req:
-            parent_id = AssetID(parent_req['type'], parent_req['identifier'])
-            parent_vid = self._get_asset_vid(parent_id)
+        relationship does not exist, it is created. The relationships are sent
+        to the graph in chunks of ``chunk_size`` elements. If any of the assets
+        does not exist, a ``NotFoundError`` exception is raised after
+        processing all the chunks."""
+        missing = self._update_parents(parentofs)
+        if len(missing) > 0:
+            raise NotFoundError(', '.join(str(v) for v in sorted(missing)))
+
+    def _update_parents(self, parentofs):
+        """Updates the ``parent_of`` relationships in ``parentofs`` like
+        ``_set_parents``, but it returns the set of vertex IDs of the assets
+        that do not exist instead of raising an exception. The relationships
+        whose assets exist are updated anyway."""
+        partitions = self._partition(parentofs, lambda p: p.element.child_vid)
+
+        missing = set()
+        for partition_missing in self._run(
+                self._set_parents_partition, partitions):
+            missing.update(partition_missing)
+        return missing
+
+    def _set_parents_partition(self, cli, parentofs):
+        """Updates the ``parent_of`` relationships of a partition in chunks of
+        ``chunk_size`` elements using ``cli``. It returns the set of vertex IDs
+        of the assets that do not exist."""
+        missing = set()
+        for start in range(0, len(parentofs), self.chunk_size):
+            chunk = parentofs[start:start + self.chunk_size]
+            _, chunk_missing = cli.set_parent_ofs(chunk)
+            missing.update(chunk_missing)
+        return missing
+
+    def _partition(self, items, key):
+        """Splits ``items`` in up to ``concurrency`` non-empty partitions. All
+        the items with the same ``key`` belong to the same partition and keep
+        their relative order."""
+        if self.concurrency == 1:
+            return [items] if len(items) > 0 else []
+
+        partitions = [[] for _ in range(self.concurrency)]
+        for item in items:
+            partitions[hash(key(item)) % self.concurrency].append(item)
+        return [p for p in partitions if len(p) > 0]
+
+    def _run(self, func, partitions):
+        """Calls ``func(cli, partition)`` for every partition and returns the
+        list of results. The first partition is processed in the current
+        thread with the client of the bulk insert. The rest are processed in
+        parallel, each one with a client acquired from the pool, so the bulk
+        insert only waits for the clients it does not hold yet."""
+        if len(partitions) <= 1:
+            return [func(self.cli, p) for p in partitions]
+
+        with ThreadPoolExecutor(max_workers=len(partitions) - 1) as executor:
+            futures = [
+                executor.submit(self._run_with_pool, func, p)
+                for p in partitions[1:]
+            ]
+            results = [func(self.cli, partitions[0])]
+            return results + [f.result() for f in futures]
 
-            parentof = ParentOf(parent_vid, child_vid)
+    def _run_with_pool(self, func, partition):
+        """Calls ``func(cli, partition)`` with a client acquired from the pool.
+        The client is released after the call. If the call fails, the client
+        is checked by the pool before being used again. If no client is
+        released in ``acquire_timeout`` seconds, a ``PoolExhaustedError``
+        exception is raised."""
+        cli = self.pool.acquire(self.acquire_timeout)
+        healthy = False
+        try:
+            result = func(cli, partition)
+            healthy = True
+            return result
+        finally:
+            self.pool.release(cli, healthy=healthy)
 
-            expiration = dateutil.parser.isoparse(parent_req['expiration'])
-            timestamp = None
-            if 'timestamp' in parent_req:
-                timestamp = dateutil.parser.isoparse(parent_req['timestamp'])
 
-            self.cli.set_parent_of(parentof, expiration, timestamp)
+def _time_attrs(req, now):
+    """Returns the tuple ``(expiration, timestamp)`` of an asset or
+    relationship in a bulk request. If the timestamp is not specified, ``now``
+    is used."""
+    expiration = dateutil.parser.isoparse(req['expiration'])
+    timestamp = now
+    if 'timestamp' in req:
+        timestamp = dateutil.parser.isoparse(req['timestamp'])
+    return expiration, timestamp
 
-    def _get_asset_vid(self, asset_id):
-        """Returns the ``vid`` corresponding to the passed ``asset_id``. First,
-        it tries to retrieve it from the cache. If it is not found, a DB query
-        is executed and the cache updated."""
-        if asset_id in self.cache:
-            return self.cache[asset_id]
 
-        asset = self.cli.asset_id(asset_id)
-        self.cache[asset_id] = asset.vid
-        return asset.vid
+def _merge_time_attrs(observations):
+    """Merges the observations of the same element. ``observations`` is an
+    iterable of ``(key, expiration, timestamp)`` tuples. It returns a dict,
+    ordered by first appearance, that maps every key to a tuple ``(expiration,
+    timestamp, first_seen)``, where ``first_seen`` is the earliest timestamp,
+    ``timestamp`` is the latest one and ``expiration`` is the expiration of the
+    first observation with the latest timestamp. These are the same time
+    attributes that result from writing the observations in order. If the
+    expiration of any observation is before its timestamp, a ``ValueError``
+    exception is raised."""
+    merged = {}
+    for key, expiration, timestamp in observations:
+        if expiration < timestamp:
+            raise ValueError('expiration before timestamp')
+
+        if key not in merged:
+            merged[key] = (expiration, timestamp, timestamp)
+            continue
+
+        last_expiration, last_seen, first_seen = merged[key]
+        if timestamp > last_seen:
+            last_expiration, last_seen = expiration, timestamp
+        merged[key] = (last_expiration, last_seen, min(first_seen, timestamp))
+
+    return merged
+
+
+def bulk_concurrency(pool):
+    """Returns the number of partitions processed in parallel by a bulk
+    request. One of them uses the client of ``pool`` held by the request, so
+    the number is bounded by the size of the pool."""
+    return max(1, min(current_app.config['BULK_CONCURRENCY'], pool.size))
 
 
 def post_assets_bulk(body):
     """Request handler for the API endpoint ``GET /v1/assets/bulk``."""
 
     cli = get_inventory_client()
+    pool = get_inventory_client_pool()
+    chunk_size = current_app.config['BULK_CHUNK_SIZE']
 
     try:
-        ApiBulkAssetInsert(cli).insert(body['assets'])
+        ApiBulkAssetInsert(
+            cli,
+            chunk_size,
+            bulk_concurrency(pool),
+            pool,
+            current_app.config['BULK_ACQUIRE_TIMEOUT'],
+        ).insert(body['assets'])
     except NotFoundError as e:
         return connexion.problem(404, 'Not Found', f'not found: {e.name}')
     except ValueError as e:
         return connexion.problem(400, 'Bad Request', str(e))
+    except PoolExhaustedError:
+        return connexion.problem(
+            503, 'Service Unavailable', 'no graph connection available')
 
     return '', 204
+
+
+def post_assets_bulk_jobs(body):
+    """Request handler for the API endpoint ``POST /v1/assets/bulk/jobs``."""
+    runner = get_bulk_job_runner()
+
+    job_id = runner.spool.create(body['assets'])
+    runner.submit(job_id)
+
+    resp = JobResp.from_state(job_id, runner.spool.state(job_id)).__dict__
+    return resp, 202, {'Location': f'/v1/jobs/{job_id}'}
@@ -0,0 +1,306 @@
+"""This module implements the request handler for the streaming version of the
+assets' bulk insert endpoint of the Asset Inventory API.
+
+The request body is a NDJSON document where every line is an asset with the
+same format as the items of the ``assets`` field of ``POST /v1/assets/bulk``.
+The document is read and validated line by line and the assets are inserted in
+batches of ``BATCH_SIZE`` lines, so the memory used by a request does not
+depend on the size of the document."""
+
+import json
+import tempfile
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from collections import OrderedDict
+
+import dateutil.parser
+import jsonschema
+from flask import current_app, request, Response
+
+from graph_asset_inventory_api.context import (
+    get_inventory_client,
+    get_inventory_client_pool,
+)
+from graph_asset_inventory_api.inventory import AssetID
+from graph_asset_inventory_api.inventory.pool import PoolExhaustedError
+from graph_asset_inventory_api.api.assets_bulk import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_ACQUIRE_TIMEOUT,
+    ApiBulkAssetInsert,
+    bulk_concurrency,
+)
+from graph_asset_inventory_api.api.streaming import NDJSON_MIMETYPE
+
+
+BATCH_SIZE = 100
+"""Number of lines of the request that are inserted together."""
+
+DEFAULT_CACHE_SIZE = 10000
+"""Default maximum number of vertex IDs cached by a streaming bulk insert."""
+
+SPOOL_MAX_SIZE = 1024 * 1024
+"""Size in bytes of the results kept in memory before spooling them to
+disk."""
+
+
+class LRUCache:
+    """Mapping of bounded size. When it is full, the least recently used
+    entry is evicted."""
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError('cache size must be greater than zero')
+
+        self.size = size
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Returns the value of ``key`` or ``None`` if it is not in the
+        cache."""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key, value):
+        """Sets the value of ``key``, evicting the least recently used entry if
+        the cache is full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all the entries of the cache."""
+        self._entries.clear()
+
+
+class ApiBulkAssetStreamInsert(ApiBulkAssetInsert):
+    """This class implements the streaming bulk insert functionality for
+    assets. The vertex IDs of the assets are kept in a ``LRUCache`` of
+    ``cache_size`` entries shared by all the batches, while ``cache`` only
+    holds the vertex IDs of the current batch."""
+
+    def __init__(
+        self,
+        inventory_client,
+        schema,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        concurrency=1,
+        pool=None,
+        cache_size=DEFAULT_CACHE_SIZE,
+        acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT,
+    ):  # pylint: disable=too-many-arguments
+        super().__init__(
+            inventory_client, chunk_size, concurrency, pool, acquire_timeout)
+        self.validator = jsonschema.Draft4Validator(
+            schema, format_checker=jsonschema.draft4_format_checker)
+        self.lru = LRUCache(cache_size)
+        self.edges_done = 0
+
+    def insert_stream(self, lines, out=None, start=1):
+        """Inserts the assets in ``lines``, an iterable of NDJSON lines. For
+        every non-empty line, a NDJSON result with the format ``{"line": 1,
+        "status": 204}`` is written to the binary file ``out``, in the same
+        order as the lines. If the line could not be inserted, the result also
+        contains a ``detail`` field. The lines are numbered from ``start``."""
+        batch = []
+        for lineno, line in enumerate(lines, start):
+            if len(line.strip()) == 0:
+                continue
+
+            try:
+                batch.append((lineno, self._parse_line(line), None))
+            except ValueError as e:
+                batch.append((lineno, None, (400, str(e))))
+
+            if len(batch) >= BATCH_SIZE:
+                self._insert_batch(batch, out)
+                batch = []
+
+        if len(batch) > 0:
+            self._insert_batch(batch, out)
+
+    def _parse_line(self, line):
+        """Parses and validates a line of the request. If the line is not
+        valid, a ``ValueError`` exception is raised."""
+        try:
+            asset_req = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f'invalid JSON: {e}') from e
+
+        try:
+            self.validator.validate(asset_req)
+        except jsonschema.ValidationError as e:
+            raise ValueError(e.message) from e
+
+        # Check the dates in advance, so an invalid line does not make the
+        # whole batch fail. The missing timestamps are set to the time the
+        # line was read.
+        now = datetime.now(timezone.utc)
+        for req in [asset_req] + asset_req.get('parents', []):
+            if 'timestamp' not in req:
+                req['timestamp'] = now.isoformat()
+            expiration = dateutil.parser.isoparse(req['expiration'])
+            timestamp = dateutil.parser.isoparse(req['timestamp'])
+            if expiration < timestamp:
+                raise ValueError('expiration before timestamp')
+
+        return asset_req
+
+    def _insert_batch(self, batch, out):
+        """Inserts the valid lines of ``batch``, a list of ``(lineno,
+        asset_req, error)`` tuples, and returns the list of results of every
+        line. If ``out`` is not ``None``, the results are also written to
+        it."""
+        errors = {lineno: err for lineno, _, err in batch if err is not None}
+        lines = [(lineno, r) for lineno, r, err in batch if err is None]
+
+        lines = self._insert_assets(lines, errors)
+        self._insert_parents(lines, errors)
+
+        results = []
+        for lineno, _, _ in batch:
+            result = {'line': lineno, 'status': 204}
+            if lineno in errors:
+                result['status'], result['detail'] = errors[lineno]
+            results.append(result)
+
+        if out is not None:
+            for result in results:
+                out.write(json.dumps(result).encode() + b'\n')
+
+        return results
+
+    def _insert_assets(self, lines, errors):
+        """Updates the assets of ``lines``, a list of ``(lineno, asset_req)``
+        tuples, and resolves their parents. The lines with parents that do not
+        exist are added to ``errors`` and the rest of the lines are
+        returned."""
+        assets_req = [r for _, r in lines]
+
+        self.cache = {}
+        for asset_req in assets_req:
+            for parent_id in _parent_ids(asset_req):
+                parent_vid = self.lru.get(parent_id)
+                if parent_vid is not None:
+                    self.cache[parent_id] = parent_vid
+
+        self._set_assets(assets_req)
+        missing = self._lookup_parents(assets_req)
+
+        found = []
+        for lineno, asset_req in lines:
+            line_missing = missing & set(_parent_ids(asset_req))
+            if len(line_missing) > 0:
+                errors[lineno] = _not_found(line_missing)
+                continue
+            found.append((lineno, asset_req))
+        return found
+
+    def _insert_parents(self, lines, errors):
+        """Updates the relationships of ``lines``, a list of ``(lineno,
+        asset_req)`` tuples whose assets and parents are in the cache. If some
+        of the cached assets were deleted, only the lines with relationships
+        to them are added to ``errors``."""
+        parentofs = self._parent_ofs([r for _, r in lines])
+        missing = self._update_parents(parentofs)
+
+        self.edges_done += sum(
+            1 for p in parentofs
+            if p.element.parent_vid not in missing and
+            p.element.child_vid not in missing
+        )
+
+        if len(missing) == 0:
+            for asset_id, vid in self.cache.items():
+                self.lru.put(asset_id, vid)
+            return
+
+        # Some of the assets were deleted after being cached, so the cached
+        # vertex IDs cannot be trusted anymore.
+        self.lru.clear()
+        for lineno, asset_req in lines:
+            parent_ids = _parent_ids(asset_req)
+            if len(parent_ids) == 0:
+                continue
+            child_id = AssetID(asset_req['type'], asset_req['identifier'])
+            line_missing = {
+                a for a in [child_id] + parent_ids
+                if self.cache[a] in missing
+            }
+            if len(line_missing) > 0:
+                errors[lineno] = _not_found(line_missing)
+
+
+def _parent_ids(asset_req):
+    """Returns the list of ``AssetID`` of the parents of ``asset_req``."""
+    return [
+        AssetID(p['type'], p['identifier'])
+        for p in asset_req.get('parents', [])
+    ]
+
+
+def _not_found(asset_ids):
+    """Returns the error of a line that references the assets in
+    ``asset_ids``, which do not exist."""
+    name = ', '.join(sorted(str(a) for a in asset_ids))
+    return 404, f'not found: {name}'
+
+
+def post_assets_bulk_stream():
+    """Request handler for the API endpoint ``POST /v1/assets/bulk/stream``.
+    It is registered directly in Flask, because Connexion reads the whole
+    request body before calling the handler."""
+    if request.mimetype != NDJSON_MIMETYPE:
+        return _problem(
+            415,
+            'Unsupported Media Type',
+            f'expected content type {NDJSON_MIMETYPE}',
+        )
+
+    cli = get_inventory_client()
+    pool = get_inventory_client_pool()
+
+    bulk = ApiBulkAssetStreamInsert(
+        cli,
+        current_app.config['BULK_STREAM_SCHEMA'],
+        current_app.config['BULK_CHUNK_SIZE'],
+        bulk_concurrency(pool),
+        pool,
+        current_app.config['BULK_STREAM_CACHE_SIZE'],
+        current_app.config['BULK_ACQUIRE_TIMEOUT'],
+    )
+
+    # The results are spooled to disk, so their size does not depend on the
+    # number of lines either. The file is closed if the insert fails and by
+    # the response otherwise.
+    with ExitStack() as stack:
+        out = stack.enter_context(
+            tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE))
+        try:
+            bulk.insert_stream(request.stream, out)
+        except PoolExhaustedError:
+            return _problem(
+                503, 'Service Unavailable', 'no graph connection available')
+        out.seek(0)
+        stack.pop_all()
+
+    return Response(out, status=200, mimetype=NDJSON_MIMETYPE)
+
+
+def _problem(status, title, detail):
+    """Returns a ``application/problem+json`` response like the ones returned
+    by ``connexion.problem``, which cannot be used outside Connexion."""
+    problem = {'status': status, 'title': title, 'detail': detail}
+    return Response(
+        json.dumps(problem),
+        status=status,
+        mimetype='application/problem+json',
+    )
@@ -0,0 +1,22 @@
+"""This module implements the request handlers for the endpoints of the Asset
+Inventory API related to bulk jobs."""
+
+import connexion.problem
+
+from graph_asset_inventory_api.context import get_bulk_job_runner
+from graph_asset_inventory_api.inventory import NotFoundError
+from graph_asset_inventory_api.api import JobResp
+
+
+def get_jobs_id(id):  # pylint: disable=redefined-builtin
+    """Request handler for the API endpoint ``GET /v1/jobs/{id}``."""
+    runner = get_bulk_job_runner()
+
+    state = None
+    try:
+        state = runner.spool.state(id)
+    except NotFoundError:
+        return connexion.problem(404, 'Not Found', 'ID not found')
+
+    resp = JobResp.from_state(id, state).__dict__
+    return resp, 200
@@ -9,22 +9,44 @@ from graph_asset_inventory_api.inventory import (
     Owns,
     NotFoundError,
 )
-from graph_asset_inventory_api.api import OwnsResp
+from graph_asset_inventory_api.api import (
+    OwnsResp,
+    decode_cursor,
+    pagination_headers,
+    request_fields,
+    fields_resp,
+)
+from graph_asset_inventory_api.api.serializers import (
+    app_serializer,
+    owns_dict,
+)
+from graph_asset_inventory_api.inventory.fields import OWNS_FIELDS
 
 
 # pylint: disable=redefined-builtin
-def get_assets_id_owners(id, page=None, size=100):
+def get_assets_id_owners(id, page=None, size=100, cursor=None, fields=None):
     """Request handler for the API endpoint ``GET /v1/assets/{id}/owners``."""
     cli = get_inventory_client()
 
+    try:
+        after = decode_cursor(cursor)
+        fields = request_fields(fields, OWNS_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
+
     owners = None
     try:
-        owners = cli.owners(id, page, size)
+        owners = cli.owners(
+            id, page, size, after, fields, app_serializer(owns_dict))
     except NotFoundError:
         return connexion.problem(404, 'Not Found', 'ID not found')
 
-    resp = [OwnsResp.from_dbowns(o).__dict__ for o in owners]
-    return resp, 200
+    resp = owners
+    if fields is not None:
+        resp = [fields_resp(o) for o in owners]
+    headers = pagination_headers(
+        [r['id'] for r in resp], size, page is not None or after is not None)
+    return resp, 200, headers
 
 
 def put_assets_asset_id_owners_team_id(asset_id, team_id, body):
@@ -58,11 +80,12 @@ def delete_assets_asset_id_owners_team_id(asset_id, team_id):
     cli = get_inventory_client()
 
     try:
-        for owner in cli.owners(asset_id):
-            if owner.team_vid == team_id:
-                cli.drop_owns(owner.eid)
-                return '', 204
+        cli.drop_owns_between(team_id, asset_id)
     except NotFoundError as e:
-        return connexion.problem(404, 'Not Found', f'ID not found: {e.name}')
+        if e.name == asset_id:
+            return connexion.problem(
+                404, 'Not Found', f'ID not found: {e.name}')
+        return connexion.problem(
+            404, 'Not Found', f'owner not found: {team_id}')
 
-    return connexion.problem(404, 'Not Found', f'owner not found: {team_id}')
+    return '', 204
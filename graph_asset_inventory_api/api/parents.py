@@ -9,22 +9,48 @@ from graph_asset_inventory_api.inventory import (
     ParentOf,
     NotFoundError,
 )
-from graph_asset_inventory_api.api import ParentOfResp
+from graph_asset_inventory_api.api import (
+    ParentOfResp,
+    decode_cursor,
+    pagination_headers,
+    request_fields,
+    fields_resp,
+)
+from graph_asset_inventory_api.api.serializers import (
+    app_serializer,
+    parent_of_dict,
+)
+from graph_asset_inventory_api.inventory.fields import PARENT_OF_FIELDS
+
+
+DEFAULT_LINEAGE_DEPTH = 10
+"""Default number of levels of relationships followed by the lineage
+endpoints. The lineage traversal stores every traversed edge before
+paginating them, so the number of levels is never unbounded."""
 
 
 # pylint: disable=redefined-builtin
-def get_assets_id_parents(id, page=None, size=100):
+def get_assets_id_parents(id, page=None, size=100, cursor=None, fields=None):
     """Request handler for the API endpoint ``GET /v1/assets/{id}/parents``."""
     cli = get_inventory_client()
 
+    try:
+        after = decode_cursor(cursor)
+        fields = request_fields(fields, PARENT_OF_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
+
     parents = None
     try:
-        parents = cli.parents(id, page, size)
+        parents = cli.parents(
+            id, page, size, after, fields, app_serializer(parent_of_dict))
     except NotFoundError:
         return connexion.problem(404, 'Not Found', 'ID not found')
 
-    resp = [ParentOfResp.from_dbparentof(p).__dict__ for p in parents]
-    return resp, 200
+    resp = _parent_of_resps(parents, fields)
+    headers = pagination_headers(
+        [r['id'] for r in resp], size, page is not None or after is not None)
+    return resp, 200, headers
 
 
 def put_assets_child_id_parents_parent_id(child_id, parent_id, body):
@@ -59,28 +85,120 @@ def delete_assets_child_id_parents_parent_id(child_id, parent_id):
     cli = get_inventory_client()
 
     try:
-        for parent in cli.parents(child_id):
-            if parent.parent_vid == parent_id:
-                cli.drop_parent_of(parent.eid)
-                return '', 204
+        cli.drop_parent_of_between(parent_id, child_id)
     except NotFoundError as e:
-        return connexion.problem(404, 'Not Found', f'ID not found: {e.name}')
+        if e.name == child_id:
+            return connexion.problem(
+                404, 'Not Found', f'ID not found: {e.name}')
+        return connexion.problem(
+            404, 'Not Found', f'parent not found: {parent_id}')
 
-    return connexion.problem(
-        404, 'Not Found', f'parent not found: {parent_id}')
+    return '', 204
 
 
 # pylint: disable=redefined-builtin
-def get_assets_id_children(id, page=None, size=100):
+def get_assets_id_children(id, page=None, size=100, cursor=None, fields=None):
     """Request handler for the API endpoint ``GET
     /v1/assets/{id}/children``."""
     cli = get_inventory_client()
 
+    try:
+        after = decode_cursor(cursor)
+        fields = request_fields(fields, PARENT_OF_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
+
     children = None
     try:
-        children = cli.children(id, page, size)
+        children = cli.children(
+            id, page, size, after, fields, app_serializer(parent_of_dict))
+    except NotFoundError:
+        return connexion.problem(404, 'Not Found', 'ID not found')
+
+    resp = _parent_of_resps(children, fields)
+    headers = pagination_headers(
+        [r['id'] for r in resp], size, page is not None or after is not None)
+    return resp, 200, headers
+
+
+def get_assets_id_ancestors(
+    id,
+    max_depth=DEFAULT_LINEAGE_DEPTH,
+    valid_at=None,
+    page=None,
+    size=100,
+    cursor=None,
+    fields=None,
+):  # pylint: disable=redefined-builtin,too-many-arguments
+    """Request handler for the API endpoint ``GET
+    /v1/assets/{id}/ancestors``."""
+    cli = get_inventory_client()
+    return _lineage_resp(
+        cli.ancestors, id, max_depth, valid_at, page, size, cursor, fields)
+
+
+def get_assets_id_descendants(
+    id,
+    max_depth=DEFAULT_LINEAGE_DEPTH,
+    valid_at=None,
+    page=None,
+    size=100,
+    cursor=None,
+    fields=None,
+):  # pylint: disable=redefined-builtin,too-many-arguments
+    """Request handler for the API endpoint ``GET
+    /v1/assets/{id}/descendants``."""
+    cli = get_inventory_client()
+    return _lineage_resp(
+        cli.descendants, id, max_depth, valid_at, page, size, cursor, fields)
+
+
+def _lineage_resp(
+    lineage,
+    vid,
+    max_depth,
+    valid_at,
+    page,
+    size,
+    cursor,
+    fields,
+):  # pylint: disable=too-many-arguments
+    """Returns the response of the lineage endpoints. ``lineage`` is the
+    ``ancestors`` or ``descendants`` method of the ``InventoryClient``."""
+    if valid_at is not None:
+        valid_at = dateutil.parser.isoparse(valid_at)
+
+    try:
+        after = decode_cursor(cursor)
+        fields = request_fields(fields, PARENT_OF_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
+
+    edges = None
+    try:
+        edges = lineage(
+            vid,
+            max_depth,
+            valid_at,
+            page,
+            size,
+            after,
+            fields,
+            app_serializer(parent_of_dict),
+        )
     except NotFoundError:
         return connexion.problem(404, 'Not Found', 'ID not found')
 
-    resp = [ParentOfResp.from_dbparentof(po).__dict__ for po in children]
-    return resp, 200
+    resp = _parent_of_resps(edges, fields)
+    headers = pagination_headers(
+        [r['id'] for r in resp], size, page is not None or after is not None)
+    return resp, 200, headers
+
+
+def _parent_of_resps(parentofs, fields):
+    """Returns the responses of ``parentofs``, the list of serialized
+    relationships or, if ``fields`` is not ``None``, dicts of fields returned
+    by the ``InventoryClient``."""
+    if fields is not None:
+        return [fields_resp(po) for po in parentofs]
+    return parentofs
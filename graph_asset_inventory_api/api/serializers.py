@@ -0,0 +1,113 @@
+"""This module provides the serializers of the list endpoints of the Asset
+Inventory API.
+
+By default, the elements read from the graph are converted to ``Db*`` objects
+by the ``InventoryClient`` and then to ``*Resp`` objects by the request
+handlers. The serializers convert the maps returned by gremlin for the
+``elementMap`` step straight into the dicts of the responses. The maps are
+validated like in the ``Db*`` objects, unless the graph is trusted."""
+
+from flask import current_app
+from gremlin_python.process.traversal import T, Direction
+
+from graph_asset_inventory_api.inventory import (
+    check_vteam,
+    check_vasset,
+    check_eparentof,
+    check_eowns,
+)
+
+
+GRAPH_VALIDATION_MODES = ('strict', 'none')
+"""Supported modes of validation of the elements read by the list endpoints.
+
+- ``strict``: the type of the properties of every element is checked.
+- ``none``: the elements are trusted and serialized without checking them."""
+
+
+def team_dict(vteam):
+    """Returns the dict of the response of the team vertex ``vteam``."""
+    return {
+        'id': vteam[T.id],
+        'identifier': vteam['identifier'],
+        'name': vteam['name'],
+    }
+
+
+def asset_dict(vasset):
+    """Returns the dict of the response of the asset vertex ``vasset``."""
+    return {
+        'id': vasset[T.id],
+        'type': vasset['type'],
+        'identifier': vasset['identifier'],
+        'first_seen': _isoformat(vasset['first_seen']),
+        'last_seen': _isoformat(vasset['last_seen']),
+        'expiration': _isoformat(vasset['expiration']),
+    }
+
+
+def parent_of_dict(eparentof):
+    """Returns the dict of the response of the ``parent_of`` edge
+    ``eparentof``."""
+    return {
+        'id': eparentof[T.id],
+        'parent_id': eparentof[Direction.OUT][T.id],
+        'child_id': eparentof[Direction.IN][T.id],
+        'first_seen': _isoformat(eparentof['first_seen']),
+        'last_seen': _isoformat(eparentof['last_seen']),
+        'expiration': _isoformat(eparentof['expiration']),
+    }
+
+
+def owns_dict(eowns):
+    """Returns the dict of the response of the ``owns`` edge ``eowns``."""
+    end_time = eowns.get('end_time')
+    return {
+        'id': eowns[T.id],
+        'team_id': eowns[Direction.OUT][T.id],
+        'asset_id': eowns[Direction.IN][T.id],
+        'start_time': _isoformat(eowns['start_time']),
+        'end_time': _isoformat(end_time) if end_time is not None else None,
+    }
+
+
+_CHECKS = {
+    team_dict: check_vteam,
+    asset_dict: check_vasset,
+    parent_of_dict: check_eparentof,
+    owns_dict: check_eowns,
+}
+
+
+def serializer(to_dict, trusted=False):
+    """Returns a function that converts the element maps returned by gremlin
+    with ``to_dict``, one of the functions of this module. Unless ``trusted``
+    is ``True``, the elements are checked first and an ``InventoryError``
+    exception is raised if they are not valid."""
+    if trusted:
+        return to_dict
+
+    check = _CHECKS[to_dict]
+
+    def serialize(element):
+        check(element)
+        return to_dict(element)
+
+    return serialize
+
+
+def app_serializer(to_dict):
+    """Returns the ``serializer`` of ``to_dict`` that corresponds to the graph
+    validation mode of the current app."""
+    trusted = current_app.config['GRAPH_VALIDATION'] == 'none'
+    return serializer(to_dict, trusted)
+
+
+def _isoformat(date):
+    """Returns ``date``, a date read from the graph, in ISO 8601 format. The
+    graph stores the dates in UTC, so the result is the same as the one of
+    ``date.replace(tzinfo=timezone.utc).isoformat()`` without creating a new
+    ``datetime``."""
+    if date.tzinfo is not None:
+        date = date.replace(tzinfo=None)
+    return date.isoformat() + '+00:00'
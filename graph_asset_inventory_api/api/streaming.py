@@ -0,0 +1,62 @@
+"""This module provides the streamed responses of the list endpoints of the
+Asset Inventory API.
+
+The unpaginated requests to a list endpoint return all the elements of the
+inventory. Instead of building the whole list before serializing it, the
+elements are serialized and written to the response body as they are received
+from the graph. The body is a JSON array, or a NDJSON document if the client
+prefers ``application/x-ndjson``."""
+
+import json
+from itertools import chain
+
+from flask import request, Response, stream_with_context
+
+
+JSON_MIMETYPE = 'application/json'
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def stream_list(items, to_dict=None):
+    """Returns a streamed response with the elements yielded by ``items``,
+    serialized with ``to_dict`` or, if it is ``None``, as they are. The first
+    element is retrieved before returning the response, so the errors running
+    the traversal are reported with the proper status code. The request
+    context is kept until the body is written, so the ``InventoryClient`` of
+    the request is not released while it is being used."""
+    items = iter(items)
+    first = next(items, None)
+    if first is not None:
+        items = chain([first], items)
+    if to_dict is not None:
+        items = map(to_dict, items)
+
+    mimetype = request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, NDJSON_MIMETYPE], JSON_MIMETYPE)
+    if mimetype == NDJSON_MIMETYPE:
+        body = _ndjson_body(items)
+    else:
+        body = _json_body(items)
+
+    return Response(
+        stream_with_context(body),
+        status=200,
+        mimetype=mimetype,
+    )
+
+
+def _json_body(items):
+    """Yields the chunks of the JSON array of ``items``."""
+    yield '['
+    sep = ''
+    for item in items:
+        yield sep + json.dumps(item)
+        sep = ','
+    yield ']\n'
+
+
+def _ndjson_body(items):
+    """Yields the lines of the NDJSON document of ``items``."""
+    for item in items:
+        yield json.dumps(item) + '\n'
@@ -1,6 +1,7 @@
 """This module implements the request handlers for the endpoints of the Asset
 Inventory API related to team operations."""
 
+import dateutil.parser
 import connexion.problem
 
 from graph_asset_inventory_api.context import get_inventory_client
@@ -9,17 +10,67 @@ from graph_asset_inventory_api.inventory import (
     NotFoundError,
     ConflictError,
 )
-from graph_asset_inventory_api.api import TeamResp
+from graph_asset_inventory_api.api import (
+    TeamResp,
+    decode_cursor,
+    pagination_headers,
+    request_fields,
+    fields_resp,
+    lookup_resp,
+    lookup_error,
+)
+from graph_asset_inventory_api.api.streaming import stream_list
+from graph_asset_inventory_api.api.serializers import (
+    app_serializer,
+    team_dict,
+    asset_dict,
+)
+from graph_asset_inventory_api.inventory.fields import (
+    TEAM_FIELDS,
+    ASSET_FIELDS,
+)
 
 
-def get_teams(page=None, size=100, team_identifier=None):
-    """Request handler for the API endpoint ``GET /v1/teams``."""
+def get_teams(
+    page=None,
+    size=100,
+    team_identifier=None,
+    cursor=None,
+    fields=None,
+):  # pylint: disable=too-many-arguments
+    """Request handler for the API endpoint ``GET /v1/teams``. If the
+    request is not paginated, the teams are streamed."""
     cli = get_inventory_client()
 
-    teams = cli.teams(page, size, team_identifier)
+    try:
+        after = decode_cursor(cursor)
+        fields = request_fields(fields, TEAM_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
 
-    resp = [TeamResp.from_dbteam(t).__dict__ for t in teams]
-    return resp, 200
+    # The team vertices are serialized straight into the dicts of the
+    # response.
+    convert = app_serializer(team_dict)
+    to_resp = None if fields is None else fields_resp
+
+    if page is None and after is None:
+        teams = cli.stream_teams(
+            team_identifier, fields=fields, convert=convert)
+        return stream_list(teams, to_resp)
+
+    teams = cli.teams(
+        page,
+        size,
+        team_identifier,
+        after=after,
+        fields=fields,
+        convert=convert,
+    )
+
+    resp = teams if to_resp is None else [to_resp(t) for t in teams]
+    headers = pagination_headers(
+        [t['id'] for t in resp], size, page is not None or after is not None)
+    return resp, 200, headers
 
 
 def post_teams(body):
@@ -40,16 +91,45 @@ def post_teams(body):
     return resp, 201
 
 
-def get_teams_id(id):  # pylint: disable=redefined-builtin
+def post_teams_lookup(body):
+    """Request handler for the API endpoint ``POST /v1/teams/lookup``. The
+    teams are looked up by vertex ID or by identifier, using a single
+    traversal."""
+    cli = get_inventory_client()
+
+    err = lookup_error(body, 'ids', 'identifiers')
+    if err is not None:
+        return connexion.problem(400, 'Bad Request', err)
+
+    if 'ids' in body:
+        keys = body['ids']
+        teams = cli.team_vids(keys)
+    else:
+        keys = body['identifiers']
+        teams = cli.team_identifiers(keys)
+
+    resp = lookup_resp(keys, teams, lambda t: TeamResp.from_dbteam(t).__dict__)
+    return resp, 200
+
+
+def get_teams_id(id, fields=None):  # pylint: disable=redefined-builtin
     """Request handler for the API endpoint ``GET /v1/teams/{id}``."""
     cli = get_inventory_client()
 
+    try:
+        fields = request_fields(fields, TEAM_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
+
     team = None
     try:
-        team = cli.team(id)
+        team = cli.team(id, fields)
     except NotFoundError:
         return connexion.problem(404, 'Not Found', 'ID not found')
 
+    if fields is not None:
+        return fields_resp(team), 200
+
     resp = TeamResp.from_dbteam(team).__dict__
     return resp, 200
 
@@ -80,3 +160,43 @@ def put_teams_id(id, body):  # pylint: disable=redefined-builtin
 
     resp = TeamResp.from_dbteam(updated_team).__dict__
     return resp, 200
+
+
+def get_teams_id_assets(
+    id,
+    active_at=None,
+    page=None,
+    size=100,
+    cursor=None,
+    fields=None,
+):  # pylint: disable=redefined-builtin,too-many-arguments
+    """Request handler for the API endpoint ``GET /v1/teams/{id}/assets``."""
+    cli = get_inventory_client()
+
+    if active_at is not None:
+        active_at = dateutil.parser.isoparse(active_at)
+
+    try:
+        after = decode_cursor(cursor)
+        fields = request_fields(fields, ASSET_FIELDS)
+    except ValueError as e:
+        return connexion.problem(400, 'Bad Request', str(e))
+
+    assets = None
+    try:
+        assets = cli.owned_assets(
+            id,
+            active_at,
+            page,
+            size,
+            after,
+            fields,
+            app_serializer(asset_dict),
+        )
+    except NotFoundError:
+        return connexion.problem(404, 'Not Found', 'ID not found')
+
+    resp = assets if fields is None else [fields_resp(a) for a in assets]
+    headers = pagination_headers(
+        [a['id'] for a in resp], size, page is not None or after is not None)
+    return resp, 200, headers
@@ -1,26 +1,75 @@
 """This module provides functions to access resources shared across the
 Connexion app."""
 
+from connexion import ProblemException
 from flask import current_app, g
 
-from graph_asset_inventory_api.inventory.client import InventoryClient
+from graph_asset_inventory_api.inventory.pool import (
+    InventoryClientPool,
+    PoolExhaustedError,
+)
+
+
+def init_inventory_client_pool(app):
+    """Creates the ``InventoryClientPool`` shared by the threads of the current
+    process, opens its graph connections and returns it."""
+    endpoint = app.config['GREMLIN_ENDPOINT']
+    auth_mode = app.config['GREMLIN_AUTH_MODE']
+    size = app.config['GREMLIN_POOL_SIZE']
+    app.logger.debug(
+        f'Creating Inventory Client pool: {endpoint}, Auth mode: {auth_mode}, '
+        f'Size: {size}')
+
+    pool = InventoryClientPool(
+        endpoint,
+        auth_mode,
+        size,
+        app.config['GREMLIN_POOL_HEALTH_CHECK_INTERVAL'],
+        app.config['VERTEX_IDS'],
+        app.config['ASSET_KEYS'],
+        app.config['ASSET_LABELS'],
+    )
+    pool.open()
+    app.extensions['inventory_client_pool'] = pool
+    return pool
+
+
+def get_inventory_client_pool():
+    """Returns the ``InventoryClientPool`` of the current app."""
+    return current_app.extensions['inventory_client_pool']
+
+
+def get_bulk_job_runner():
+    """Returns the ``BulkJobRunner`` of the current app."""
+    return current_app.extensions['bulk_job_runner']
 
 
 def get_inventory_client():
-    """Returns a new ``InventoryClient``."""
+    """Returns an ``InventoryClient`` acquired from the pool. The client is
+    released when the app context is torn down. If no client is released in
+    ``GREMLIN_POOL_ACQUIRE_TIMEOUT`` seconds, the request fails with a
+    503."""
     if 'inventory_client' not in g:
-        endpoint = current_app.config['GREMLIN_ENDPOINT']
-        auth_mode = current_app.config['GREMLIN_AUTH_MODE']
-        current_app.logger.debug(
-            f'Creating Inventory Client: {endpoint}, Auth mode: {auth_mode}')
+        current_app.logger.debug('Acquiring Inventory Client')
+        timeout = current_app.config['GREMLIN_POOL_ACQUIRE_TIMEOUT']
+        try:
+            cli = get_inventory_client_pool().acquire(timeout)
+        except PoolExhaustedError as e:
+            raise ProblemException(
+                status=503,
+                title='Service Unavailable',
+                detail='no graph connection available',
+            ) from e
         # pylint: disable=assigning-non-slot
-        g.inventory_client = InventoryClient(endpoint, auth_mode)
+        g.inventory_client = cli
     return g.inventory_client
 
 
-def close_inventory_client(_err=None):
-    """Closes the ``InventoryClient`` in use."""
+def close_inventory_client(err=None):
+    """Releases the ``InventoryClient`` in use. If the request failed, the
+    client is checked by the pool before being used again."""
     inventory_client = g.pop('inventory_client', None)
     if inventory_client is not None:
-        current_app.logger.debug('Closing Inventory Client')
-        inventory_client.close()
+        current_app.logger.debug('Releasing Inventory Client')
+        get_inventory_client_pool().release(
+            inventory_client, healthy=err is None)
@@ -2,15 +2,32 @@
 
 import os
 import sys
+import atexit
 import logging
 from logging.config import dictConfig
 
 import connexion
 
 from graph_asset_inventory_api import EnvVarNotSetError
-from graph_asset_inventory_api.context import close_inventory_client
+from graph_asset_inventory_api.context import (
+    init_inventory_client_pool,
+    close_inventory_client,
+)
 
+from graph_asset_inventory_api.inventory import ASSET_KEY_MODES
 from graph_asset_inventory_api.inventory.client import InventoryClient
+from graph_asset_inventory_api.inventory.vids import VERTEX_ID_SCHEMES
+from graph_asset_inventory_api.inventory.labels import check_asset_labels
+from graph_asset_inventory_api.jobs import (
+    BulkJobSpool,
+    BulkJobRunner,
+    JobSettings,
+)
+from graph_asset_inventory_api.api.assets_bulk import bulk_concurrency
+from graph_asset_inventory_api.api.assets_bulk_stream import (
+    post_assets_bulk_stream,
+)
+from graph_asset_inventory_api.api.serializers import GRAPH_VALIDATION_MODES
 
 
 def config_logger(debug=False):
@@ -54,17 +71,138 @@ def config_auth_mode(app):
     app.config['GREMLIN_AUTH_MODE'] = os.getenv('GREMLIN_AUTH_MODE', 'none')
 
 
+def config_vertex_ids(app):
+    """Configures the scheme used to assign IDs to the team and asset
+    vertices."""
+    scheme = os.getenv('VERTEX_IDS', 'random')
+    if scheme not in VERTEX_ID_SCHEMES:
+        raise ValueError(f'invalid VERTEX_IDS: {scheme}')
+    app.config['VERTEX_IDS'] = scheme
+
+
+def config_asset_keys(app):
+    """Configures the mode used to look up assets by type and identifier."""
+    mode = os.getenv('ASSET_KEYS', 'hybrid')
+    if mode not in ASSET_KEY_MODES:
+        raise ValueError(f'invalid ASSET_KEYS: {mode}')
+    app.config['ASSET_KEYS'] = mode
+
+
+def config_asset_labels(app):
+    """Configures the mode used to label the asset vertices. The modes that
+    label the assets with their type are rejected unless
+    ``GREMLIN_MULTI_LABELS`` indicates that the graph supports
+    multi-labels."""
+    mode = os.getenv('ASSET_LABELS', 'single')
+    multi_labels = os.getenv('GREMLIN_MULTI_LABELS', 'false') == 'true'
+    try:
+        check_asset_labels(mode, multi_labels)
+    except ValueError as e:
+        raise ValueError(f'invalid ASSET_LABELS: {e}') from e
+    app.config['ASSET_LABELS'] = mode
+
+
+def config_graph_validation(app):
+    """Configures the validation of the elements read by the list
+    endpoints."""
+    mode = os.getenv('GRAPH_VALIDATION', 'strict')
+    if mode not in GRAPH_VALIDATION_MODES:
+        raise ValueError(f'invalid GRAPH_VALIDATION: {mode}')
+    app.config['GRAPH_VALIDATION'] = mode
+
+
+def config_pool(app):
+    """Configures the pool of Inventory Clients."""
+    app.config['GREMLIN_POOL_SIZE'] = int(os.getenv('GREMLIN_POOL_SIZE', '4'))
+    app.config['GREMLIN_POOL_HEALTH_CHECK_INTERVAL'] = int(
+        os.getenv('GREMLIN_POOL_HEALTH_CHECK_INTERVAL', '30'))
+    app.config['GREMLIN_POOL_ACQUIRE_TIMEOUT'] = int(
+        os.getenv('GREMLIN_POOL_ACQUIRE_TIMEOUT', '10'))
+
+
+def config_bulk(app):
+    """Configures the bulk endpoints."""
+    app.config['BULK_CHUNK_SIZE'] = int(os.getenv('BULK_CHUNK_SIZE', '10'))
+    app.config['BULK_CONCURRENCY'] = int(os.getenv('BULK_CONCURRENCY', '1'))
+    app.config['BULK_ACQUIRE_TIMEOUT'] = int(
+        os.getenv('BULK_ACQUIRE_TIMEOUT', '10'))
+    app.config['BULK_STREAM_CACHE_SIZE'] = int(
+        os.getenv('BULK_STREAM_CACHE_SIZE', '10000'))
+    app.config['BULK_JOBS_DIR'] = os.getenv(
+        'BULK_JOBS_DIR', '/tmp/graph-asset-inventory-api/jobs')
+    app.config['BULK_JOBS_RETENTION'] = int(
+        os.getenv('BULK_JOBS_RETENTION', '86400'))
+
+
 def initialize_db(app):
     """Executes the actions that have to be performed in the graph before
     accessing it."""
     endpoint = app.config['GREMLIN_ENDPOINT']
     auth_mode = app.config['GREMLIN_AUTH_MODE']
-    client = InventoryClient(endpoint, auth_mode)
+    client = InventoryClient(
+        endpoint,
+        auth_mode,
+        app.config['VERTEX_IDS'],
+        app.config['ASSET_KEYS'],
+        app.config['ASSET_LABELS'],
+    )
     # Ensure the current version of the Universe exists in the db.
     client.ensure_universe()
     client.close()
 
 
+def initialize_pool(app):
+    """Opens the connections of the pool of Inventory Clients. The pool is
+    closed when the process exits."""
+    pool = init_inventory_client_pool(app)
+    atexit.register(pool.close)
+
+
+def initialize_bulk_stream(app):
+    """Registers the streaming bulk endpoint. It is not handled by Connexion,
+    which reads the whole request body before calling the handler. It must be
+    registered before the API, so it takes precedence over the route that
+    Connexion adds for the operation declared in the API spec."""
+    app.add_url_rule(
+        '/v1/assets/bulk/stream',
+        view_func=post_assets_bulk_stream,
+        methods=['POST'],
+    )
+
+
+def config_bulk_stream(app, api):
+    """Configures the streaming bulk endpoint, whose lines are validated
+    against the ``AssetBulkReq`` schema of the API spec."""
+    schema = api.specification['components']['schemas']['AssetBulkReq']
+    app.config['BULK_STREAM_SCHEMA'] = schema
+
+
+def initialize_jobs(app):
+    """Starts the runner of the bulk jobs of the current process, which resumes
+    the jobs that were not finished. The runner is stopped when the process
+    exits."""
+    spool = BulkJobSpool(app.config['BULK_JOBS_DIR'])
+    app.logger.debug(f'Starting bulk job runner: {spool.path}')
+
+    # Like a bulk request, the runner processes one of the partitions with
+    # the client it holds and acquires the rest from the pool.
+    pool = app.extensions['inventory_client_pool']
+    with app.app_context():
+        concurrency = bulk_concurrency(pool)
+
+    settings = JobSettings(
+        app.config['BULK_STREAM_SCHEMA'],
+        app.config['BULK_CHUNK_SIZE'],
+        concurrency,
+        app.config['BULK_ACQUIRE_TIMEOUT'],
+        retention=app.config['BULK_JOBS_RETENTION'],
+    )
+    runner = BulkJobRunner(spool, pool, settings)
+    runner.start()
+    app.extensions['bulk_job_runner'] = runner
+    atexit.register(runner.stop)
+
+
 def create_app():
     """Returns a new Connection App."""
     # Get flask environment.
@@ -80,7 +218,8 @@ def create_app():
         specification_dir='openapi/',
         debug=debug,
     )
-    conn_app.add_api(
+    initialize_bulk_stream(conn_app.app)
+    api = conn_app.add_api(
         'graph-asset-inventory-api.yaml',
         strict_validation=True,
         resolver_error=501,
@@ -88,6 +227,15 @@ def create_app():
 
     config_db(conn_app.app)
     config_auth_mode(conn_app.app)
+    config_vertex_ids(conn_app.app)
+    config_asset_keys(conn_app.app)
+    config_asset_labels(conn_app.app)
+    config_graph_validation(conn_app.app)
+    config_pool(conn_app.app)
+    config_bulk(conn_app.app)
+    config_bulk_stream(conn_app.app, api)
     initialize_db(conn_app.app)
+    initialize_pool(conn_app.app)
+    initialize_jobs(conn_app.app)
 
     return conn_app
@@ -1,18 +1,25 @@
 """This module makes easier to connect to a Gremlin server with different
 authentication methods."""
 
+import queue
 from os import getenv
 from urllib.parse import urlparse
 
 from gremlin_python.driver.driver_remote_connection import (
     DriverRemoteConnection,
 )
+from gremlin_python.driver.protocol import GremlinServerError
 from neptune_python_utils.gremlin_utils import GremlinUtils
 from neptune_python_utils.endpoints import Endpoints
 
 from graph_asset_inventory_api import EnvVarNotSetError
 
 
+STREAM_POLL_INTERVAL = 0.1
+"""Seconds ``stream`` waits for a batch of results before checking if the
+traversal has finished."""
+
+
 def get_connection(gremlin_endpoint, auth_mode='none'):
     """Returns a connection to the corresponding gremlin server. If
     ``auth_mode`` is ``neptune_iam``, IAM credentials are used for
@@ -44,3 +51,40 @@ def get_neptune_iam_connection(neptune_hostname, neptune_port=8182):
     gremlin_utils = GremlinUtils(endpoints)
 
     return gremlin_utils.remote_connection()
+
+
+def is_id_conflict(exc):
+    """Returns ``True`` if ``exc`` is the error returned by the Gremlin server
+    when a traversal creates a vertex or an edge with an ID that already
+    exists. TinkerGraph and Neptune, which reports it as a
+    ``ConstraintViolationException``, use the same message."""
+    if not isinstance(exc, GremlinServerError):
+        return False
+    return 'with id already exists' in str(exc)
+
+
+def stream(conn, traversal):
+    """Submits ``traversal`` through ``conn``, a ``DriverRemoteConnection``,
+    and yields its results as the batches sent by the Gremlin server are
+    received. ``toList`` waits for the whole result before returning it, so
+    this allows to process large results while they are received. If the
+    traversal fails, the exception is raised once the results received before
+    the failure have been yielded."""
+    # pylint: disable=protected-access
+    bytecode = traversal.bytecode
+    result_set = conn._client.submit(
+        bytecode, request_options=conn._extract_request_options(bytecode))
+
+    # ``ResultSet`` busy-waits for the batches, so the queue of batches is
+    # consumed directly.
+    batches = result_set.stream
+    while not (result_set.done.done() and batches.empty()):
+        try:
+            batch = batches.get(timeout=STREAM_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+        for traverser in batch:
+            for _ in range(traverser.bulk):
+                yield traverser.object
+
+    result_set.done.result()
@@ -1,5 +1,7 @@
 """Provides primitives to interact with an asset inventory."""
 
+import json
+from collections import namedtuple
 from datetime import (
     datetime,
     timezone,
@@ -14,6 +16,10 @@ from graph_asset_inventory_api.inventory.universe import (
     Universe,
     UniverseVersion,
 )
+from graph_asset_inventory_api.inventory.labels import (
+    ASSET_LABEL,
+    has_label,
+)
 
 
 CURRENT_UNIVERSE_VERSION = "0.0.1"
@@ -21,6 +27,15 @@ CURRENT_UNIVERSE_VERSION = "0.0.1"
 
 CURRENT_UNIVERSE = Universe(UniverseVersion(CURRENT_UNIVERSE_VERSION))
 
+ASSET_KEY_MODES = ('hybrid', 'composite')
+"""Supported modes of the asset lookups by ``AssetID``.
+
+- ``hybrid``: the assets are looked up by their composite key and, if they are
+  not found, by their ``type`` and ``identifier``, so the assets without
+  composite key are still found. It must be used until the composite keys are
+  backfilled.
+- ``composite``: the assets are only looked up by their composite key."""
+
 
 class InventoryError(Exception):
     """Represents a generic Asset Inventory error."""
@@ -62,6 +77,8 @@ class InconsistentStateError(InventoryError):
 class Team:
     """Represents a Team."""
 
+    __slots__ = ('identifier', 'name')
+
     def __init__(self, identifier, name):
         self.identifier = identifier
         self.name = name
@@ -83,6 +100,8 @@ class DbTeam(Team):
     """Represents a ``Team`` in the context of the Security Graph. The main
     difference with a ``Team`` is that a ``DbTeam`` has a vertex ID field."""
 
+    __slots__ = ('vid',)
+
     def __init__(self, identifier, name, vid):
         super().__init__(identifier, name)
         self.vid = vid
@@ -101,13 +120,7 @@ class DbTeam(Team):
     def from_vteam(cls, vteam):
         """Creates a ``DbTeam`` from a team vertex. A team vertex is the object
         returned by gremlin when using a ``elementMap`` step."""
-        if vteam[T.label] != 'Team':
-            raise InventoryError('wrong vertex type')
-
-        if not isinstance(vteam['identifier'], str):
-            raise InventoryError('identifier is not a string')
-        if not isinstance(vteam['name'], str):
-            raise InventoryError('name is not a string')
+        check_vteam(vteam)
 
         vid = vteam[T.id]
         identifier = vteam['identifier']
@@ -119,6 +132,8 @@ class DbTeam(Team):
 class AssetID:
     """Represents an Asset identifier."""
 
+    __slots__ = ('type', 'identifier')
+
     def __init__(self, type_, identifier):
         self.type = type_
         self.identifier = identifier
@@ -132,6 +147,18 @@ class AssetID:
     def __hash__(self):
         return hash((self.type, self.identifier))
 
+    def key(self, universe):
+        """Returns the composite key of the asset in ``universe``. It is stored
+        in the ``asset_key`` property of the Asset vertices, so they can be
+        looked up with a single equality predicate. The fields are encoded as
+        a JSON array, so different assets never have the same key."""
+        return json.dumps([
+            universe.namespace,
+            universe.version.int_version,
+            self.type,
+            self.identifier,
+        ])
+
     def __eq__(self, o):
         if not isinstance(self, o.__class__):
             return False
@@ -143,6 +170,8 @@ class AssetTimeAttr:
     """Represents the time attributes associated with an Asset. They can belong
     to the asset itself or to a ``parent_of`` relationship."""
 
+    __slots__ = ('first_seen', 'last_seen', 'expiration')
+
     def __init__(self, first_seen, last_seen, expiration):
         self.first_seen = first_seen
         self.last_seen = last_seen
@@ -167,6 +196,8 @@ class AssetTimeAttr:
 class Asset:
     """Represents an Asset."""
 
+    __slots__ = ('asset_id',)
+
     def __init__(self, asset_id):
         self.asset_id = asset_id
 
@@ -188,6 +219,8 @@ class DbAsset(Asset):
     difference with an ``Asset`` is that a ``DbAsset`` has time attributes and
     a vertex ID."""
 
+    __slots__ = ('vid', 'time_attr')
+
     def __init__(self, asset_id, vid, time_attr):
         super().__init__(asset_id)
         self.vid = vid
@@ -208,19 +241,7 @@ class DbAsset(Asset):
     def from_vasset(cls, vteam):
         """Creates a ``DbAsset`` from an asset vertex. An asset vertex is the
         object returned by gremlin when using a ``elementMap`` step."""
-        if vteam[T.label] != 'Asset':
-            raise InventoryError('wrong vertex type')
-
-        if not isinstance(vteam['type'], str):
-            raise InventoryError('type is not an string')
-        if not isinstance(vteam['identifier'], str):
-            raise InventoryError('identifier is not an string')
-        if not isinstance(vteam['first_seen'], datetime):
-            raise InventoryError('first_seen is not a datetime')
-        if not isinstance(vteam['last_seen'], datetime):
-            raise InventoryError('last_seen is not a datetime')
-        if not isinstance(vteam['expiration'], datetime):
-            raise InventoryError('expiration is not a datetime')
+        check_vasset(vteam)
 
         vid = vteam[T.id]
         asset_id = AssetID(vteam['type'], vteam['identifier'])
@@ -236,6 +257,8 @@ class DbAsset(Asset):
 class ParentOf:
     """Represents a ``parent_of`` relationship."""
 
+    __slots__ = ('parent_vid', 'child_vid')
+
     def __init__(self, parent_vid, child_vid):
         self.parent_vid = parent_vid
         self.child_vid = child_vid
@@ -255,11 +278,28 @@ class ParentOf:
             self.child_vid == o.child_vid
 
 
+class BatchItem(namedtuple(
+    'BatchItem',
+    ['element', 'expiration', 'timestamp', 'first_seen'],
+    defaults=[None],
+)):
+    """Represents an element of a batch update, like an ``Asset`` or a
+    ``ParentOf``, with its time attributes. ``timestamp`` can be ``None``, in
+    which case the time of the update is used. ``first_seen`` allows to update
+    the element with several observations at once: the time attributes are
+    updated as if the element was set at ``first_seen`` and at ``timestamp``.
+    By default, it is equal to ``timestamp``."""
+
+    __slots__ = ()
+
+
 class DbParentOf(ParentOf):
     """Represents a ``parent_of`` relationship in the context of the Security
     Graph. The main difference with a ``ParentOf`` is that a ``DbParentOf`` has
     an edge ID ``eid`` and time attributes."""
 
+    __slots__ = ('eid', 'time_attr')
+
     def __init__(self, parent_vid, child_vid, eid, time_attr):
         super().__init__(parent_vid, child_vid)
         self.eid = eid
@@ -281,15 +321,7 @@ class DbParentOf(ParentOf):
         """Creates a ``DbParentOf`` from a ``parent_of`` edge. A ``parent_of``
         edge is the object returned by gremlin when using a ``elementMap``
         step."""
-        if eparentof[T.label] != 'parent_of':
-            raise InventoryError('wrong edge type')
-
-        if not isinstance(eparentof['first_seen'], datetime):
-            raise InventoryError('first_seen is not a datetime')
-        if not isinstance(eparentof['last_seen'], datetime):
-            raise InventoryError('last_seen is not a datetime')
-        if not isinstance(eparentof['expiration'], datetime):
-            raise InventoryError('expiration is not a datetime')
+        check_eparentof(eparentof)
 
         eid = eparentof[T.id]
         parent_vid = eparentof[Direction.OUT][T.id]
@@ -307,6 +339,8 @@ class TeamTimeAttr:
     """Represents the time attributes associated with a Team and, specifically,
     with an ``owns`` relationship."""
 
+    __slots__ = ('start_time', 'end_time')
+
     def __init__(self, start_time, end_time=None):
         self.start_time = start_time
         self.end_time = end_time
@@ -328,6 +362,8 @@ class TeamTimeAttr:
 class Owns:
     """Represents an ``owns`` relationship."""
 
+    __slots__ = ('team_vid', 'asset_vid')
+
     def __init__(self, team_vid, asset_vid):
         self.team_vid = team_vid
         self.asset_vid = asset_vid
@@ -351,6 +387,8 @@ class DbOwns(Owns):
     Graph. The main difference with an ``Owns`` is that a ``DbOwns`` has an
     edge ID ``eid`` and time attributes."""
 
+    __slots__ = ('eid', 'time_attr')
+
     def __init__(self, team_vid, asset_vid, eid, time_attr):
         super().__init__(team_vid, asset_vid)
         self.eid = eid
@@ -371,13 +409,7 @@ class DbOwns(Owns):
     def from_eowns(cls, eowns):
         """Creates a ``DbOwns`` from an ``owns`` edge. An ``owns`` edge is the
         object returned by gremlin when using a ``elementMap`` step."""
-        if eowns[T.label] != 'owns':
-            raise InventoryError('wrong edge type')
-
-        if not isinstance(eowns['start_time'], datetime):
-            raise InventoryError('start_time is not a datetime')
-        if 'end_time' in eowns and not isinstance(eowns['end_time'], datetime):
-            raise InventoryError('end_time is not a datetime')
+        check_eowns(eowns)
 
         eid = eowns[T.id]
         team_vid = eowns[Direction.OUT][T.id]
@@ -394,6 +426,126 @@ class DbOwns(Owns):
         return cls(team_vid, asset_vid, eid, time_attr)
 
 
+class DbSubgraph:
+    """Represents the neighborhood of an asset in the Security Graph: the
+    ``DbTeam`` and ``DbAsset`` around it and the ``DbParentOf`` and ``DbOwns``
+    between them. ``truncated`` is ``True`` if the neighborhood has more
+    vertices than the ones returned."""
+
+    __slots__ = ('teams', 'assets', 'parentofs', 'owns', 'truncated')
+
+    def __init__(
+        self,
+        teams,
+        assets,
+        parentofs,
+        owns,
+        truncated,
+    ):  # pylint: disable=too-many-arguments
+        self.teams = teams
+        self.assets = assets
+        self.parentofs = parentofs
+        self.owns = owns
+        self.truncated = truncated
+
+    def __repr__(self):
+        return f'{{teams: {self.teams}, assets: {self.assets}, ' \
+               f'parentofs: {self.parentofs}, owns: {self.owns}, ' \
+               f'truncated: {self.truncated}}}'
+
+    def __eq__(self, o):
+        if not isinstance(self, o.__class__):
+            return False
+        return self.teams == o.teams and self.assets == o.assets and \
+            self.parentofs == o.parentofs and self.owns == o.owns and \
+            self.truncated == o.truncated
+
+    @classmethod
+    def from_subgraph(cls, subgraph, max_nodes):
+        """Creates a ``DbSubgraph`` from the map returned by a ``subgraph``
+        traversal with a maximum of ``max_nodes`` vertices. The teams,
+        assets and relationships are sorted by ID."""
+        teams, assets, parentofs, owns = [], [], [], []
+        for vertex in subgraph['vertices']:
+            if has_label(vertex[T.label], ASSET_LABEL):
+                assets.append(DbAsset.from_vasset(vertex))
+            else:
+                teams.append(DbTeam.from_vteam(vertex))
+        for edge in subgraph['edges']:
+            if edge[T.label] == 'parent_of':
+                parentofs.append(DbParentOf.from_eparentof(edge))
+            else:
+                owns.append(DbOwns.from_eowns(edge))
+
+        return cls(
+            sorted(teams, key=lambda dbteam: dbteam.vid),
+            sorted(assets, key=lambda dbasset: dbasset.vid),
+            sorted(parentofs, key=lambda dbparentof: dbparentof.eid),
+            sorted(owns, key=lambda dbowns: dbowns.eid),
+            subgraph['nodes'] > max_nodes,
+        )
+
+
+def check_vteam(vteam):
+    """Checks that ``vteam``, the map returned by gremlin for a team vertex
+    when using a ``elementMap`` step, is a valid team. Otherwise, an
+    ``InventoryError`` exception is raised."""
+    if vteam[T.label] != 'Team':
+        raise InventoryError('wrong vertex type')
+
+    if not isinstance(vteam['identifier'], str):
+        raise InventoryError('identifier is not a string')
+    if not isinstance(vteam['name'], str):
+        raise InventoryError('name is not a string')
+
+
+def check_vasset(vasset):
+    """Checks that ``vasset``, the map returned by gremlin for an asset vertex
+    when using a ``elementMap`` step, is a valid asset. Otherwise, an
+    ``InventoryError`` exception is raised."""
+    if not has_label(vasset[T.label], ASSET_LABEL):
+        raise InventoryError('wrong vertex type')
+
+    if not isinstance(vasset['type'], str):
+        raise InventoryError('type is not an string')
+    if not isinstance(vasset['identifier'], str):
+        raise InventoryError('identifier is not an string')
+    if not isinstance(vasset['first_seen'], datetime):
+        raise InventoryError('first_seen is not a datetime')
+    if not isinstance(vasset['last_seen'], datetime):
+        raise InventoryError('last_seen is not a datetime')
+    if not isinstance(vasset['expiration'], datetime):
+        raise InventoryError('expiration is not a datetime')
+
+
+def check_eparentof(eparentof):
+    """Checks that ``eparentof``, the map returned by gremlin for a
+    ``parent_of`` edge when using a ``elementMap`` step, is a valid
+    relationship. Otherwise, an ``InventoryError`` exception is raised."""
+    if eparentof[T.label] != 'parent_of':
+        raise InventoryError('wrong edge type')
+
+    if not isinstance(eparentof['first_seen'], datetime):
+        raise InventoryError('first_seen is not a datetime')
+    if not isinstance(eparentof['last_seen'], datetime):
+        raise InventoryError('last_seen is not a datetime')
+    if not isinstance(eparentof['expiration'], datetime):
+        raise InventoryError('expiration is not a datetime')
+
+
+def check_eowns(eowns):
+    """Checks that ``eowns``, the map returned by gremlin for an ``owns`` edge
+    when using a ``elementMap`` step, is a valid relationship. Otherwise, an
+    ``InventoryError`` exception is raised."""
+    if eowns[T.label] != 'owns':
+        raise InventoryError('wrong edge type')
+
+    if not isinstance(eowns['start_time'], datetime):
+        raise InventoryError('start_time is not a datetime')
+    if 'end_time' in eowns and not isinstance(eowns['end_time'], datetime):
+        raise InventoryError('end_time is not a datetime')
+
+
 class InventoryUniverse:
     """Represents and Asset Inventory Universe instance."""
 
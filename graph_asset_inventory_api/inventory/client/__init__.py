@@ -0,0 +1,675 @@
+"""This modules provides the class ``InventoryClient`` that provides access to
+the Asset Inventory."""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+
+from gremlin_python.driver.protocol import GremlinServerError
+
+from graph_asset_inventory_api.inventory import (
+    DbTeam,
+    DbAsset,
+    DbOwns,
+    InventoryError,
+    NotFoundError,
+    ConflictError,
+    InconsistentStateError,
+)
+from graph_asset_inventory_api.inventory.client.base import (
+    _converter,
+    _retry_on_id_conflict,
+    _asset_edges,
+    _check_dropped_edges,
+    _raise_missing,
+)
+from graph_asset_inventory_api.inventory.client.bulk import (
+    BulkInventoryClient,
+)
+from graph_asset_inventory_api.inventory.client.lineage import (
+    LineageInventoryClient,
+)
+from graph_asset_inventory_api.inventory.client.migrations import (
+    MigrationsInventoryClient,
+)
+from graph_asset_inventory_api.inventory.fields import from_projection
+from graph_asset_inventory_api import gremlin
+from graph_asset_inventory_api.inventory import CURRENT_UNIVERSE
+
+
+class InventoryClient(
+    BulkInventoryClient,
+    LineageInventoryClient,
+    MigrationsInventoryClient,
+):
+    """Client that provides access to the Asset Inventory.
+
+    This Client is concurrent-safe in terms of DB integrity.
+
+    The vertex IDs of the universes are cached by the client, so the
+    traversals can start from, or filter by, the ``Universe`` vertex without
+    matching its properties. The cache is filled by ``ensure_universe`` and the
+    first time a universe is used. Universe vertices are never modified nor
+    deleted by the Asset Inventory, so the cached IDs are valid for the whole
+    life of the client. The cache can be cleared with
+    ``invalidate_universes``, which is done by ``InventoryClientPool`` every
+    time a client is released after a failure.
+
+    ``vid_scheme`` is the scheme used to assign IDs to the team and asset
+    vertices and the ``parent_of`` and ``owns`` edges, one of
+    ``VERTEX_ID_SCHEMES``. With natural IDs, the teams, assets and
+    relationships are looked up by ID and creating the same element
+    concurrently cannot result in duplicated elements. The server rejects
+    all but one of the concurrent creations, so the rejected upserts are
+    retried and the rejected ``add_*`` calls raise a ``ConflictError``.
+
+    ``asset_keys`` is the mode used to look up assets by ``AssetID``, one of
+    ``ASSET_KEY_MODES``. In ``composite`` mode, the assets are looked up with
+    a single equality predicate on their composite key.
+
+    ``label_mode`` is the mode used to label the asset vertices, one of
+    ``ASSET_LABEL_MODES``. With typed labels, the assets of a type are listed
+    with a scan of the label of the type."""
+
+    # Teams.
+
+    def teams(
+        self,
+        page_idx=None,
+        page_size=100,
+        team_identifier=None,
+        universe=CURRENT_UNIVERSE,
+        after=None,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns all teams associated with the given ``universe`` (filtered
+        by ``identifier`` if specified) if ``page_idx`` and ``after`` are None.
+        If ``after`` is specified, it returns the page of teams of size
+        ``page_size`` whose vertex IDs are greater than ``after``. Otherwise it
+        returns the page of teams with index ``page_idx`` and size
+        ``page_size``. By default, the page size is 100 items. If ``fields`` is
+        not ``None``, the teams are returned as dicts with only those fields,
+        as returned by ``check_fields``. Otherwise, the team vertices are
+        converted with ``convert`` or, if it is ``None``, returned as
+        ``DbTeam`` objects."""
+
+        vteams = self._g \
+            .teams(self._universe(universe), team_identifier) \
+            .paginate(page_idx, page_size, after) \
+            .project_fields(fields) \
+            .toList()
+
+        convert = _converter(fields, convert, DbTeam.from_vteam)
+        teams = [convert(vt) for vt in vteams]
+        return teams
+
+    def stream_teams(
+        self,
+        team_identifier=None,
+        universe=CURRENT_UNIVERSE,
+        fields=None,
+        convert=None,
+    ):
+        """Yields all the teams associated with the given ``universe``
+        (filtered by ``identifier`` if specified) as they are received from
+        the graph, so the whole list is never held in memory. See ``teams``
+        for the meaning of ``fields`` and ``convert``."""
+        vteams = gremlin.stream(
+            self._conn,
+            self._g
+            .teams(self._universe(universe), team_identifier)
+            .project_fields(fields),
+        )
+        convert = _converter(fields, convert, DbTeam.from_vteam)
+        for vteam in vteams:
+            yield convert(vteam)
+
+    def team(self, vid, fields=None):
+        """Returns the team with vertex ID ``vid``. If the team does not exist,
+        a ``NotFoundError`` exception is raised. See ``teams`` for the meaning
+        of ``fields``."""
+        vteams = self._g \
+            .team(vid) \
+            .project_fields(fields) \
+            .toList()
+
+        if len(vteams) == 0:
+            raise NotFoundError(vid)
+        if len(vteams) > 1:
+            raise InconsistentStateError('duplicated team')
+
+        if fields is not None:
+            return from_projection(vteams[0])
+        return DbTeam.from_vteam(vteams[0])
+
+    def team_vids(self, vids):
+        """Returns the teams with the vertex IDs in ``vids`` using a single
+        traversal. This function returns a dict of the form ``{vid: DbTeam}``.
+        The vertex IDs that do not exist are not included in the dict."""
+        if len(vids) == 0:
+            return {}
+
+        vteams = self._g \
+            .team_vids(list(dict.fromkeys(vids))) \
+            .elementMap() \
+            .toList()
+
+        teams = [DbTeam.from_vteam(vt) for vt in vteams]
+        return {dbteam.vid: dbteam for dbteam in teams}
+
+    def team_identifiers(self, identifiers, universe=CURRENT_UNIVERSE):
+        """Returns the teams with the identifiers in ``identifiers`` that are
+        linked to the given ``universe`` using a single traversal. This
+        function returns a dict of the form ``{identifier: DbTeam}``. The
+        identifiers that do not exist, or exist but are not linked to the
+        given ``universe``, are not included in the dict."""
+        if len(identifiers) == 0:
+            return {}
+
+        vteams = self._g \
+            .team_identifiers(
+                list(dict.fromkeys(identifiers)),
+                self._universe(universe),
+                self._vids,
+            ) \
+            .elementMap() \
+            .toList()
+
+        teams = {}
+        for vteam in vteams:
+            dbteam = DbTeam.from_vteam(vteam)
+            if dbteam.identifier in teams:
+                raise InconsistentStateError('duplicated team')
+            teams[dbteam.identifier] = dbteam
+
+        return teams
+
+    def team_identifier(self, identifier, universe=CURRENT_UNIVERSE):
+        """Returns the team with identifier ``identifier`` of the specified
+        ``universe``. If the team does not exist, a ``NotFoundError`` exception
+        is raised."""
+        vteams = self._g \
+            .team_identifier(
+                identifier, self._universe(universe), self._vids) \
+            .elementMap() \
+            .toList()
+
+        if len(vteams) == 0:
+            raise NotFoundError(identifier)
+        if len(vteams) > 1:
+            raise InconsistentStateError('duplicated team')
+
+        return DbTeam.from_vteam(vteams[0])
+
+    def add_team(self, team, universe=CURRENT_UNIVERSE):
+        """Create a new team associated to the specified ``universe``. If the
+        team already exists, a ``ConflictError`` exception is raised."""
+        if team.identifier == '':
+            raise ValueError('empty team identifier')
+
+        if team.name == '':
+            raise ValueError('empty team name')
+
+        try:
+            vteams = self._g \
+                .add_team(team, self._universe(universe), self._vids) \
+                .toList()
+        except GremlinServerError as e:
+            # The team was created concurrently with the same natural ID.
+            if gremlin.is_id_conflict(e):
+                raise ConflictError(team.identifier) from e
+            raise
+
+        if len(vteams) == 0:
+            raise InventoryError('team was not created')
+        if len(vteams) > 1:
+            raise InconsistentStateError('duplicated team')
+        if vteams[0]['exists']:
+            raise ConflictError(team.identifier)
+
+        return DbTeam.from_vteam(vteams[0]['vertex'])
+
+    def update_team(self, vid, team):
+        """Updates the team with vertex ID ``vid``. If the team does not exist,
+        a ``NotFoundError`` exception is raised."""
+        vteams = self._g.update_team(vid, team).toList()
+
+        if len(vteams) == 0:
+            raise NotFoundError(vid)
+        if len(vteams) > 1:
+            raise InconsistentStateError('duplicated team')
+
+        return DbTeam.from_vteam(vteams[0])
+
+    def drop_team(self, vid):
+        """Deletes the team with vertex ID ``vid``. If the team does not exist,
+        a ``NotFoundError`` exception is raised."""
+        nteams = self._g.drop_team(vid).next()
+
+        if nteams == 0:
+            raise NotFoundError(vid)
+        if nteams > 1:
+            raise InconsistentStateError('duplicated team')
+
+    # Assets.
+
+    def assets(
+        self,
+        page_idx=None,
+        page_size=100,
+        asset_type=None,
+        asset_identifier=None,
+        valid_at=None,
+        universe=CURRENT_UNIVERSE,
+        after=None,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns all the assets belonging to the specified
+        ``universe`` (filtered by ``type`` and ``identifier`` if any is
+        specified) if ``page_idx`` and ``after`` are None. If ``after`` is
+        specified, it returns the page of assets of size ``page_size`` whose
+        vertex IDs are greater than ``after``. Otherwise it returns the page of
+        assets with index ``page_idx`` and size ``page_size``. By default, the
+        page size is 100 items. If ``fields`` is not ``None``, the assets are
+        returned as dicts with only those fields, as returned by
+        ``check_fields``. Otherwise, the asset vertices are converted with
+        ``convert`` or, if it is ``None``, returned as ``DbAsset``
+        objects."""
+
+        vassets = self._g \
+            .assets(
+                self._universe(universe),
+                asset_type,
+                asset_identifier,
+                valid_at,
+                self._key_fallback,
+                self._labels,
+            ) \
+            .paginate(page_idx, page_size, after) \
+            .project_fields(fields) \
+            .toList()
+
+        convert = _converter(fields, convert, DbAsset.from_vasset)
+        assets = [convert(va) for va in vassets]
+        return assets
+
+    def stream_assets(
+        self,
+        asset_type=None,
+        asset_identifier=None,
+        valid_at=None,
+        universe=CURRENT_UNIVERSE,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Yields all the assets belonging to the specified ``universe``
+        (filtered by ``type``, ``identifier`` and ``valid_at`` if any is
+        specified) as they are received from the graph, so the whole list is
+        never held in memory. See ``assets`` for the meaning of ``fields`` and
+        ``convert``."""
+        vassets = gremlin.stream(
+            self._conn,
+            self._g
+            .assets(
+                self._universe(universe),
+                asset_type,
+                asset_identifier,
+                valid_at,
+                self._key_fallback,
+                self._labels,
+            )
+            .project_fields(fields),
+        )
+        convert = _converter(fields, convert, DbAsset.from_vasset)
+        for vasset in vassets:
+            yield convert(vasset)
+
+    def asset(self, vid, fields=None):
+        """Returns the Asset with vertex ID ``vid``. If the asset does not
+        exist, a ``NotFoundError`` exception is raised. See ``assets`` for the
+        meaning of ``fields``."""
+        vassets = self._g \
+            .asset(vid) \
+            .project_fields(fields) \
+            .toList()
+
+        if len(vassets) == 0:
+            raise NotFoundError(vid)
+        if len(vassets) > 1:
+            raise InconsistentStateError('duplicated asset')
+
+        if fields is not None:
+            return from_projection(vassets[0])
+        return DbAsset.from_vasset(vassets[0])
+
+    def asset_id(self, asset_id, universe=CURRENT_UNIVERSE):
+        """Returns the asset with id ``asset_id`` that is linked to the given
+        ``universe``. If the asset does not exist, or it exists but it's not
+        linked to the given ``universe``, a ``NotFoundError`` exception is
+        raised."""
+        vassets = self._g \
+            .asset_id(
+                asset_id,
+                self._universe(universe),
+                self._vids,
+                self._key_fallback,
+            ) \
+            .elementMap() \
+            .toList()
+
+        if len(vassets) == 0:
+            raise NotFoundError(asset_id)
+        if len(vassets) > 1:
+            raise InconsistentStateError('duplicated asset')
+
+        return DbAsset.from_vasset(vassets[0])
+
+    def asset_vids(self, vids):
+        """Returns the assets with the vertex IDs in ``vids`` using a single
+        traversal. This function returns a dict of the form ``{vid:
+        DbAsset}``. The vertex IDs that do not exist are not included in the
+        dict."""
+        if len(vids) == 0:
+            return {}
+
+        vassets = self._g \
+            .asset_vids(list(dict.fromkeys(vids))) \
+            .elementMap() \
+            .toList()
+
+        assets = [DbAsset.from_vasset(va) for va in vassets]
+        return {dbasset.vid: dbasset for dbasset in assets}
+
+    def asset_ids(self, asset_ids, universe=CURRENT_UNIVERSE):
+        """Returns the assets with the ids in ``asset_ids`` that are linked to
+        the given ``universe`` using a single traversal. This function returns
+        a dict of the form ``{AssetID: DbAsset}``. The asset ids that do not
+        exist, or exist but are not linked to the given ``universe``, are not
+        included in the dict."""
+        if len(asset_ids) == 0:
+            return {}
+
+        vassets = self._g \
+            .asset_ids(
+                asset_ids,
+                self._universe(universe),
+                self._vids,
+                self._key_fallback,
+            ) \
+            .elementMap() \
+            .toList()
+
+        wanted = set(asset_ids)
+        assets = {}
+        for vasset in vassets:
+            dbasset = DbAsset.from_vasset(vasset)
+            if dbasset.asset_id not in wanted:
+                continue
+            if dbasset.asset_id in assets:
+                raise InconsistentStateError('duplicated asset')
+            assets[dbasset.asset_id] = dbasset
+
+        return assets
+
+    def add_asset(
+         self,
+         asset,
+         expiration,
+         timestamp=None,
+         universe=CURRENT_UNIVERSE
+    ):
+        """Create a new asset linking it to the specified ``universe``. If the
+        asset already exists, a ``ConflictError`` exception is raised. If the
+        timestamp is not provided, UTC now is used."""
+        if asset.asset_id.type == '' or asset.asset_id.identifier == '':
+            raise ValueError('empty asset type or identifier')
+
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        if expiration < timestamp:
+            raise ValueError('expiration before timestamp')
+
+        try:
+            vassets = self._g \
+                .add_asset(
+                    asset,
+                    expiration,
+                    timestamp,
+                    self._universe(universe),
+                    self._vids,
+                    self._key_fallback,
+                    self._labels,
+                ) \
+                .toList()
+        except GremlinServerError as e:
+            # The asset was created concurrently with the same natural ID.
+            if gremlin.is_id_conflict(e):
+                raise ConflictError(asset.asset_id) from e
+            raise
+
+        if len(vassets) == 0:
+            raise InventoryError('asset was not created')
+        if len(vassets) > 1:
+            raise InconsistentStateError('duplicated asset')
+        if vassets[0]['exists']:
+            raise ConflictError(asset.asset_id)
+
+        return DbAsset.from_vasset(vassets[0]['vertex'])
+
+    def update_asset(self, vid, asset, expiration, timestamp=None):
+        """Updates an asset with the specified time attributes. If the asset
+        does not exist, a ``NotFoundError`` exception is raised. If the
+        timestamp is not provided, UTC now is used.
+
+        The time attributes are updated following these rules:
+
+        - If ``timestamp < first_seen``, then ``first_seen = timestamp``.
+        - If ``timestamp > last_seen``, then ``last_seen = timestamp`` and
+          ``expiration = expiration``.
+        - Otherwise, nothing is modified.
+
+        Thus, an asset can be immediately invalidated with
+        ``timestamp = expiration = now()``.
+        """
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        if expiration < timestamp:
+            raise ValueError('expiration before timestamp')
+
+        vassets = self._g.update_asset(
+            vid, asset, expiration, timestamp).toList()
+
+        if len(vassets) == 0:
+            raise NotFoundError(vid)
+        if len(vassets) > 1:
+            raise InconsistentStateError('duplicated asset')
+
+        return DbAsset.from_vasset(vassets[0])
+
+    def set_asset(
+        self,
+        asset,
+        expiration,
+        timestamp=None,
+        universe=CURRENT_UNIVERSE
+    ):
+        """Updates an asset linked with the specified ``universe`` with the
+        specified time attributes. If the asset does not exist or is not
+        assciated with the universe, it is created. If the timestamp is not
+        provided, UTC now is used. This function returns a tuple containing the
+        vertex and a boolean that indicates if it already existed ``(DbAsset,
+        bool)``.
+
+        The time attributes are updated following these rules:
+
+        - If ``timestamp < first_seen``, then ``first_seen = timestamp``.
+        - If ``timestamp > last_seen``, then ``last_seen = timestamp`` and
+          ``expiration = expiration``.
+        - Otherwise, nothing is modified.
+
+        Thus, an asset can be immediately invalidated with
+        ``timestamp = expiration = now()``.
+        """
+        if asset.asset_id.type == '' or asset.asset_id.identifier == '':
+            raise ValueError('empty asset type or identifier')
+
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        if expiration < timestamp:
+            raise ValueError('expiration before timestamp')
+
+        vassets = _retry_on_id_conflict(
+            lambda: self._g
+            .set_asset(
+                asset,
+                expiration,
+                timestamp,
+                self._universe(universe),
+                self._vids,
+                self._key_fallback,
+                self._labels,
+            )
+            .toList()
+        )
+
+        if len(vassets) == 0:
+            raise InventoryError('asset was not updated')
+        if len(vassets) > 1:
+            raise InconsistentStateError('duplicated asset')
+
+        return (
+            DbAsset.from_vasset(vassets[0]['vertex']),
+            vassets[0]['exists'],
+        )
+
+    def drop_asset(self, vid):
+        """Deletes the asset with vertex ID ``vid``. If the asset does not
+        exist, a ``NotFoundError`` exception is raised."""
+        nassets = self._g.drop_asset(vid).next()
+
+        if nassets == 0:
+            raise NotFoundError(vid)
+        if nassets > 1:
+            raise InconsistentStateError('duplicated asset')
+
+    # Owners.
+
+    def owners(
+        self,
+        asset_vid,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the list of owners (``DbOwns``) of the asset with vertex ID
+        ``asset_vid``.  If the asset does not exist, a ``NotFoundError``
+        exception is raised. If ``page_idx`` and ``after`` are None, all the
+        relationships are returned. If ``after`` is specified, it returns the
+        page of relationships of size ``page_size`` whose edge IDs are greater
+        than ``after``. Otherwise it returns the page of relationships with
+        index ``page_idx`` and size ``page_size``. By default, the page size is
+        100 items. If ``fields`` is not ``None``, the relationships are
+        returned as dicts with only those fields, as returned by
+        ``check_fields``. Otherwise, the edges are converted with ``convert``
+        if it is not ``None``."""
+        eowners = _asset_edges(
+            self._g
+            .owners(asset_vid, page_idx, page_size, after, fields)
+            .next(),
+            asset_vid,
+        )
+
+        convert = _converter(fields, convert, DbOwns.from_eowns)
+        dbowners = [convert(eo) for eo in eowners]
+        return dbowners
+
+    def owned_assets(
+        self,
+        team_vid,
+        active_at=None,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the list of ``DbAsset`` owned by the team with vertex ID
+        ``team_vid``, walking its ``owns`` relationships. If ``active_at`` is
+        not ``None``, only the assets owned at that time are returned. If the
+        team does not exist, a ``NotFoundError`` exception is raised. See
+        ``assets`` for the meaning of the rest of parameters."""
+        result = self._g \
+            .owned_assets(
+                team_vid, active_at, page_idx, page_size, after, fields) \
+            .next()
+
+        if result['teams'] == 0:
+            raise NotFoundError(team_vid)
+        if result['teams'] > 1:
+            raise InconsistentStateError('duplicated team')
+
+        convert = _converter(fields, convert, DbAsset.from_vasset)
+        dbassets = [convert(va) for va in result['assets']]
+        return dbassets
+
+    def set_owns(self, owns, start_time, end_time=None):
+        """Updates an ``owns`` relationship with the specified time attributes.
+        If the relationship does not exist, it is created. This function
+        returns a tuple containing the ``DbOwns`` and a boolean that indicates
+        if it already existed ``(DbOwns, bool)``.
+
+        If the team or the asset do not exists, a ``NotFoundError`` exception
+        is raised."""
+
+        # Check that expiration is not before the timestamp.
+        if end_time is not None and end_time < start_time:
+            raise ValueError('end_time before start_time')
+
+        eowns = _retry_on_id_conflict(
+            lambda: self._g
+            .set_owns(owns, start_time, end_time, self._vids)
+            .toList()
+        )
+
+        if len(eowns) == 0:
+            raise InventoryError('owns was not updated')
+        if len(eowns) > 1:
+            raise InconsistentStateError('duplicated edge')
+
+        _raise_missing(eowns[0], owns.team_vid, owns.asset_vid)
+
+        return (
+            DbOwns.from_eowns(eowns[0]['edge']),
+            eowns[0]['exists'],
+        )
+
+    def drop_owns(self, eid):
+        """Deletes the ``owns`` edge with ID ``eid``. If the edge does not
+        exist, a ``NotFoundError`` exception is raised."""
+        nowns = self._g.drop_owns(eid).next()
+
+        if nowns == 0:
+            raise NotFoundError(eid)
+        if nowns > 1:
+            raise InconsistentStateError('duplicated edge')
+
+    def drop_owns_between(self, team_vid, asset_vid):
+        """Deletes the ``owns`` relationship between the team with vertex ID
+        ``team_vid`` and the asset with vertex ID ``asset_vid``. The edge is
+        looked up and deleted in a single query, without retrieving the owners
+        of the asset. If the asset does not exist, a ``NotFoundError``
+        exception referring to ``asset_vid`` is raised. If the relationship
+        does not exist, the exception refers to ``team_vid``."""
+        _check_dropped_edges(
+            self._g.drop_owns_between(team_vid, asset_vid).next(),
+            asset_vid,
+            team_vid,
+        )
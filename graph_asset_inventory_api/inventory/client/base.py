@@ -0,0 +1,198 @@
+"""This module provides the class ``BaseInventoryClient``, that holds the
+graph connection and the universes of the clients of the Asset Inventory."""
+
+from gremlin_python.process.anonymous_traversal import traversal
+from gremlin_python.driver.protocol import GremlinServerError
+
+from graph_asset_inventory_api.inventory import (
+    DbUniverse,
+    ASSET_KEY_MODES,
+    InventoryError,
+    NotFoundError,
+    InconsistentStateError,
+)
+from graph_asset_inventory_api.inventory.dsl import (
+    InventoryTraversalSource,
+)
+from graph_asset_inventory_api.inventory.vids import vertex_ids
+from graph_asset_inventory_api.inventory.labels import asset_labels
+from graph_asset_inventory_api.inventory.fields import from_projection
+from graph_asset_inventory_api import gremlin
+from graph_asset_inventory_api.inventory import CURRENT_UNIVERSE
+
+
+class BaseInventoryClient:
+    """Base of the clients of the Asset Inventory. It holds the graph
+    connection and the cache of universes, as described in
+    ``InventoryClient``."""
+
+    def __init__(
+        self,
+        gremlin_endpoint,
+        auth_mode='none',
+        vid_scheme='random',
+        asset_keys='hybrid',
+        label_mode='single',
+    ):  # pylint: disable=too-many-arguments
+        if asset_keys not in ASSET_KEY_MODES:
+            raise ValueError(f'unknown asset key mode: {asset_keys}')
+
+        self._vids = vertex_ids(vid_scheme)
+        self._labels = asset_labels(label_mode)
+        self._key_fallback = asset_keys == 'hybrid'
+        self._conn = gremlin.get_connection(gremlin_endpoint, auth_mode)
+        self._g = traversal(InventoryTraversalSource).withRemote(self._conn)
+        self._universes = {}
+
+    def close(self):
+        """Releases the resources being used by the client, for instance the
+        graph connection."""
+        self._conn.close()
+
+    def g(self):
+        """Returns the graph traversal source."""
+        return self._g
+
+    def ping(self):
+        """Executes a trivial traversal to check that the graph is reachable.
+        If the graph connection is not open yet, it is opened. An exception is
+        raised if the graph cannot be reached."""
+        self._g.inject(0).next()
+
+    # Universe.
+
+    def linked_universe(self, vid):
+        """Returns the universe associated with a the team or asset identified
+        by ``vid``."""
+
+        universe = self._g.linked_universe(vid).elementMap().toList()
+
+        if len(universe) == 0:
+            raise NotFoundError(vid)
+        if len(universe) > 1:
+            raise InconsistentStateError('duplicated universe')
+
+        universe = universe[0]
+        return DbUniverse.from_vuniverse(universe)
+
+    def current_universe(self):
+        """Returns the universe associated with the ``CURRENT_UNIVERSE``
+        constant."""
+
+        universe = self._g.universe(CURRENT_UNIVERSE).elementMap().toList()
+
+        if len(universe) == 0:
+            raise NotFoundError()
+        if len(universe) > 1:
+            raise InconsistentStateError('duplicated universe')
+
+        universe = universe[0]
+        return DbUniverse.from_vuniverse(universe)
+
+    def ensure_universe(self, universe=CURRENT_UNIVERSE):
+        """Ensure that there is a vertex for the specified ``universe``. The
+        vertex ID of the universe is cached."""
+
+        vuniverse = self._g.ensure_universe(universe).next()
+        self._universes[_universe_key(universe)] = \
+            DbUniverse.from_vuniverse(vuniverse)
+
+    def invalidate_universes(self):
+        """Clears the cached vertex IDs of the universes. They are retrieved
+        again the next time every universe is used."""
+        self._universes = {}
+
+    def _universe(self, universe):
+        """Returns the ``DbUniverse`` that corresponds to ``universe``, so the
+        traversals can refer to the ``Universe`` vertex by its ID. If the
+        universe is not cached, it is retrieved from the graph and cached. If
+        it does not exist, ``universe`` is returned and the traversals match
+        the ``Universe`` vertex by its properties."""
+        if isinstance(universe, DbUniverse):
+            return universe
+
+        key = _universe_key(universe)
+        dbuniverse = self._universes.get(key)
+        if dbuniverse is not None:
+            return dbuniverse
+
+        vuniverses = self._g.universe(universe).elementMap().toList()
+        if len(vuniverses) != 1:
+            return universe
+
+        dbuniverse = DbUniverse.from_vuniverse(vuniverses[0])
+        self._universes[key] = dbuniverse
+        return dbuniverse
+
+
+def _universe_key(universe):
+    """Returns the key of ``universe`` in the cache of universes."""
+    return universe.namespace, universe.version.int_version
+
+
+def _converter(fields, convert, default):
+    """Returns the function used to convert the elements returned by a
+    listing: ``from_projection`` if only some ``fields`` were requested,
+    ``convert`` if it is not ``None`` and ``default`` otherwise."""
+    if fields is not None:
+        return from_projection
+    if convert is not None:
+        return convert
+    return default
+
+
+def _retry_on_id_conflict(upsert):
+    """Calls ``upsert``, a function that runs an upsert traversal, and returns
+    its result. With natural IDs, two concurrent upserts of the same element
+    can both miss it and try to create it with the same ID, so the Gremlin
+    server rejects one of them. In that case, the upsert is run again once,
+    which finds and updates the element created by the other one."""
+    try:
+        return upsert()
+    except GremlinServerError as e:
+        if not gremlin.is_id_conflict(e):
+            raise
+    return upsert()
+
+
+def _asset_edges(result, asset_vid):
+    """Returns the list of edges in ``result``, the map returned by an
+    ``asset_edges`` traversal. If the asset with vertex ID ``asset_vid`` does
+    not exist, a ``NotFoundError`` exception is raised."""
+    if result['assets'] == 0:
+        raise NotFoundError(asset_vid)
+    if result['assets'] > 1:
+        raise InconsistentStateError('duplicated asset')
+
+    return result['edges']
+
+
+def _check_dropped_edges(result, asset_vid, other_vid):
+    """Checks ``result``, the map returned by a ``drop_asset_edges``
+    traversal. If the asset with vertex ID ``asset_vid`` does not exist, a
+    ``NotFoundError`` exception referring to it is raised. If no edge was
+    deleted, the exception refers to ``other_vid``, the vertex ID of the other
+    end of the relationship."""
+    if result['assets'] == 0:
+        raise NotFoundError(asset_vid)
+    if result['assets'] > 1:
+        raise InconsistentStateError('duplicated asset')
+    if result['edges'] == 0:
+        raise NotFoundError(other_vid)
+    if result['edges'] > 1:
+        raise InconsistentStateError('duplicated edge')
+
+
+def _raise_missing(result, *vids):
+    """Raises a ``NotFoundError`` exception if ``result``, the map returned by
+    a relationship upsert, reports that any of the vertices does not exist.
+    ``vids`` are checked in order, so the exception refers to the first
+    missing one."""
+    if 'missing' not in result:
+        return
+
+    for vid in vids:
+        if vid in result['missing']:
+            raise NotFoundError(vid)
+
+    raise InventoryError('unexpected missing vertex')
@@ -0,0 +1,149 @@
+"""This module provides the bulk upserts of ``InventoryClient``."""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+
+from graph_asset_inventory_api.inventory import (
+    BatchItem,
+    InventoryError,
+    InconsistentStateError,
+)
+from graph_asset_inventory_api.inventory.client.base import (
+    BaseInventoryClient,
+    _retry_on_id_conflict,
+)
+from graph_asset_inventory_api.inventory import CURRENT_UNIVERSE
+
+
+class BulkInventoryClient(BaseInventoryClient):
+    """Client that upserts batches of assets and ``parent_of`` relationships
+    in the Asset Inventory."""
+
+    def set_assets(self, assets, universe=CURRENT_UNIVERSE):
+        """Updates several assets linked with the specified ``universe`` using
+        a single traversal. ``assets`` is a list of ``BatchItem`` whose
+        elements are ``Asset``. Plain tuples with the fields of ``BatchItem``
+        are accepted too. If an asset does not exist or is not associated with
+        the universe, it is created. If a timestamp is ``None``, UTC now is
+        used. This function returns a list of tuples containing the vertex ID
+        of every asset and a boolean that indicates if it already existed
+        ``(vid, bool)``, in the same order as ``assets``.
+
+        The time attributes are updated following the same rules as
+        ``set_asset``."""
+        if len(assets) == 0:
+            return []
+
+        now = datetime.now(timezone.utc)
+
+        upserts = []
+        for item in assets:
+            item = _upsert_item(item, now)
+            asset_id = item.element.asset_id
+            if asset_id.type == '' or asset_id.identifier == '':
+                raise ValueError('empty asset type or identifier')
+            upserts.append(item)
+
+        vassets = _retry_on_id_conflict(
+            lambda: self._g
+            .set_assets(
+                upserts,
+                self._universe(universe),
+                self._vids,
+                self._key_fallback,
+                self._labels,
+            )
+            .next()
+        )
+
+        if len(vassets) < len(upserts):
+            raise InventoryError('assets were not updated')
+        if len(vassets) > len(upserts):
+            raise InconsistentStateError('duplicated asset')
+
+        vassets = sorted(vassets, key=lambda va: va['idx'])
+        return [(va['vid'], va['exists']) for va in vassets]
+
+    def set_asset_keys(self, assets, universe=CURRENT_UNIVERSE):
+        """Sets the composite key of the assets in ``assets``, a list of
+        ``DbAsset`` linked to the specified ``universe``, that do not have it
+        yet, using a single traversal. It returns the number of updated
+        assets."""
+        if len(assets) == 0:
+            return 0
+
+        return self._g \
+            .set_asset_keys(assets, self._universe(universe)) \
+            .next()
+
+    def set_parent_ofs(self, parentofs):
+        """Updates several ``parent_of`` relationships using a single
+        traversal. ``parentofs`` is a list of ``BatchItem`` whose elements are
+        ``ParentOf``. Plain tuples with the fields of ``BatchItem`` are
+        accepted too. If a relationship does not exist, it is created. If a
+        timestamp is ``None``, UTC now is used.
+
+        This function returns a tuple ``(results, missing)``. ``results`` is a
+        list of tuples containing the edge ID of every relationship and a
+        boolean that indicates if it already existed ``(eid, bool)``, in the
+        same order as ``parentofs``. The relationships whose assets do not
+        exist are not modified and their entry is ``None``. ``missing`` is the
+        set of vertex IDs of the assets that do not exist.
+
+        The time attributes are updated following the same rules as
+        ``set_parent_of``."""
+        if len(parentofs) == 0:
+            return [], set()
+
+        now = datetime.now(timezone.utc)
+
+        upserts = []
+        for item in parentofs:
+            item = _upsert_item(item, now)
+            if item.element.child_vid == item.element.parent_vid:
+                raise ValueError('child_vid and parent_vid are the same')
+            upserts.append(item)
+
+        eparentofs = _retry_on_id_conflict(
+            lambda: self._g.set_parent_ofs(upserts, self._vids).next())
+
+        if len(eparentofs) < len(upserts):
+            raise InventoryError('parent_of was not updated')
+        if len(eparentofs) > len(upserts):
+            raise InconsistentStateError('duplicated edge')
+
+        results = [None] * len(upserts)
+        missing = set()
+        for epo in eparentofs:
+            if 'missing' in epo:
+                missing.update(epo['missing'])
+                continue
+            results[epo['idx']] = (epo['eid'], epo['exists'])
+
+        return results, missing
+
+
+def _upsert_item(item, now):
+    """Returns the ``BatchItem`` with the time attributes that are written to
+    the graph for ``item``, a ``BatchItem`` or a tuple with its fields. If the
+    timestamp is ``None``, ``now`` is used. If ``first_seen`` is ``None``, the
+    timestamp is used. If the time attributes are not consistent, a
+    ``ValueError`` exception is raised."""
+    item = BatchItem(*item)
+
+    timestamp = item.timestamp
+    if timestamp is None:
+        timestamp = now
+
+    first_seen = item.first_seen
+    if first_seen is None:
+        first_seen = timestamp
+
+    if first_seen > timestamp:
+        raise ValueError('first_seen after timestamp')
+    if item.expiration < timestamp:
+        raise ValueError('expiration before timestamp')
+
+    return item._replace(timestamp=timestamp, first_seen=first_seen)
@@ -0,0 +1,253 @@
+"""This module provides the lineage and the subgraphs of
+``InventoryClient``."""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+
+from graph_asset_inventory_api.inventory import (
+    DbParentOf,
+    DbSubgraph,
+    InventoryError,
+    NotFoundError,
+    InconsistentStateError,
+)
+from graph_asset_inventory_api.inventory.client.base import (
+    BaseInventoryClient,
+    _converter,
+    _retry_on_id_conflict,
+    _asset_edges,
+    _check_dropped_edges,
+    _raise_missing,
+)
+
+
+class LineageInventoryClient(BaseInventoryClient):
+    """Client that provides access to the ``parent_of`` relationships and the
+    subgraphs of the Asset Inventory."""
+
+    def subgraph(self, asset_vid, depth=1, max_nodes=500):
+        """Returns the ``DbSubgraph`` with the teams and assets up to
+        ``depth`` ``parent_of`` or ``owns`` relationships away from the asset
+        with vertex ID ``asset_vid``, in any direction, and the relationships
+        between them, using a single traversal. At most ``max_nodes`` teams
+        and assets, including the asset itself, are returned. If there are
+        more, the subgraph is flagged as truncated and only the relationships
+        between the returned teams and assets are included. If the asset does
+        not exist, a ``NotFoundError`` exception is raised."""
+        result = self._g.subgraph(asset_vid, depth, max_nodes).next()
+
+        if result['assets'] == 0:
+            raise NotFoundError(asset_vid)
+        if result['assets'] > 1:
+            raise InconsistentStateError('duplicated asset')
+
+        return DbSubgraph.from_subgraph(result, max_nodes)
+
+    # Parents.
+
+    def parents(
+        self,
+        asset_vid,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the list of ``DbParentOf`` of the asset with vertex ID
+        ``asset_vid``. If the asset does not exist, a ``NotFoundError``
+        exception is raised. If ``page_idx`` and ``after`` are None, all the
+        relationships are returned. If ``after`` is specified, it returns the
+        page of relationships of size ``page_size`` whose edge IDs are greater
+        than ``after``. Otherwise it returns the page of relationships with
+        index ``page_idx`` and size ``page_size``. By default, the page size is
+        100 items. If ``fields`` is not ``None``, the relationships are
+        returned as dicts with only those fields, as returned by
+        ``check_fields``. Otherwise, the edges are converted with ``convert``
+        if it is not ``None``."""
+        eparents = _asset_edges(
+            self._g
+            .parents(asset_vid, page_idx, page_size, after, fields)
+            .next(),
+            asset_vid,
+        )
+
+        convert = _converter(fields, convert, DbParentOf.from_eparentof)
+        dbparents = [convert(epo) for epo in eparents]
+        return dbparents
+
+    def set_parent_of(self, parentof, expiration, timestamp=None):
+        """Updates a ``parent_of`` relationship with the specified time
+        attributes. If the relationship does not exist, it is created. If the
+        timestamp is not provided, UTC now is used. This function returns a
+        tuple containing the ``DbParentOf`` and a boolean that indicates if it
+        already existed ``(DbParentOf, bool)``.
+
+        If any of the assets does not exists, a ``NotFoundError`` exception is
+        raised.
+
+        The time attributes are updated following these rules:
+
+        - If ``timestamp < first_seen``, then ``first_seen = timestamp``.
+        - If ``timestamp > last_seen``, then ``last_seen = timestamp`` and
+          ``expiration = expiration``.
+        - Otherwise, nothing is modified.
+
+        Thus, an asset can be immediately invalidated with
+        ``timestamp = expiration = now()``.
+        """
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        # Check that expiration is not before the timestamp.
+        if expiration < timestamp:
+            raise ValueError('expiration before timestamp')
+
+        # Check that child and parent are not the same.
+        if parentof.child_vid == parentof.parent_vid:
+            raise ValueError('child_vid and parent_vid are the same')
+
+        eparentof = _retry_on_id_conflict(
+            lambda: self._g
+            .set_parent_of(parentof, expiration, timestamp, self._vids)
+            .toList()
+        )
+
+        if len(eparentof) == 0:
+            raise InventoryError('parent_of was not updated')
+        if len(eparentof) > 1:
+            raise InconsistentStateError('duplicated edge')
+
+        _raise_missing(
+            eparentof[0], parentof.child_vid, parentof.parent_vid)
+
+        return (
+            DbParentOf.from_eparentof(eparentof[0]['edge']),
+            eparentof[0]['exists'],
+        )
+
+    def drop_parent_of(self, eid):
+        """Deletes the ``parent_of`` edge with ID ``eid``. If the edge does not
+        exist, a ``NotFoundError`` exception is raised."""
+        nparentofs = self._g.drop_parent_of(eid).next()
+
+        if nparentofs == 0:
+            raise NotFoundError(eid)
+        if nparentofs > 1:
+            raise InconsistentStateError('duplicated edge')
+
+    def drop_parent_of_between(self, parent_vid, child_vid):
+        """Deletes the ``parent_of`` relationship between the assets with
+        vertex IDs ``parent_vid`` and ``child_vid``. The edge is looked up and
+        deleted in a single query, without retrieving the parents of the
+        child. If the child does not exist, a ``NotFoundError`` exception
+        referring to ``child_vid`` is raised. If the relationship does not
+        exist, the exception refers to ``parent_vid``."""
+        _check_dropped_edges(
+            self._g.drop_parent_of_between(parent_vid, child_vid).next(),
+            child_vid,
+            parent_vid,
+        )
+
+    def children(
+        self,
+        asset_vid,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the list of (outgoing) ``DbParentOf`` of the asset with
+        vertex ID ``asset_vid``. If the asset does not exist, a
+        ``NotFoundError`` exception is raised. If ``page_idx`` and ``after``
+        are None, all the relationships are returned. If ``after`` is
+        specified, it returns the page of relationships of size ``page_size``
+        whose edge IDs are greater than ``after``. Otherwise it returns the
+        page of relationships with index ``page_idx`` and size ``page_size``.
+        By default, the page size is 100 items. If ``fields`` is not ``None``,
+        the relationships are returned as dicts with only those fields, as
+        returned by ``check_fields``. Otherwise, the edges are converted with
+        ``convert`` if it is not ``None``."""
+        echildren = _asset_edges(
+            self._g
+            .children(asset_vid, page_idx, page_size, after, fields)
+            .next(),
+            asset_vid,
+        )
+
+        convert = _converter(fields, convert, DbParentOf.from_eparentof)
+        dbchildren = [convert(epo) for epo in echildren]
+        return dbchildren
+
+    def ancestors(
+        self,
+        asset_vid,
+        max_depth=None,
+        valid_at=None,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the list of ``DbParentOf`` between the asset with vertex ID
+        ``asset_vid`` and its ancestors, up to ``max_depth`` levels if it is
+        not ``None``, using a single traversal. If ``valid_at`` is not
+        ``None``, only the relationships valid at that time are followed.
+        Every relationship is returned once, even if there are cycles. If the
+        asset does not exist, a ``NotFoundError`` exception is raised. See
+        ``parents`` for the meaning of the rest of parameters."""
+        eancestors = _asset_edges(
+            self._g
+            .ancestors(
+                asset_vid,
+                max_depth,
+                valid_at,
+                page_idx,
+                page_size,
+                after,
+                fields,
+            )
+            .next(),
+            asset_vid,
+        )
+
+        convert = _converter(fields, convert, DbParentOf.from_eparentof)
+        dbancestors = [convert(epo) for epo in eancestors]
+        return dbancestors
+
+    def descendants(
+        self,
+        asset_vid,
+        max_depth=None,
+        valid_at=None,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+        convert=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the list of ``DbParentOf`` between the asset with vertex ID
+        ``asset_vid`` and its descendants. See ``ancestors`` for the meaning
+        of the parameters."""
+        edescendants = _asset_edges(
+            self._g
+            .descendants(
+                asset_vid,
+                max_depth,
+                valid_at,
+                page_idx,
+                page_size,
+                after,
+                fields,
+            )
+            .next(),
+            asset_vid,
+        )
+
+        convert = _converter(fields, convert, DbParentOf.from_eparentof)
+        dbdescendants = [convert(epo) for epo in edescendants]
+        return dbdescendants
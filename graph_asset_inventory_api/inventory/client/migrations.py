@@ -0,0 +1,148 @@
+"""This module provides the migrations of ``InventoryClient``."""
+
+import uuid
+
+from gremlin_python.process.traversal import T, Direction
+from gremlin_python.process.graph_traversal import __
+
+from graph_asset_inventory_api.inventory import (
+    InventoryError,
+    NotFoundError,
+    ConflictError,
+    InconsistentStateError,
+)
+from graph_asset_inventory_api.inventory.client.base import (
+    BaseInventoryClient,
+)
+
+
+class MigrationsInventoryClient(BaseInventoryClient):
+    """Client that replaces the vertices and edges of the Asset Inventory
+    during its migrations."""
+
+    def replace_vertex(self, vid, new_vid, vids=None, label=None):
+        """Replaces the vertex with ID ``vid`` by a vertex with ID ``new_vid``
+        and the same label, properties and edges. The edges get new IDs. If
+        ``vids`` is not ``None``, the ``parent_of`` and ``owns`` edges get
+        their natural IDs. If ``label`` is not ``None``, the new vertex gets
+        that label instead. If ``new_vid`` is equal to ``vid``, the vertex is
+        replaced in place and the edges keep their IDs, which allows to change
+        the label of a vertex. If the vertex does not exist, a
+        ``NotFoundError`` exception is raised. If
+        there is already a vertex with ID ``new_vid``, a ``ConflictError``
+        exception is raised. If the vertex or its edges are modified while it
+        is being replaced, an ``InventoryError`` exception is raised and the
+        vertex is left untouched, so the replacement can be retried."""
+        in_place = new_vid == vid
+        if not in_place and self._g.V(new_vid).hasNext():
+            raise ConflictError(new_vid)
+
+        vertices = self._g.V(vid).elementMap().toList()
+        if len(vertices) == 0:
+            raise NotFoundError(vid)
+        if len(vertices) > 1:
+            raise InconsistentStateError('duplicated vertex')
+
+        edges = []
+        for edge in self._g.V(vid).bothE().dedup().elementMap().toList():
+            out = edge[Direction.OUT][T.id] == vid
+            other_vid = edge[Direction.IN if out else Direction.OUT][T.id]
+            if in_place:
+                eid = edge[T.id]
+            else:
+                eid = _new_eid(
+                    vids,
+                    edge[T.label],
+                    new_vid if out else other_vid,
+                    other_vid if out else new_vid,
+                )
+            edges.append((
+                out,
+                edge[T.label],
+                other_vid,
+                edge[T.id],
+                eid,
+                _properties(edge),
+            ))
+
+        if label is None:
+            label = vertices[0][T.label]
+
+        replaced = self._g \
+            .replace_vertex(
+                vid,
+                new_vid,
+                label,
+                _properties(vertices[0]),
+                edges,
+            ) \
+            .toList()
+
+        if len(replaced) == 0:
+            raise InventoryError(f'vertex modified while replacing it: {vid}')
+
+    def vertex_labels(self, vids):
+        """Returns the labels of the vertices with the IDs in ``vids`` using a
+        single traversal. This function returns a dict of the form ``{vid:
+        label}``. The vertices that do not exist are not included in the
+        dict."""
+        if len(vids) == 0:
+            return {}
+
+        vlabels = self._g \
+            .V(*vids) \
+            .project('vid', 'label') \
+            .by(__.id()) \
+            .by(__.label()) \
+            .toList()
+
+        return {vl['vid']: vl['label'] for vl in vlabels}
+
+    def replace_edge(self, eid, new_eid):
+        """Replaces the edge with ID ``eid`` by an edge with ID ``new_eid`` and
+        the same label, endpoints and properties. If the edge does not exist, a
+        ``NotFoundError`` exception is raised. If there is already an edge with
+        ID ``new_eid``, a ``ConflictError`` exception is raised. If the edge is
+        modified while it is being replaced, an ``InventoryError`` exception is
+        raised and the edge is left untouched."""
+        if self._g.E(new_eid).hasNext():
+            raise ConflictError(new_eid)
+
+        edges = self._g.E(eid).elementMap().toList()
+        if len(edges) == 0:
+            raise NotFoundError(eid)
+        if len(edges) > 1:
+            raise InconsistentStateError('duplicated edge')
+
+        replaced = self._g \
+            .replace_edge(
+                eid,
+                new_eid,
+                edges[0][T.label],
+                edges[0][Direction.OUT][T.id],
+                edges[0][Direction.IN][T.id],
+                _properties(edges[0]),
+            ) \
+            .toList()
+
+        if len(replaced) == 0:
+            raise InventoryError(f'edge modified while replacing it: {eid}')
+
+
+def _new_eid(vids, label, out_vid, in_vid):
+    """Returns the ID of a ``label`` edge, from the vertex with ID ``out_vid``
+    to the vertex with ID ``in_vid``, that is being recreated. The
+    ``parent_of`` and ``owns`` edges get a natural ID, if ``vids`` is not
+    ``None``, or a random one. The IDs of the other edges are assigned by the
+    graph, so ``None`` is returned."""
+    if label not in ('parent_of', 'owns'):
+        return None
+    if vids is None:
+        return str(uuid.uuid4())
+    return vids.edge(label, out_vid, in_vid)
+
+
+def _properties(element):
+    """Returns the properties of ``element``, the element map of a vertex or
+    an edge, without its ID, label and endpoints."""
+    return {k: v for k, v in element.items() if isinstance(k, str)}
@@ -0,0 +1,498 @@
+"""Gremlin DSL for the Asset Inventory."""
+
+import uuid
+
+from gremlin_python.process.traversal import P
+from gremlin_python.process.traversal import (
+    T,
+    Cardinality,
+    Scope,
+)
+
+from graph_asset_inventory_api.inventory import AssetID, DbUniverse
+from graph_asset_inventory_api.inventory.dsl.traversal import __
+from graph_asset_inventory_api.inventory.dsl.lineage import (
+    LineageTraversalSource,
+)
+from graph_asset_inventory_api.inventory.dsl.owners import (
+    OwnersTraversalSource,
+)
+from graph_asset_inventory_api.inventory.dsl.migrations import (
+    MigrationsTraversalSource,
+)
+
+
+class InventoryTraversalSource(
+    LineageTraversalSource,
+    OwnersTraversalSource,
+    MigrationsTraversalSource,
+):
+    """Graph Traversal Source for the Asset Inventory. The steps of the
+    ``parent_of`` and ``owns`` edges and of the migrations are defined in the
+    ``lineage``, ``owners`` and ``migrations`` modules."""
+
+    # Teams.
+
+    def teams(self, universe, team_identifier=None):
+        """Returns all the ``Team`` vertices belonging to the given
+        universe."""
+        if team_identifier is None and isinstance(universe, DbUniverse):
+            return self.universe_of(universe).is_team()
+
+        teams = self \
+            .V() \
+            .is_team() \
+            .where(__.is_linked_to_universe(universe))
+
+        if team_identifier is not None:
+            teams = teams.has('identifier', team_identifier)
+
+        return teams
+
+    def team_vids(self, vids):
+        """Returns the ``Team`` vertices with the vertex IDs ``vids``. The IDs
+        that do not exist are skipped."""
+        return self.V(*vids).is_team()
+
+    def team_identifiers(self, identifiers, universe, vids=None):
+        """Returns the ``Team`` vertices associated with the given
+        ``universe`` whose ``identifier`` is any of ``identifiers``. If
+        ``vids`` is not ``None`` and does not fall back to property lookups,
+        the vertices are looked up by their natural IDs."""
+        if vids is not None and not vids.fallback:
+            return self \
+                .V(*[vids.team(universe, i) for i in identifiers]) \
+                .is_team() \
+                .where(__.is_linked_to_universe(universe))
+
+        return self \
+            .V() \
+            .is_team() \
+            .has('identifier', P.within(sorted(set(identifiers)))) \
+            .where(__.is_linked_to_universe(universe))
+
+    def team_identifier(self, identifier, universe, vids=None):
+        """Returns a ``Team`` vertex with a given ``identifier`` belonging to
+        the given universe. See ``InventoryTraversal.lookup_team_identifier``
+        for the meaning of ``vids``."""
+        if vids is None:
+            return self \
+                .V() \
+                .is_team_identifier(identifier) \
+                .where(__.is_linked_to_universe(universe))
+        return self \
+            .inject(0) \
+            .lookup_team_identifier(identifier, universe, vids)
+
+    def add_team(self, team, universe, vids=None):
+        """Creates a new ``Team`` vertex and links it the specified
+        ``universe``. If ``vids`` is not ``None``, the team is looked up and
+        created with its natural ID."""
+        return self \
+            .team_identifier(team.identifier, universe, vids) \
+            .fold() \
+            .coalesce(
+                # The team exists.
+                __.unfold()
+                .choose(
+                    __.is_linked_to_universe(universe),
+                    # The team exists and is linked to the universe.
+                    __.project('vertex', 'exists')
+                    .by(__.identity().elementMap())
+                    .by(__.constant(True)),
+                    # Even though the team exists, it is not linked to the
+                    # universe so we create a new team and link it to
+                    # the proper universe.
+                    __.add_team(team, universe, vids)
+                    .project('vertex', 'exists')
+                    .by(__.identity().elementMap())
+                    .by(__.constant(False)),
+                ),
+                # The team does not exist in any universe.
+                __.add_team(team, universe, vids)
+                .project('vertex', 'exists')
+                .by(__.identity().elementMap())
+                .by(__.constant(False))
+            )
+
+    def update_team(self, vid, team):
+        """Updates the ``Team`` vertex with id ``vid``."""
+        return self \
+            .team(vid) \
+            .is_team_identifier(team.identifier) \
+            .property(Cardinality.single, 'name', team.name) \
+            .elementMap()
+
+    def drop_team(self, vid):
+        """Deletes the ``Team`` vertex with id ``vid``."""
+        return self \
+            .team(vid) \
+            .sideEffect(__.drop()) \
+            .count()
+
+    # Assets.
+
+    def assets(
+        self,
+        universe,
+        asset_type=None,
+        asset_identifier=None,
+        valid_at=None,
+        key_fallback=True,
+        labels=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns all the ``Asset`` vertices that belong to a ``Universe``. If
+        both ``asset_type`` and ``asset_identifier`` are specified and
+        ``key_fallback`` is ``False``, the assets are filtered by their
+        composite key. Otherwise, if ``asset_type`` is specified and
+        ``labels`` scans the labels of the types, the assets are filtered by
+        the label of their type."""
+        type_label = None
+        if asset_type is not None and labels is not None and labels.scan:
+            type_label = labels.type_label(asset_type)
+
+        if asset_type is None and asset_identifier is None and \
+                isinstance(universe, DbUniverse):
+            assets = self.universe_of(universe).is_asset()
+        elif asset_type is not None and asset_identifier is not None and \
+                not key_fallback:
+            asset_id = AssetID(asset_type, asset_identifier)
+            assets = self \
+                .V() \
+                .is_asset_key(asset_id, universe) \
+                .where(__.is_linked_to_universe(universe))
+        elif type_label is not None:
+            # The type is also checked, so assets cannot be confused if
+            # their types only differ in characters not allowed in labels.
+            assets = self \
+                .V() \
+                .hasLabel(type_label) \
+                .has('type', asset_type) \
+                .where(__.is_linked_to_universe(universe))
+
+            if asset_identifier is not None:
+                assets = assets.has('identifier', asset_identifier)
+        else:
+            assets = self \
+                .V() \
+                .is_asset() \
+                .where(__.is_linked_to_universe(universe))
+
+            if asset_type is not None:
+                assets = assets.has('type', asset_type)
+
+            if asset_identifier is not None:
+                assets = assets.has('identifier', asset_identifier)
+
+        if valid_at is not None:
+            assets = assets.is_valid_at(valid_at)
+
+        return assets
+
+    def asset_id(self, asset_id, universe, vids=None, key_fallback=True):
+        """Returns an ``Asset`` vertex with a given ``type`` and ``identifier``
+        if it exists and it's associated the with the given ``universe``. See
+        ``InventoryTraversal.lookup_asset_id`` for the meaning of ``vids`` and
+        ``key_fallback``."""
+        if vids is None and not key_fallback:
+            return self \
+                .V() \
+                .is_asset_key(asset_id, universe) \
+                .where(__.is_linked_to_universe(universe))
+        return self \
+            .inject(0) \
+            .lookup_asset_id(asset_id, universe, vids, key_fallback)
+
+    def asset_vids(self, vids):
+        """Returns the ``Asset`` vertices with the vertex IDs ``vids``. The IDs
+        that do not exist are skipped."""
+        return self.V(*vids).is_asset()
+
+    def asset_ids(self, asset_ids, universe, vids=None, key_fallback=True):
+        """Returns the ``Asset`` vertices associated with the given
+        ``universe`` whose ``type`` and ``identifier`` match any of the
+        specified ``asset_ids``. Types and identifiers are filtered
+        independently, so the traversal can also return assets whose
+        combination of ``type`` and ``identifier`` is not in ``asset_ids``.
+        The caller is responsible for discarding them. If ``vids`` is not
+        ``None`` and does not fall back to property lookups, the vertices are
+        looked up by their natural IDs. Otherwise, if ``key_fallback`` is
+        ``False``, they are looked up by their composite keys."""
+        if vids is not None and not vids.fallback:
+            return self \
+                .V(*[vids.asset(universe, a) for a in asset_ids]) \
+                .is_asset() \
+                .where(__.is_linked_to_universe(universe))
+
+        if not key_fallback:
+            keys = sorted({asset_id.key(universe) for asset_id in asset_ids})
+            return self \
+                .V() \
+                .is_asset() \
+                .has('asset_key', P.within(keys)) \
+                .where(__.is_linked_to_universe(universe))
+
+        types = sorted({asset_id.type for asset_id in asset_ids})
+        identifiers = sorted({asset_id.identifier for asset_id in asset_ids})
+        return self \
+            .V() \
+            .is_asset() \
+            .has('identifier', P.within(identifiers)) \
+            .has('type', P.within(types)) \
+            .where(__.is_linked_to_universe(universe))
+
+    def add_asset(
+        self,
+        asset,
+        expiration,
+        timestamp,
+        universe,
+        vids=None,
+        key_fallback=True,
+        labels=None,
+    ):  # pylint: disable=too-many-arguments
+        """Creates a new ``Asset`` vertex, links it to the specified universe
+        and returns the newly created vertex. If ``vids`` is not ``None``, the
+        asset is looked up and created with its natural ID. See
+        ``InventoryTraversal.lookup_asset_id`` for the meaning of
+        ``key_fallback`` and ``InventoryTraversal.add_asset`` for the meaning
+        of ``labels``."""
+        return self \
+            .asset_id(asset.asset_id, universe, vids, key_fallback) \
+            .fold() \
+            .coalesce(
+                # The asset exists.
+                __.unfold()
+                .choose(
+                    __.is_linked_to_universe(universe),
+                    # The Asset exists and is linked to the universe.
+                    __.project('vertex', 'exists')
+                    .by(__.identity().elementMap())
+                    .by(__.constant(True)),
+                    # Even though the asset exists, it is not linked to the
+                    # universe so we create a new asset and link it to the
+                    # proper universe.
+                    __.add_asset(
+                        asset,
+                        expiration,
+                        timestamp,
+                        universe,
+                        None,
+                        vids,
+                        labels,
+                    )
+                    .project('vertex', 'exists')
+                    .by(__.identity().elementMap())
+                    .by(__.constant(False)),
+                ),
+                # The asset does not exist in any universe.
+                __.add_asset(
+                    asset,
+                    expiration,
+                    timestamp,
+                    universe,
+                    None,
+                    vids,
+                    labels,
+                )
+                .project('vertex', 'exists')
+                .by(__.identity().elementMap())
+                .by(__.constant(False)),
+            )
+
+    def update_asset(self, vid, asset, expiration, timestamp):
+        """Updates an ``Asset`` vertex with the specified time attributes.
+
+        The time attributes are updated following these rules:
+
+        - If ``timestamp < first_seen``, then ``first_seen = timestamp``.
+        - If ``timestamp > last_seen``, then ``last_seen = timestamp`` and
+          ``expiration = expiration``.
+        - Otherwise, nothing is modified."""
+        return self \
+            .asset(vid) \
+            .is_asset_id(asset.asset_id) \
+            .choose(
+                __.values('first_seen').is_(P.gt(timestamp)),
+                __.property(Cardinality.single, 'first_seen', timestamp),
+                __.identity(),
+            ) \
+            .choose(
+                __.values('last_seen').is_(P.lt(timestamp)),
+                __.property(Cardinality.single, 'last_seen', timestamp)
+                  .property(Cardinality.single, 'expiration', expiration),
+                __.identity(),
+            ) \
+            .elementMap()
+
+    def set_asset(
+          self,
+          asset,
+          expiration,
+          timestamp,
+          universe,
+          vids=None,
+          key_fallback=True,
+          labels=None,
+    ):  # pylint: disable=too-many-arguments
+        """Updates an ``Asset`` vertex with the specified time attributes. If
+        the vertex does not exist or it's not associated with the given
+        universe, it is created. If ``vids`` is not ``None``, the asset is
+        looked up and created with its natural ID. See
+        ``InventoryTraversal.lookup_asset_id`` for the meaning of
+        ``key_fallback`` and ``InventoryTraversal.add_asset`` for the meaning
+        of ``labels``.
+
+        The time attributes are updated following these rules:
+
+        - If ``timestamp < first_seen``, then ``first_seen = timestamp``.
+        - If ``timestamp > last_seen``, then ``last_seen = timestamp`` and
+          ``expiration = expiration``.
+        - Otherwise, nothing is modified."""
+        return self \
+            .asset_id(asset.asset_id, universe, vids, key_fallback) \
+            .upsert_asset(
+                asset, expiration, timestamp, universe, None, vids, labels) \
+            .project('vertex', 'exists') \
+            .by(__.select('vertex').elementMap()) \
+            .by(__.select('exists'))
+
+    def set_assets(
+        self,
+        assets,
+        universe,
+        vids=None,
+        key_fallback=True,
+        labels=None,
+    ):  # pylint: disable=too-many-arguments
+        """Updates the ``Asset`` vertices with the specified time attributes in
+        a single traversal. ``assets`` is a list of ``BatchItem`` whose
+        elements are ``Asset`` and whose time attributes are all set. The
+        vertices that do not exist or are not associated with the given
+        universe are created. The traversal returns a list of maps with the
+        keys ``idx``, the index of the asset in ``assets``, ``vid`` and
+        ``exists``.
+
+        The time attributes are updated following the same rules as
+        ``set_asset``. If ``vids`` is not ``None``, the assets are looked up
+        and created with their natural IDs. See
+        ``InventoryTraversal.lookup_asset_id`` for the meaning of
+        ``key_fallback`` and ``InventoryTraversal.add_asset`` for the meaning
+        of ``labels``."""
+        if len(assets) == 0:
+            raise ValueError('empty list of assets')
+
+        ret = None
+        for idx, upsert in enumerate(assets):
+            asset, expiration, timestamp, first_seen = upsert
+            if ret is None:
+                ret = self.asset_id(
+                    asset.asset_id, universe, vids, key_fallback)
+            else:
+                ret = ret.lookup_asset_id(
+                    asset.asset_id, universe, vids, key_fallback)
+
+            # The results are stored in a side effect because the ``fold``
+            # step of ``upsert_asset`` discards the path of the traverser.
+            ret = ret \
+                .upsert_asset(
+                    asset,
+                    expiration,
+                    timestamp,
+                    universe,
+                    first_seen,
+                    vids,
+                    labels,
+                ) \
+                .project('idx', 'vid', 'exists') \
+                .by(__.constant(idx)) \
+                .by(__.select('vertex').id()) \
+                .by(__.select('exists')) \
+                .aggregate(Scope.local, 'assets')
+
+        return ret.cap('assets')
+
+    def set_asset_keys(self, assets, universe):
+        """Sets the composite key property of the ``Asset`` vertices in
+        ``assets``, a list of ``DbAsset``, that do not have it yet. It returns
+        the number of updated vertices."""
+        if len(assets) == 0:
+            raise ValueError('empty list of assets')
+
+        updates = [
+            __.V(asset.vid)
+            .is_asset_id(asset.asset_id)
+            .not_(__.has('asset_key'))
+            .property(
+                Cardinality.single,
+                'asset_key',
+                asset.asset_id.key(universe),
+            )
+            for asset in assets
+        ]
+        return self \
+            .inject(0) \
+            .union(*updates) \
+            .count()
+
+    def drop_asset(self, vid):
+        """Deletes the ``Asset`` vertex with id ``vid``."""
+        return self \
+            .asset(vid) \
+            .sideEffect(__.drop()) \
+            .count()
+
+    # Universe
+
+    def ensure_universe(self, universe):
+        """Creates a new  asset inventory ``Universe`` vertex, if it doesn't
+        exist, and returns its id."""
+        return self \
+            .V() \
+            .is_universe_obj(universe) \
+            .fold() \
+            .coalesce(
+                # The universe vertex already exists.
+                __.unfold()
+                .elementMap(),
+                # The universe vertex does not exist.
+                __.addV("Universe")
+                .property(T.id, str(uuid.uuid4()))
+                .property(
+                    Cardinality.single,
+                    'namespace',
+                    universe.namespace
+                )
+                .property(
+                    Cardinality.single,
+                    'version',
+                    universe.version.int_version
+                )
+                .elementMap(),
+            )
+
+    def universe_of(self, universe):
+        """Returns the vertices linked to the ``DbUniverse`` ``universe``. The
+        traversal starts at the ``Universe`` vertex, so listing the elements
+        of a universe does not require checking the universe of every vertex
+        in the graph."""
+        return self \
+            .V(universe.vid) \
+            .outE() \
+            .is_universe_of() \
+            .inV()
+
+    def linked_universe(self, vid):
+        """Returns a ``Universe`` vertex associated with the vertex identified
+        by the vertex id ``vid``."""
+        ret = self \
+            .V(vid) \
+            .linked_universe()
+        return ret
+
+    def universe(self, universe):
+        """Returns the ``Universe`` vertex that corresponds to specified
+        universe."""
+        return self\
+            .V() \
+            .is_universe_obj(universe)
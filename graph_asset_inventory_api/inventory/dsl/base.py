@@ -0,0 +1,79 @@
+"""Base Gremlin traversal source of the Asset Inventory DSL."""
+
+from gremlin_python.process.graph_traversal import GraphTraversalSource
+from gremlin_python.process.traversal import Scope
+
+from graph_asset_inventory_api.inventory.dsl.traversal import (
+    InventoryTraversal,
+    __,
+)
+
+
+class BaseTraversalSource(GraphTraversalSource):
+    """Graph Traversal Source with the steps shared by the traversal sources
+    of the Asset Inventory."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.graph_traversal = InventoryTraversal
+
+    def team(self, vid):
+        """Returns a ``Team`` vertex with a given vertex id ``vid``."""
+        return self.V(vid).is_team()
+
+    def asset(self, vid):
+        """Returns an ``Asset`` vertex with a given vertex id ``vid``."""
+        return self.V(vid).is_asset()
+
+    def asset_edges(
+        self,
+        vid,
+        edges,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns a map with the keys ``assets``, containing the number of
+        Asset vertices with id ``vid``, and ``edges``, containing the element
+        maps of the edges traversed by the anonymous traversal ``edges`` from
+        them, or their projection to ``fields`` if it is not ``None``. This
+        way, the existence of the asset and its edges are retrieved in a
+        single query. The edges are paginated as described in ``paginate``."""
+        edges = edges.paginate(page_idx, page_size, after)
+
+        return self \
+            .asset(vid) \
+            .fold() \
+            .project('assets', 'edges') \
+            .by(__.count(Scope.local)) \
+            .by(__.unfold().flatMap(edges).project_fields(fields).fold())
+
+    def drop_asset_edges(self, vid, edges):
+        """Deletes the edges traversed by the anonymous traversal ``edges``
+        from the Asset vertex with id ``vid``. It returns a map with the keys
+        ``assets``, containing the number of Asset vertices with id ``vid``,
+        and ``edges``, containing the number of deleted edges. This way, the
+        edges are looked up and deleted by the server in a single query."""
+        return self \
+            .asset(vid) \
+            .fold() \
+            .project('assets', 'edges') \
+            .by(__.count(Scope.local)) \
+            .by(__.unfold().flatMap(edges).sideEffect(__.drop()).count())
+
+    def fetch_edges(self, vids, edges):
+        """Starts a traversal that fetches the edges in ``edges``, a list of
+        tuples of the form ``(label, out_vid, in_vid)``, by their natural IDs
+        and stores the existing ones in the side effect ``edges``, so they can
+        be found by ``InventoryTraversal.lookup_edge`` without scanning the
+        edges of their vertices. If ``vids`` is ``None``, no edge is fetched.
+        In both cases, the traversal has a single traverser."""
+        if vids is None:
+            return self.inject(0)
+
+        eids = sorted({vids.edge(*edge) for edge in edges})
+        return self \
+            .E(*eids) \
+            .fold() \
+            .sideEffect(__.unfold().aggregate(Scope.local, 'edges'))
@@ -0,0 +1,316 @@
+"""Gremlin DSL for the lineage and the neighborhood of the assets."""
+
+from gremlin_python.process.traversal import P, Scope
+
+from graph_asset_inventory_api.inventory.dsl.base import BaseTraversalSource
+from graph_asset_inventory_api.inventory.dsl.traversal import __
+
+
+_LINEAGE_KEY = 'lineage'
+"""Key of the side effect that stores the edges traversed by ``_lineage``."""
+
+
+def _lineage(edges, next_vertex, max_depth, valid_at):
+    """Returns the anonymous traversal that walks the ``parent_of`` edges of
+    an asset in one direction: ``edges``, ``__.inE`` or ``__.outE``, returns
+    the edges of a vertex and ``next_vertex``, ``__.outV`` or ``__.inV``, the
+    vertex at their other end. It emits every edge traversed, up to
+    ``max_depth`` levels if it is not ``None``. If ``valid_at`` is not
+    ``None``, only the edges valid at that time are traversed.
+
+    If ``max_depth`` is ``None``, the traversed edges are stored, so every
+    edge is traversed once. This way, the cycles do not loop forever and the
+    edges reached by several paths are returned once. Otherwise, an edge
+    reached at the last level by a long path must still be followed when it
+    is reached by a shorter one, so the edges are not stored. Instead, the
+    paths that go back to a vertex are discarded and the edges are
+    deduplicated at the end. The number of paths is bounded by
+    ``max_depth``."""
+    def step():
+        ret = edges().is_parent_of()
+        if valid_at is not None:
+            ret = ret.is_valid_at(valid_at)
+        return ret
+
+    if max_depth is None:
+        return __ \
+            .flatMap(step()) \
+            .aggregate(Scope.local, _LINEAGE_KEY) \
+            .emit() \
+            .repeat(
+                next_vertex()
+                .flatMap(step())
+                .where(P.without(_LINEAGE_KEY))
+                .aggregate(Scope.local, _LINEAGE_KEY)
+            ) \
+            .dedup()
+
+    return __ \
+        .flatMap(step()) \
+        .emit() \
+        .until(__.loops().is_(P.gte(max_depth - 1))) \
+        .repeat(next_vertex().simplePath().flatMap(step())) \
+        .dedup()
+
+
+_SUBGRAPH_KEY = 'subgraph'
+"""Key of the side effect that stores the vertices of a subgraph."""
+
+_SUBGRAPH_EDGES = ('parent_of', 'owns')
+"""Labels of the edges of a subgraph."""
+
+
+def _neighborhood(depth):
+    """Returns the anonymous traversal that emits an Asset vertex and the
+    assets and teams up to ``depth`` ``parent_of`` or ``owns`` edges away
+    from it, in any direction. Like in ``_lineage`` with a maximum depth, a
+    vertex reached at the last level by a long path must still be followed
+    when it is reached by a shorter one, so the paths that go back to a
+    vertex are discarded and the vertices are deduplicated at the end."""
+    return __ \
+        .emit() \
+        .repeat(__.both(*_SUBGRAPH_EDGES).simplePath()) \
+        .times(depth) \
+        .dedup()
+
+
+class LineageTraversalSource(BaseTraversalSource):
+    """Graph Traversal Source for the ``parent_of`` edges of the Asset
+    Inventory."""
+
+    def subgraph(self, vid, depth, max_nodes):
+        """Returns a map with the keys ``assets``, containing the number of
+        Asset vertices with id ``vid``, ``nodes``, containing the number of
+        vertices up to ``depth`` ``parent_of`` or ``owns`` edges away from
+        them, including themselves, which is capped to ``max_nodes + 1``,
+        ``vertices``, containing the element maps of up to ``max_nodes`` of
+        those vertices, and ``edges``, containing the element maps of the
+        ``parent_of`` and ``owns`` edges between them. This way, the
+        neighborhood of an asset is retrieved in a single query and a vertex
+        with many edges cannot make it arbitrarily large."""
+        def nodes():
+            return __.select('vertices').unfold().limit(max_nodes)
+
+        return self \
+            .asset(vid) \
+            .fold() \
+            .project('assets', 'vertices') \
+            .by(__.count(Scope.local)) \
+            .by(
+                __.unfold()
+                .flatMap(_neighborhood(depth))
+                .limit(max_nodes + 1)
+                .fold()
+            ) \
+            .project('assets', 'nodes', 'vertices', 'edges') \
+            .by(__.select('assets')) \
+            .by(__.select('vertices').count(Scope.local)) \
+            .by(nodes().elementMap().fold()) \
+            .by(
+                nodes()
+                .aggregate(_SUBGRAPH_KEY)
+                .bothE(*_SUBGRAPH_EDGES)
+                .dedup()
+                .and_(
+                    __.outV().where(P.within(_SUBGRAPH_KEY)),
+                    __.inV().where(P.within(_SUBGRAPH_KEY)),
+                )
+                .elementMap()
+                .fold()
+            )
+
+    def parent_of(self, eid):
+        """Returns a ``parent_of`` edge with a given edge id ``eid``."""
+        return self.E(eid).is_parent_of()
+
+    def parents(
+        self,
+        asset_vid,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the ingoing ``parent_of`` edges of the Asset vertex with ID
+        ``vid``. See ``asset_edges`` for the format of the result."""
+        return self.asset_edges(
+            asset_vid,
+            __.inE().is_parent_of(),
+            page_idx,
+            page_size,
+            after,
+            fields,
+        )
+
+    def set_parent_of(self, parentof, expiration, timestamp, vids=None):
+        """Updates a ``parent_of`` edge with the specified time attributes. If
+        the edge does not exist, it is created. If ``vids`` is not ``None``,
+        the edge is looked up and created with its natural ID.
+
+        The time attributes are updated following these rules:
+
+        - If ``timestamp < first_seen``, then ``first_seen = timestamp``.
+        - If ``timestamp > last_seen``, then ``last_seen = timestamp`` and
+          ``expiration = expiration``.
+        - Otherwise, nothing is modified.
+
+        If both assets exist, the traversal returns a map with the keys
+        ``edge`` and ``exists``. Otherwise, it returns a map with the key
+        ``missing`` containing the list of vertex ids of the assets that do
+        not exist."""
+        return self \
+            .fetch_edges(vids, [
+                ('parent_of', parentof.parent_vid, parentof.child_vid),
+            ]) \
+            .coalesce(
+                # Both assets exist.
+                __.V(parentof.parent_vid)
+                .is_asset()
+                .as_('parent_v')
+                .V(parentof.child_vid)
+                .is_asset()
+                .upsert_parent_of(parentof, expiration, timestamp, None, vids)
+                .project('edge', 'exists')
+                .by(__.select('edge').elementMap())
+                .by(__.select('exists')),
+                # Any of the assets does not exist.
+                __.project('missing')
+                .by(__.missing_assets(
+                    parentof.parent_vid,
+                    parentof.child_vid,
+                )),
+            )
+
+    def set_parent_ofs(self, parentofs, vids=None):
+        """Updates several ``parent_of`` edges with the specified time
+        attributes in a single traversal. ``parentofs`` is a list of
+        ``BatchItem`` whose elements are ``ParentOf`` and whose time
+        attributes are all set. The edges that do not exist are created. The
+        traversal returns a list of maps with the key ``idx``, the index of
+        the edge in ``parentofs``. If both assets exist, the map contains the
+        keys ``eid`` and ``exists``. Otherwise, it contains the key
+        ``missing`` with the list of vertex ids of the assets that do not
+        exist.
+
+        The time attributes are updated following the same rules as
+        ``set_parent_of``. If ``vids`` is not ``None``, the edges are looked up
+        and created with their natural IDs. All of them are fetched at the
+        start of the traversal."""
+        if len(parentofs) == 0:
+            raise ValueError('empty list of parent_of relationships')
+
+        ret = self.fetch_edges(vids, [
+            ('parent_of', parentof.parent_vid, parentof.child_vid)
+            for parentof, _, _, _ in parentofs
+        ])
+        for idx, upsert in enumerate(parentofs):
+            parentof, expiration, timestamp, first_seen = upsert
+            # ``limit`` ensures that a duplicated edge does not multiply the
+            # traversers that run the following upserts.
+            ret = ret \
+                .coalesce(
+                    # Both assets exist.
+                    __.V(parentof.parent_vid)
+                    .is_asset()
+                    .as_('parent_v')
+                    .V(parentof.child_vid)
+                    .is_asset()
+                    .upsert_parent_of(
+                        parentof, expiration, timestamp, first_seen, vids)
+                    .project('idx', 'eid', 'exists')
+                    .by(__.constant(idx))
+                    .by(__.select('edge').id())
+                    .by(__.select('exists')),
+                    # Any of the assets does not exist.
+                    __.project('idx', 'missing')
+                    .by(__.constant(idx))
+                    .by(__.missing_assets(
+                        parentof.parent_vid,
+                        parentof.child_vid,
+                    )),
+                ) \
+                .aggregate(Scope.local, 'parent_ofs') \
+                .limit(1)
+
+        return ret.cap('parent_ofs')
+
+    def drop_parent_of(self, eid):
+        """Deletes the ``parent_of`` edge with id ``eid``."""
+        return self \
+            .parent_of(eid) \
+            .sideEffect(__.drop()) \
+            .count()
+
+    def drop_parent_of_between(self, parent_vid, child_vid):
+        """Deletes the ``parent_of`` edge that goes from the Asset vertex with
+        id ``parent_vid`` to the Asset vertex with id ``child_vid``. See
+        ``drop_asset_edges`` for the format of the result."""
+        return self.drop_asset_edges(
+            child_vid,
+            __.inE().is_parent_of().where(__.outV().hasId(parent_vid)),
+        )
+
+    def children(
+        self,
+        asset_vid,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the outgoing ``parent_of`` edges of the Asset vertex with ID
+        ``vid``. See ``asset_edges`` for the format of the result."""
+        return self.asset_edges(
+            asset_vid,
+            __.outE().is_parent_of(),
+            page_idx,
+            page_size,
+            after,
+            fields,
+        )
+
+    def ancestors(
+        self,
+        asset_vid,
+        max_depth=None,
+        valid_at=None,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the ``parent_of`` edges between the Asset vertex with ID
+        ``vid`` and its ancestors, up to ``max_depth`` levels. See
+        ``_lineage`` for the meaning of the parameters and ``asset_edges`` for
+        the format of the result."""
+        return self.asset_edges(
+            asset_vid,
+            _lineage(__.inE, __.outV, max_depth, valid_at),
+            page_idx,
+            page_size,
+            after,
+            fields,
+        )
+
+    def descendants(
+        self,
+        asset_vid,
+        max_depth=None,
+        valid_at=None,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the ``parent_of`` edges between the Asset vertex with ID
+        ``vid`` and its descendants, up to ``max_depth`` levels. See
+        ``_lineage`` for the meaning of the parameters and ``asset_edges`` for
+        the format of the result."""
+        return self.asset_edges(
+            asset_vid,
+            _lineage(__.outE, __.inV, max_depth, valid_at),
+            page_idx,
+            page_size,
+            after,
+            fields,
+        )
@@ -0,0 +1,110 @@
+"""Gremlin DSL for the migrations of the Asset Inventory."""
+
+from gremlin_python.process.traversal import T, Cardinality
+
+from graph_asset_inventory_api.inventory.dsl.base import BaseTraversalSource
+from graph_asset_inventory_api.inventory.dsl.traversal import __
+
+
+def _unchanged_vertex(properties, edges):
+    """Returns the anonymous traversal that, given a list with a vertex, keeps
+    it if it still has the properties in the dict ``properties`` and the edges
+    in ``edges``, as described in ``InventoryTraversal.replace_vertex``. The
+    number of edges and the properties of every edge must match, so the
+    properties of the edges updated concurrently are not lost either."""
+    old = __.unfold()
+    for key, value in properties.items():
+        old = old.has(key, value)
+    old = old.where(__.bothE().dedup().count().is_(len(edges)))
+
+    for _, _, _, old_eid, _, edge_properties in edges:
+        edge = __.bothE().hasId(old_eid)
+        for key, value in edge_properties.items():
+            edge = edge.has(key, value)
+        old = old.where(edge)
+
+    return old
+
+
+class MigrationsTraversalSource(BaseTraversalSource):
+    """Graph Traversal Source for the migrations of the Asset Inventory."""
+
+    def replace_vertex(
+        self,
+        vid,
+        new_vid,
+        label,
+        properties,
+        edges,
+    ):  # pylint: disable=too-many-arguments
+        """Replaces the vertex with id ``vid`` by a new vertex with id
+        ``new_vid``, label ``label`` and the properties in the dict
+        ``properties``. ``edges`` is the list of edges of the old vertex, as
+        tuples of the form ``(out, label, other_vid, old_eid, eid,
+        properties)``, where ``out`` indicates if the edge starts at the
+        vertex and ``old_eid`` is the id of the edge in the old vertex. The
+        edges are recreated in the new vertex with id ``eid`` or, if it is
+        ``None``, an id assigned by the graph. The old vertex is only replaced
+        if it still matches ``properties`` and ``edges``, as checked by
+        ``_unchanged_vertex``, so the changes made since they were read are not
+        lost. The traversal returns the id of the new vertex or nothing if the
+        old vertex was not replaced."""
+        ret = self \
+            .V(vid) \
+            .fold() \
+            .filter(_unchanged_vertex(properties, edges)) \
+            .sideEffect(__.unfold().drop()) \
+            .addV(label) \
+            .property(T.id, new_vid)
+        for key, value in properties.items():
+            ret = ret.property(Cardinality.single, key, value)
+        ret = ret.as_('vertex')
+
+        for out, edge_label, other_vid, _, eid, edge_properties in edges:
+            # Self-loops start and end at the new vertex.
+            other = __.V(other_vid)
+            if other_vid == vid:
+                other = __.select('vertex')
+
+            ret = ret.addE(edge_label)
+            ret = ret.to(other) if out else ret.from_(other)
+            if eid is not None:
+                ret = ret.property(T.id, eid)
+            for key, value in edge_properties.items():
+                ret = ret.property(key, value)
+            ret = ret.select('vertex')
+
+        return ret.id()
+
+    def replace_edge(
+        self,
+        eid,
+        new_eid,
+        label,
+        out_vid,
+        in_vid,
+        properties,
+    ):  # pylint: disable=too-many-arguments
+        """Replaces the edge with id ``eid`` by a new edge with id ``new_eid``,
+        label ``label`` and the properties in the dict ``properties``, that
+        goes from the vertex with id ``out_vid`` to the vertex with id
+        ``in_vid``. The old edge is only replaced if its properties still
+        match ``properties``. The traversal returns the id of the new edge or
+        nothing if the old edge was not replaced."""
+        old = __.unfold()
+        for key, value in properties.items():
+            old = old.has(key, value)
+
+        ret = self \
+            .E(eid) \
+            .fold() \
+            .filter(old) \
+            .sideEffect(__.unfold().drop()) \
+            .V(out_vid) \
+            .addE(label) \
+            .to(__.V(in_vid)) \
+            .property(T.id, new_eid)
+        for key, value in properties.items():
+            ret = ret.property(key, value)
+
+        return ret.id()
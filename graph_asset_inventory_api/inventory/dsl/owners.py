@@ -0,0 +1,134 @@
+"""Gremlin DSL for the ownership of the assets."""
+
+import uuid
+
+from gremlin_python.process.traversal import T, Scope
+
+from graph_asset_inventory_api.inventory.dsl.base import BaseTraversalSource
+from graph_asset_inventory_api.inventory.dsl.traversal import __
+
+
+class OwnersTraversalSource(BaseTraversalSource):
+    """Graph Traversal Source for the ``owns`` edges of the Asset
+    Inventory."""
+
+    def owns(self, eid):
+        """Returns an ``owns`` edge with a given edge id ``eid``."""
+        return self.E(eid).is_owns()
+
+    def owners(
+        self,
+        asset_vid,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns the ingoing ``owns`` edges of the Asset vertex with ID
+        ``vid``. See ``asset_edges`` for the format of the result."""
+        return self.asset_edges(
+            asset_vid,
+            __.inE().is_owns(),
+            page_idx,
+            page_size,
+            after,
+            fields,
+        )
+
+    def owned_assets(
+        self,
+        team_vid,
+        active_at=None,
+        page_idx=None,
+        page_size=100,
+        after=None,
+        fields=None,
+    ):  # pylint: disable=too-many-arguments
+        """Returns a map with the keys ``teams``, containing the number of
+        Team vertices with id ``team_vid``, and ``assets``, containing the
+        element maps of the Asset vertices they own, or their projection to
+        ``fields`` if it is not ``None``. The assets are reached walking the
+        outgoing ``owns`` edges of the team. If ``active_at`` is not ``None``,
+        only the ``owns`` edges active at that time are walked. The assets are
+        paginated as described in ``paginate``."""
+        owns = __.outE().is_owns()
+        if active_at is not None:
+            owns = owns.is_active_at(active_at)
+
+        assets = owns \
+            .inV() \
+            .is_asset() \
+            .dedup() \
+            .paginate(page_idx, page_size, after)
+
+        return self \
+            .team(team_vid) \
+            .fold() \
+            .project('teams', 'assets') \
+            .by(__.count(Scope.local)) \
+            .by(__.unfold().flatMap(assets).project_fields(fields).fold())
+
+    def set_owns(self, owns_, start_time, end_time=None, vids=None):
+        """Updates an ``owns`` edge with the specified time attributes. If
+        the edge does not exist, it is created. If ``vids`` is not ``None``,
+        the edge is looked up and created with its natural ID.
+
+        If the team and the asset exist, the traversal returns a map with the
+        keys ``edge`` and ``exists``. Otherwise, it returns a map with the key
+        ``missing`` containing the list of vertex ids of the team and the
+        asset that do not exist."""
+        eid = str(uuid.uuid4())
+        if vids is not None:
+            eid = vids.edge('owns', owns_.team_vid, owns_.asset_vid)
+        return self \
+            .fetch_edges(vids, [('owns', owns_.team_vid, owns_.asset_vid)]) \
+            .coalesce(
+                # The team and the asset exist.
+                __.V(owns_.team_vid)
+                .is_team()
+                .as_('team_v')
+                .V(owns_.asset_vid)
+                .is_asset()
+                .coalesce(
+                    # The edge exists.
+                    __.lookup_edge(
+                        'owns', owns_.team_vid, owns_.asset_vid, vids)
+                    .properties_owns(start_time, end_time)
+                    .project('edge', 'exists')
+                    .by(__.identity().elementMap())
+                    .by(__.constant(True)),
+                    # The edge does not exist.
+                    __.addE('owns').from_('team_v')
+                    .property(T.id, eid)
+                    .properties_owns(start_time, end_time)
+                    .remember_edge(vids)
+                    .project('edge', 'exists')
+                    .by(__.identity().elementMap())
+                    .by(__.constant(False)),
+                ),
+                # The team or the asset do not exist.
+                __.project('missing')
+                .by(
+                    __.union(
+                        __.missing_team(owns_.team_vid),
+                        __.missing_asset(owns_.asset_vid),
+                    )
+                    .fold()
+                ),
+            )
+
+    def drop_owns(self, eid):
+        """Deletes the ``owns`` edge with id ``eid``."""
+        return self \
+            .owns(eid) \
+            .sideEffect(__.drop()) \
+            .count()
+
+    def drop_owns_between(self, team_vid, asset_vid):
+        """Deletes the ``owns`` edge that goes from the Team vertex with id
+        ``team_vid`` to the Asset vertex with id ``asset_vid``. See
+        ``drop_asset_edges`` for the format of the result."""
+        return self.drop_asset_edges(
+            asset_vid,
+            __.inE().is_owns().where(__.outV().hasId(team_vid)),
+        )
@@ -0,0 +1,719 @@
+"""Gremlin traversals of the Asset Inventory DSL."""
+
+import copy
+import uuid
+
+from gremlin_python.process.traversal import P
+from gremlin_python.process.graph_traversal import (
+    GraphTraversal,
+    __ as AnonymousTraversal,
+)
+from gremlin_python.process.traversal import (
+    T,
+    Order,
+    Cardinality,
+    Bytecode,
+    Scope,
+)
+
+from graph_asset_inventory_api.inventory import DbUniverse
+from graph_asset_inventory_api.inventory.labels import ASSET_LABEL
+from graph_asset_inventory_api.inventory.fields import (
+    OUT_VERTEX_FIELDS,
+    IN_VERTEX_FIELDS,
+)
+
+
+class InventoryTraversal(GraphTraversal):
+    """Graph Traversal for the Asset Inventory."""
+
+    # Teams.
+
+    def is_team(self):
+        """Filters vertices of type ``Team``."""
+        return self.hasLabel('Team')
+
+    def is_team_identifier(self, identifier):
+        """Filters vertices of type ``Team`` with a specific ``identifier``."""
+        return self.is_team().has('identifier', identifier)
+
+    def lookup_team_identifier(self, identifier, universe, vids=None):
+        """Starts a new traversal that returns the ``Team`` vertex with a given
+        ``identifier`` associated with the given ``universe``. If ``vids`` is
+        ``None``, the vertex is looked up by its properties. Otherwise, it is
+        looked up by its natural ID and, if ``vids.fallback`` is ``True`` and
+        it is not found, by its properties."""
+        if vids is None:
+            return self \
+                .V() \
+                .is_team_identifier(identifier) \
+                .where(__.is_linked_to_universe(universe))
+
+        vid = vids.team(universe, identifier)
+        if not vids.fallback:
+            return self \
+                .V(vid) \
+                .is_team_identifier(identifier) \
+                .where(__.is_linked_to_universe(universe))
+
+        return self.coalesce(
+            __.lookup_team_identifier(identifier, universe, _strict(vids)),
+            __.lookup_team_identifier(identifier, universe),
+        )
+
+    def add_team(self, team, universe, vids=None):
+        """Creates a new Team vertex, links it to the current universe and
+        returns the newly created vertex. If ``vids`` is not ``None``, the
+        vertex gets the natural ID of the team. Otherwise, it gets a random
+        ID."""
+        vid = str(uuid.uuid4())
+        if vids is not None:
+            vid = vids.team(universe, team.identifier)
+        return self \
+            .addV('Team') \
+            .property(T.id, vid) \
+            .property(Cardinality.single, 'identifier', team.identifier) \
+            .property(Cardinality.single, 'name', team.name) \
+            .link_to_universe(universe)
+
+    # Assets.
+
+    def is_asset(self):
+        """Filters vertices of type ``Asset``."""
+        return self.hasLabel('Asset')
+
+    def is_valid_at(self, valid_at):
+        """Filters assets or ``parent_of`` edges that were first seen before
+        ``valid_at`` and expire after it."""
+        return self.and_(
+            __.has("first_seen", P.lte(valid_at)),
+            __.has("expiration", P.gte(valid_at))
+        )
+
+    def is_asset_id(self, asset_id):
+        """Filters vertices of type ``Asset`` with a specific ``type`` and
+        ``identifier``."""
+        return self \
+            .is_asset() \
+            .has('type', asset_id.type) \
+            .has('identifier', asset_id.identifier)
+
+    def is_asset_key(self, asset_id, universe):
+        """Filters vertices of type ``Asset`` with the composite key of
+        ``asset_id`` in ``universe``."""
+        return self \
+            .is_asset() \
+            .has('asset_key', asset_id.key(universe))
+
+    def lookup_asset_id(
+        self,
+        asset_id,
+        universe,
+        vids=None,
+        key_fallback=True,
+    ):
+        """Starts a new traversal that returns the ``Asset`` vertex with a
+        given ``type`` and ``identifier`` associated with the given
+        ``universe``. If ``vids`` is ``None``, the vertex is looked up by its
+        composite key and, if ``key_fallback`` is ``True`` and it is not
+        found, by its ``type`` and ``identifier``. Otherwise, it is looked up
+        by its natural ID and, if ``vids.fallback`` is ``True`` and it is not
+        found, by its properties."""
+        if vids is None and not key_fallback:
+            return self \
+                .V() \
+                .is_asset_key(asset_id, universe) \
+                .where(__.is_linked_to_universe(universe))
+
+        if vids is None:
+            return self.coalesce(
+                __.lookup_asset_id(asset_id, universe, None, False),
+                __.V()
+                .is_asset_id(asset_id)
+                .where(__.is_linked_to_universe(universe)),
+            )
+
+        vid = vids.asset(universe, asset_id)
+        if not vids.fallback:
+            return self \
+                .V(vid) \
+                .is_asset_id(asset_id) \
+                .where(__.is_linked_to_universe(universe))
+
+        return self.coalesce(
+            __.lookup_asset_id(asset_id, universe, _strict(vids)),
+            __.lookup_asset_id(asset_id, universe, None, key_fallback),
+        )
+
+    def add_asset(
+          self,
+          asset,
+          expiration,
+          timestamp,
+          universe,
+          first_seen=None,
+          vids=None,
+          labels=None,
+    ):  # pylint: disable=too-many-arguments
+        """Creates a new Asset vertex, links it to the given ``universe`` and
+        returns the newly created vertex. If ``first_seen`` is ``None``,
+        ``timestamp`` is used. If ``vids`` is not ``None``, the vertex gets the
+        natural ID of the asset. Otherwise, it gets a random ID. If ``labels``
+        is not ``None``, the vertex also gets the label of the type of the
+        asset."""
+        if first_seen is None:
+            first_seen = timestamp
+        vid = str(uuid.uuid4())
+        if vids is not None:
+            vid = vids.asset(universe, asset.asset_id)
+        label = ASSET_LABEL
+        if labels is not None:
+            label = labels.vertex_label(asset.asset_id.type)
+        return self \
+            .addV(label) \
+            .property(T.id, vid) \
+            .property(Cardinality.single, 'type', asset.asset_id.type) \
+            .property(
+                Cardinality.single,
+                'identifier',
+                asset.asset_id.identifier,
+            ) \
+            .property(
+                Cardinality.single,
+                'asset_key',
+                asset.asset_id.key(universe),
+            ) \
+            .property(Cardinality.single, 'first_seen', first_seen) \
+            .property(Cardinality.single, 'last_seen', timestamp) \
+            .property(Cardinality.single, 'expiration', expiration) \
+            .link_to_universe(universe)
+
+    def upsert_asset(
+          self,
+          asset,
+          expiration,
+          timestamp,
+          universe,
+          first_seen=None,
+          vids=None,
+          labels=None,
+    ):  # pylint: disable=too-many-arguments
+        """Updates the Asset vertices in the traversal with the specified time
+        attributes. If the traversal is empty, a new Asset vertex is created
+        and linked to the given ``universe``. It returns a map with the keys
+        ``vertex``, containing the vertex, and ``exists``, that indicates if
+        the vertex already existed. If ``first_seen`` is ``None``,
+        ``timestamp`` is used. See ``add_asset`` for the meaning of
+        ``vids`` and ``labels``.
+
+        The time attributes are updated following these rules:
+
+        - If the ``first_seen`` argument is before the ``first_seen``
+          property, then the property is set to the argument.
+        - If ``timestamp > last_seen``, then ``last_seen = timestamp`` and
+          ``expiration = expiration``.
+        - Otherwise, nothing is modified."""
+        if first_seen is None:
+            first_seen = timestamp
+        return self \
+            .fold() \
+            .coalesce(
+                # The asset exists.
+                __.unfold()
+                .choose(
+                    __.values('first_seen').is_(P.gt(first_seen)),
+                    __.property(Cardinality.single, 'first_seen', first_seen),
+                    __.identity(),
+                )
+                .choose(
+                    __.values('last_seen').is_(P.lt(timestamp)),
+                    __.property(Cardinality.single, 'last_seen', timestamp)
+                      .property(Cardinality.single, 'expiration', expiration),
+                    __.identity(),
+                )
+                .project('vertex', 'exists')
+                .by(__.identity())
+                .by(__.constant(True)),
+                # The asset does not exist.
+                __.add_asset(
+                    asset,
+                    expiration,
+                    timestamp,
+                    universe,
+                    first_seen,
+                    vids,
+                    labels,
+                )
+                .project('vertex', 'exists')
+                .by(__.identity())
+                .by(__.constant(False)),
+            )
+
+    # Edges.
+
+    def lookup_edge(self, label, out_vid, in_vid, vids=None):
+        """Returns the ``label`` edges that go from the vertex with id
+        ``out_vid`` to the vertex in the traversal, whose id is ``in_vid``. If
+        ``vids`` is ``None``, the ingoing edges of the vertex are scanned.
+        Otherwise, the edge is looked up by its natural ID in the side effect
+        ``edges``, filled by ``InventoryTraversalSource.fetch_edges`` and
+        ``remember_edge``, and, if ``vids.fallback`` is ``True`` and it is not
+        found, the ingoing edges of the vertex are scanned."""
+        if vids is None:
+            return self.inE(label).filter(__.outV().id().is_(out_vid))
+
+        eid = vids.edge(label, out_vid, in_vid)
+        if not vids.fallback:
+            return self.select('edges').unfold().hasId(eid)
+
+        return self.coalesce(
+            __.lookup_edge(label, out_vid, in_vid, _strict(vids)),
+            __.lookup_edge(label, out_vid, in_vid),
+        )
+
+    def remember_edge(self, vids=None):
+        """Adds the edges in the traversal to the side effect ``edges``, so
+        the following upserts of the same traversal find them with
+        ``lookup_edge``. If ``vids`` is ``None``, the edges are looked up by
+        scanning and nothing is done."""
+        if vids is None:
+            return self
+        return self.aggregate(Scope.local, 'edges')
+
+    # Parents.
+
+    def is_parent_of(self):
+        """Filters edges of type ``parent_of``."""
+        return self.hasLabel('parent_of')
+
+    def upsert_parent_of(
+          self,
+          parentof,
+          expiration,
+          timestamp,
+          first_seen=None,
+          vids=None,
+    ):
+        """Updates the ``parent_of`` edge that goes from the vertex labeled as
+        ``parent_v`` to the child Asset vertices in the traversal with the
+        specified time attributes. If the edge does not exist, it is created.
+        It returns a map with the keys ``edge``, containing the edge, and
+        ``exists``, that indicates if the edge already existed. If
+        ``first_seen`` is ``None``, ``timestamp`` is used. If ``vids`` is not
+        ``None``, the edge is looked up and created with its natural ID, as
+        described in ``lookup_edge``.
+
+        The time attributes are updated following these rules:
+
+        - If the ``first_seen`` argument is before the ``first_seen``
+          property, then the property is set to the argument.
+        - If ``timestamp > last_seen``, then ``last_seen = timestamp`` and
+          ``expiration = expiration``.
+        - Otherwise, nothing is modified."""
+        if first_seen is None:
+            first_seen = timestamp
+        eid = str(uuid.uuid4())
+        if vids is not None:
+            eid = vids.edge(
+                'parent_of', parentof.parent_vid, parentof.child_vid)
+        return self \
+            .coalesce(
+                # The edge exists.
+                __.lookup_edge(
+                    'parent_of',
+                    parentof.parent_vid,
+                    parentof.child_vid,
+                    vids,
+                )
+                .choose(
+                    __.values('first_seen').is_(P.gt(first_seen)),
+                    __.property('first_seen', first_seen),
+                    __.identity(),
+                )
+                .choose(
+                    __.values('last_seen').is_(P.lt(timestamp)),
+                    __.property('last_seen', timestamp)
+                      .property('expiration', expiration),
+                    __.identity(),
+                )
+                .project('edge', 'exists')
+                .by(__.identity())
+                .by(__.constant(True)),
+                # The edge does not exist.
+                __.addE('parent_of').from_('parent_v')
+                .property(T.id, eid)
+                .property('first_seen', first_seen)
+                .property('last_seen', timestamp)
+                .property('expiration', expiration)
+                .remember_edge(vids)
+                .project('edge', 'exists')
+                .by(__.identity())
+                .by(__.constant(False)),
+            )
+
+    def missing_asset(self, vid):
+        """Returns ``vid`` if it does not correspond to an Asset vertex.
+        Otherwise, it returns nothing."""
+        return self.V(vid).is_asset().count().is_(0).constant(vid)
+
+    def missing_assets(self, *vids):
+        """Returns a list with the vertex ids in ``vids`` that do not
+        correspond to an Asset vertex."""
+        return self \
+            .union(*[__.missing_asset(vid) for vid in vids]) \
+            .fold()
+
+    # Owners.
+
+    def missing_team(self, vid):
+        """Returns ``vid`` if it does not correspond to a Team vertex.
+        Otherwise, it returns nothing."""
+        return self.V(vid).is_team().count().is_(0).constant(vid)
+
+    def is_owns(self):
+        """Filters edges of type ``owns``."""
+        return self.hasLabel('owns')
+
+    def is_active_at(self, active_at):
+        """Filters ``owns`` edges that started before ``active_at`` and did
+        not end before it. The edges without ``end_time`` have not ended."""
+        return self \
+            .has('start_time', P.lte(active_at)) \
+            .or_(
+                __.hasNot('end_time'),
+                __.has('end_time', P.gte(active_at)),
+            )
+
+    def properties_owns(self, start_time, end_time=None):
+        """Sets the properties for edges of type ``owns``. If ``end_time`` is
+        ``None``, the property is not set."""
+        ret = self.property('start_time', start_time)
+
+        if end_time is None:
+            ret = ret.sideEffect(__.properties('end_time').drop())
+        else:
+            ret = ret.property('end_time', end_time)
+
+        return ret
+
+    # Universe.
+
+    def link_to_universe(self, universe):
+        """Creates an edge from the vertices in the transversal to the current
+        universe vertex."""
+        return self \
+            .sideEffect(
+              __.addE("universe_of")
+              .from_(__.universe_vertex(universe))
+            )
+
+    def universe_vertex(self, universe):
+        """Returns the ``Universe`` vertex that corresponds to ``universe``. If
+        ``universe`` is a ``DbUniverse``, the vertex is retrieved by its id
+        instead of matching its properties."""
+        if isinstance(universe, DbUniverse):
+            return self.V(universe.vid)
+        return self.V().is_universe_obj(universe)
+
+    def is_universe(self):
+        """Filters the vertices that are Universes."""
+        return self \
+            .hasLabel('Universe')
+
+    def is_universe_obj(self, universe):
+        """Filters the Asset Inventory Universe with a given version and
+        namespace."""
+        return self \
+            .is_universe() \
+            .has('namespace', universe.namespace) \
+            .has('version', universe.version.int_version)
+
+    def linked_universe(self):
+        """Returns the ``Universe`` associated with a vertex."""
+        return self \
+            .inE() \
+            .is_universe_of() \
+            .outV()
+
+    def is_linked_to_universe(self, universe):
+        """Returns the ``Universe`` vertex associated with a vertex only if it
+        matches the specified universe. If ``universe`` is a ``DbUniverse``,
+        the vertex is matched by its id instead of by its properties."""
+        if isinstance(universe, DbUniverse):
+            return self \
+                .linked_universe() \
+                .hasId(universe.vid)
+        return self \
+            .linked_universe() \
+            .is_universe_obj(universe)
+
+    def is_universe_of(self):
+        """Filters edges of type ``universe_of``."""
+        return self.hasLabel('universe_of')
+
+    # Pagination.
+
+    def paginate(self, page_idx=None, page_size=100, after=None):
+        """Returns a page of size ``page_size`` of the elements in the
+        traversal, ordered by id. If ``after`` is not None, the page contains
+        the elements with an id greater than ``after``, so the backend does not
+        need to skip the elements of the previous pages. Otherwise, if
+        ``page_idx`` is not None, it returns the page with index ``page_idx``.
+        If both are None, all the elements are returned."""
+        if after is not None:
+            return self \
+                .has(T.id, P.gt(after)) \
+                .order() \
+                .by(T.id, Order.asc) \
+                .limit(page_size)
+
+        if page_idx is not None:
+            offset = page_idx * page_size
+            return self \
+                .order() \
+                .by(T.id, Order.asc) \
+                .range(offset, offset + page_size)
+
+        return self
+
+    # Fields.
+
+    def project_fields(self, fields):
+        """Projects the elements in the traversal into maps with only the keys
+        in ``fields``, one of the tuples of fields of the ``fields`` module.
+        The properties are projected as lists, which are empty if the element
+        does not have the property. If ``fields`` is ``None``, the elements
+        are projected with ``elementMap``."""
+        if fields is None:
+            return self.elementMap()
+
+        ret = self.project(*fields)
+        for field in fields:
+            ret = ret.by(_field(field))
+        return ret
+
+
+def _field(field):
+    """Returns the anonymous traversal that projects ``field`` of an
+    element."""
+    if field == 'id':
+        return __.id()
+    if field in OUT_VERTEX_FIELDS:
+        return __.outV().id()
+    if field in IN_VERTEX_FIELDS:
+        return __.inV().id()
+    return __.values(field).fold()
+
+
+def _strict(vids):
+    """Returns a copy of ``vids`` with ``fallback`` disabled, so the vertices
+    and edges are looked up only by their natural IDs. ``vids`` is not
+    modified."""
+    strict = copy.copy(vids)
+    strict.fallback = False
+    return strict
+
+
+class __(AnonymousTraversal):
+    """Anonymous Traversal for the Asset Inventory."""
+
+    graph_traversal = InventoryTraversal
+
+    # Teams.
+
+    @classmethod
+    def is_team(cls, *args):
+        """Filters vertices of type ``Team``."""
+        return cls.graph_traversal(None, None, Bytecode()).is_team(*args)
+
+    @classmethod
+    def is_team_identifier(cls, *args):
+        """Filters vertices of type ``Team`` with a specific ``identifier``."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).is_team_identifier(*args)
+
+    @classmethod
+    def lookup_team_identifier(cls, *args):
+        """Starts a new traversal that returns the ``Team`` vertex with a given
+        ``identifier`` associated with the given ``universe``."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).lookup_team_identifier(*args)
+
+    @classmethod
+    def add_team(cls, *args):
+        """Creates a new Team vertex, links it to the specified universe and
+        returns the newly created vertex."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).add_team(*args)
+
+    # Assets.
+
+    @classmethod
+    def is_asset(cls, *args):
+        """Filters vertices of type ``Asset``."""
+        return cls.graph_traversal(None, None, Bytecode()).is_asset(*args)
+
+    @classmethod
+    def is_valid_at(cls, *args):
+        """Filters assets or ``parent_of`` edges valid at a given time."""
+        return cls.graph_traversal(None, None, Bytecode()).is_valid_at(*args)
+
+    @classmethod
+    def is_asset_id(cls, *args):
+        """Filters vertices of type ``Asset`` with a specific ``type`` and
+        ``identifier``."""
+        return cls.graph_traversal(None, None, Bytecode()).is_asset_id(*args)
+
+    @classmethod
+    def is_asset_key(cls, *args):
+        """Filters vertices of type ``Asset`` with the composite key of
+        ``asset_id`` in ``universe``."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).is_asset_key(*args)
+
+    @classmethod
+    def lookup_asset_id(cls, *args):
+        """Starts a new traversal that returns the ``Asset`` vertex with a
+        given ``type`` and ``identifier`` associated with the given
+        ``universe``."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).lookup_asset_id(*args)
+
+    @classmethod
+    def add_asset(cls, *args):
+        """Creates a new Asset vertex, links it to the specified universe and
+        returns the newly created vertex."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).add_asset(*args)
+
+    @classmethod
+    def upsert_asset(cls, *args):
+        """Updates the Asset vertices in the traversal with the specified time
+        attributes. If the traversal is empty, a new Asset vertex is
+        created."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).upsert_asset(*args)
+
+    # Parents.
+
+    @classmethod
+    def lookup_edge(cls, *args):
+        """Returns the ``label`` edges that go from the vertex with id
+        ``out_vid`` to the vertex in the traversal."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).lookup_edge(*args)
+
+    @classmethod
+    def remember_edge(cls, *args):
+        """Adds the edges in the traversal to the side effect ``edges``."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).remember_edge(*args)
+
+    @classmethod
+    def is_parent_of(cls, *args):
+        """Filters edges of type ``parent_of``."""
+        return cls.graph_traversal(None, None, Bytecode()).is_parent_of(*args)
+
+    @classmethod
+    def upsert_parent_of(cls, *args):
+        """Updates the ``parent_of`` edge that goes from the vertex labeled as
+        ``parent_v`` to the child Asset vertices in the traversal. If the edge
+        does not exist, it is created."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).upsert_parent_of(*args)
+
+    @classmethod
+    def missing_asset(cls, *args):
+        """Returns ``vid`` if it does not correspond to an Asset vertex."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).missing_asset(*args)
+
+    @classmethod
+    def missing_assets(cls, *args):
+        """Returns a list with the vertex ids in ``vids`` that do not
+        correspond to an Asset vertex."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).missing_assets(*args)
+
+    # Owners.
+
+    @classmethod
+    def missing_team(cls, *args):
+        """Returns ``vid`` if it does not correspond to a Team vertex."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).missing_team(*args)
+
+    @classmethod
+    def is_owns(cls, *args):
+        """Filters edges of type ``owns``."""
+        return cls.graph_traversal(None, None, Bytecode()).is_owns(*args)
+
+    @classmethod
+    def is_active_at(cls, *args):
+        """Filters ``owns`` edges that started before ``active_at`` and did
+        not end before it."""
+        return cls.graph_traversal(None, None, Bytecode()).is_active_at(*args)
+
+    @classmethod
+    def properties_owns(cls, *args):
+        """Sets the properties for edges of type ``owns``. If ``end_time`` is
+        ``None``, the property is not set."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).properties_owns(*args)
+
+    # Universe.
+
+    @classmethod
+    def link_to_universe(cls, *args):
+        """Creates an edge from the vertices in the transversal to the current
+        universe vertex."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).link_to_universe(*args)
+
+    @classmethod
+    def universe_vertex(cls, *args):
+        """Returns the ``Universe`` vertex that corresponds to ``universe``."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).universe_vertex(*args)
+
+    @classmethod
+    def is_universe(cls, *args):
+        """Filters the vertices that are Asset Inventory Universes."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).is_universe(*args)
+
+    @classmethod
+    def is_universe_obj(cls, *args):
+        """Filters the Asset Inventory Universe with a given version and
+        namespace."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).is_universe(*args)
+
+    @classmethod
+    def is_linked_to_universe(cls, *args):
+        """Returns the ``Universe`` vertex associated with a vertex only if it
+        matches the specified universe."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).is_linked_to_universe(*args)
+
+    @classmethod
+    def is_universe_of(cls):
+        """Filters edges of type ``universe_of``."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).is_universe_of()
+
+    # Pagination.
+
+    @classmethod
+    def paginate(cls, *args):
+        """Returns a page of the elements in the traversal, ordered by id."""
+        return cls.graph_traversal(None, None, Bytecode()).paginate(*args)
+
+    # Fields.
+
+    @classmethod
+    def project_fields(cls, *args):
+        """Projects the elements in the traversal into maps with only the
+        requested fields."""
+        return cls.graph_traversal(
+            None, None, Bytecode()).project_fields(*args)
@@ -0,0 +1,73 @@
+"""This module provides the fields that can be requested when reading teams,
+assets and relationships.
+
+By default, the elements are read with ``elementMap`` and converted to
+``DbTeam``, ``DbAsset``, ``DbParentOf`` and ``DbOwns`` objects, which requires
+all their properties. When only some fields are requested, the traversal
+projects the elements into maps with only those fields, so the properties
+that are not needed are neither sent by the graph nor deserialized."""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+
+
+TEAM_FIELDS = ('id', 'identifier', 'name')
+"""Fields of a team."""
+
+ASSET_FIELDS = (
+    'id',
+    'type',
+    'identifier',
+    'first_seen',
+    'last_seen',
+    'expiration',
+)
+"""Fields of an asset."""
+
+PARENT_OF_FIELDS = (
+    'id',
+    'parent_id',
+    'child_id',
+    'first_seen',
+    'last_seen',
+    'expiration',
+)
+"""Fields of a ``parent_of`` relationship."""
+
+OWNS_FIELDS = ('id', 'team_id', 'asset_id', 'start_time', 'end_time')
+"""Fields of an ``owns`` relationship."""
+
+OUT_VERTEX_FIELDS = ('parent_id', 'team_id')
+"""Fields that contain the ID of the vertex an edge starts at."""
+
+IN_VERTEX_FIELDS = ('child_id', 'asset_id')
+"""Fields that contain the ID of the vertex an edge ends at."""
+
+
+def check_fields(fields, allowed):
+    """Returns the tuple of fields of ``fields`` in the order of ``allowed``,
+    the fields of the kind of element being read. The ``id`` field is always
+    included, so the elements can be identified and paginated. If any field is
+    not in ``allowed``, a ``ValueError`` exception is raised."""
+    unknown = sorted(set(fields) - set(allowed))
+    if len(unknown) > 0:
+        raise ValueError(f'unknown fields: {", ".join(unknown)}')
+
+    return tuple(f for f in allowed if f == 'id' or f in fields)
+
+
+def from_projection(projection):
+    """Returns the dict of fields of an element from ``projection``, the map
+    returned by the ``project_fields`` step. The properties are projected as
+    lists, so the missing ones are returned as ``None``. The dates are returned
+    in UTC, like in the ``Db*`` objects."""
+    values = {}
+    for field, value in projection.items():
+        if isinstance(value, list):
+            value = value[0] if len(value) > 0 else None
+        if isinstance(value, datetime):
+            value = value.replace(tzinfo=timezone.utc)
+        values[field] = value
+    return values
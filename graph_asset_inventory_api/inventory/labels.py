@@ -0,0 +1,93 @@
+"""This module provides the modes used to label the Asset vertices.
+
+By default, all the assets have the label ``Asset``, so listing the assets of
+a type scans the assets of every type and filters them by their ``type``
+property. Neptune supports vertices with several labels, which are specified
+joined by ``::``. With typed labels, every asset also gets a label derived
+from its type, so the assets of a type are listed with a scan of the label
+index that only touches the assets of that type. The multi-labeled vertices
+still match ``hasLabel('Asset')``, so the rest of the traversals are not
+affected. Other graphs, like TinkerGraph, store the joined labels as a single
+literal label, which does not match ``hasLabel('Asset')``, so the typed labels
+are rejected unless the graph supports multi-labels."""
+
+
+ASSET_LABEL_MODES = ('single', 'hybrid', 'typed')
+"""Supported asset label modes.
+
+- ``single``: assets only get the label ``Asset``.
+- ``hybrid``: assets also get the label of their type, but the assets of a
+  type are listed by their ``type`` property, so the assets labeled before
+  are still found. It must be used while migrating a graph.
+- ``typed``: assets also get the label of their type and the assets of a type
+  are listed by that label. It requires a graph with multi-label support,
+  like Neptune."""
+
+ASSET_LABEL = 'Asset'
+"""Label of all the Asset vertices."""
+
+MULTI_LABEL_SEPARATOR = '::'
+"""Separator of the labels of a multi-labeled vertex."""
+
+TYPE_LABEL_PREFIX = 'AssetType:'
+"""Prefix of the labels derived from asset types. It prevents the collision
+of the type labels with the labels of the other vertices."""
+
+
+class TypedAssetLabels:
+    """Derives the labels of the Asset vertices from their type. If ``scan``
+    is ``True``, the assets of a type must be listed with a scan of the label
+    of the type."""
+
+    def __init__(self, scan=True):
+        self.scan = scan
+
+    def __repr__(self):
+        return f'{{scan: {self.scan}}}'
+
+    @staticmethod
+    def type_label(asset_type):
+        """Returns the label of the assets with type ``asset_type`` or
+        ``None`` if the type cannot be stored as a label, because it contains
+        the multi-label separator."""
+        if MULTI_LABEL_SEPARATOR in asset_type:
+            return None
+        return TYPE_LABEL_PREFIX + asset_type
+
+    def vertex_label(self, asset_type):
+        """Returns the label, which may be a multi-label, of a new vertex of
+        an asset with type ``asset_type``."""
+        type_label = self.type_label(asset_type)
+        if type_label is None:
+            return ASSET_LABEL
+        return ASSET_LABEL + MULTI_LABEL_SEPARATOR + type_label
+
+
+def asset_labels(mode):
+    """Returns the ``TypedAssetLabels`` that correspond to the asset label
+    ``mode``, or ``None`` if the assets only get the label ``Asset``. If the
+    mode is not supported, a ``ValueError`` exception is raised."""
+    if mode not in ASSET_LABEL_MODES:
+        raise ValueError(f'unknown asset label mode: {mode}')
+
+    if mode == 'single':
+        return None
+    return TypedAssetLabels(scan=mode == 'typed')
+
+
+def check_asset_labels(mode, multi_labels):
+    """Raises a ``ValueError`` exception if the asset label ``mode`` is not
+    supported or if it labels the assets with their type and the graph does
+    not support multi-labels, as indicated by ``multi_labels``."""
+    if mode not in ASSET_LABEL_MODES:
+        raise ValueError(f'unknown asset label mode: {mode}')
+    if mode != 'single' and not multi_labels:
+        raise ValueError(
+            f'asset label mode {mode} requires multi-label support')
+
+
+def has_label(vertex_label, label):
+    """Returns ``True`` if ``vertex_label``, the label of a vertex as returned
+    by the graph, includes ``label``. Neptune returns the labels of a
+    multi-labeled vertex joined by the multi-label separator."""
+    return label in vertex_label.split(MULTI_LABEL_SEPARATOR)
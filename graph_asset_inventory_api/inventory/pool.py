@@ -0,0 +1,229 @@
+"""This module provides the class ``InventoryClientPool`` that allows to share
+a fixed set of ``InventoryClient`` across the threads of a process."""
+
+import queue
+import threading
+import time
+from collections import Counter, namedtuple
+
+from graph_asset_inventory_api.inventory import InventoryError
+from graph_asset_inventory_api.inventory.client import InventoryClient
+
+
+class PoolExhaustedError(InventoryError):
+    """It is returned when no ``InventoryClient`` could be acquired from the
+    pool before the timeout expired."""
+
+
+class PoolSettings(namedtuple(
+    'PoolSettings',
+    [
+        'gremlin_endpoint',
+        'auth_mode',
+        'size',
+        'health_check_interval',
+        'vid_scheme',
+        'asset_keys',
+        'label_mode',
+    ],
+    defaults=['none', 4, 30, 'random', 'hybrid', 'single'],
+)):
+    """Represents the configuration of an ``InventoryClientPool``. All the
+    clients of the pool are created with the same ``gremlin_endpoint``,
+    ``auth_mode``, ``vid_scheme``, ``asset_keys`` and ``label_mode``."""
+
+    __slots__ = ()
+
+
+class _PoolEntry:
+    """Represents an ``InventoryClient`` managed by the pool."""
+
+    def __init__(self, cli):
+        self.cli = cli
+        self.last_checked = time.monotonic()
+        self.suspect = False
+
+
+class InventoryClientPool:
+    """Pool of ``InventoryClient`` that can be shared safely by the threads of
+    a process. Every client keeps its own graph connection, so acquiring a
+    client from the pool avoids the cost of the connection handshake.
+
+    Clients that have been idle for more than ``health_check_interval``
+    seconds, or that were released after a failure, are checked before being
+    handed out again. If the check fails, the client is closed and replaced
+    with a new one. All the clients use the vertex ID scheme ``vid_scheme``,
+    the asset key mode ``asset_keys`` and the asset label mode
+    ``label_mode``."""
+
+    def __init__(
+        self,
+        gremlin_endpoint,
+        auth_mode='none',
+        size=4,
+        health_check_interval=30,
+        vid_scheme='random',
+        asset_keys='hybrid',
+        label_mode='single',
+    ):  # pylint: disable=too-many-arguments
+        if size < 1:
+            raise ValueError('pool size must be greater than zero')
+
+        self._settings = PoolSettings(
+            gremlin_endpoint,
+            auth_mode,
+            size,
+            health_check_interval,
+            vid_scheme,
+            asset_keys,
+            label_mode,
+        )
+
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._in_use = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Number of clients currently open and counters accumulated since the
+        # pool was created: ``created``, ``replaced`` and ``acquired``.
+        self._clients = 0
+        self._counters = Counter()
+
+    @property
+    def size(self):
+        """Maximum number of clients of the pool."""
+        return self._settings.size
+
+    def open(self):
+        """Creates the clients of the pool and opens their graph connections.
+        If any of the connections cannot be opened, an exception is
+        raised."""
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise InventoryError('pool is closed')
+                if self._clients >= self._settings.size:
+                    return
+                entry = self._new_entry()
+
+            try:
+                entry.cli.ping()
+            except Exception:
+                entry.cli.close()
+                with self._lock:
+                    self._clients -= 1
+                raise
+
+            self._idle.put_nowait(entry)
+
+    def acquire(self, timeout=None):
+        """Returns an ``InventoryClient`` from the pool. If all the clients are
+        in use, it blocks until one is released. If ``timeout`` is not
+        ``None`` and no client is released in ``timeout`` seconds, a
+        ``PoolExhaustedError`` exception is raised."""
+        entry = None
+        with self._lock:
+            if self._closed:
+                raise InventoryError('pool is closed')
+            if self._idle.empty() and self._clients < self._settings.size:
+                entry = self._new_entry()
+
+        if entry is None:
+            try:
+                entry = self._idle.get(timeout=timeout)
+            except queue.Empty as e:
+                raise PoolExhaustedError('no client available') from e
+            entry = self._check(entry)
+
+        with self._lock:
+            self._in_use[id(entry.cli)] = entry
+            self._counters['acquired'] += 1
+
+        return entry.cli
+
+    def release(self, cli, healthy=True):
+        """Returns ``cli`` to the pool. If ``healthy`` is ``False``, the client
+        is checked before being acquired again and its cached universes are
+        invalidated."""
+        with self._lock:
+            entry = self._in_use.pop(id(cli), None)
+            if entry is None:
+                raise ValueError('client does not belong to the pool')
+            closed = self._closed
+
+        if closed:
+            entry.cli.close()
+            with self._lock:
+                self._clients -= 1
+            return
+
+        if not healthy:
+            entry.suspect = True
+            entry.cli.invalidate_universes()
+        self._idle.put_nowait(entry)
+
+    def close(self):
+        """Closes the idle clients of the pool. The clients in use are closed
+        when they are released."""
+        with self._lock:
+            self._closed = True
+
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            entry.cli.close()
+            with self._lock:
+                self._clients -= 1
+
+    def stats(self):
+        """Returns a dict with the current state of the pool and the counters
+        accumulated since it was created."""
+        with self._lock:
+            return {
+                'size': self._settings.size,
+                'clients': self._clients,
+                'idle': self._idle.qsize(),
+                'in_use': len(self._in_use),
+                'created': self._counters['created'],
+                'replaced': self._counters['replaced'],
+                'acquired': self._counters['acquired'],
+            }
+
+    def _new_entry(self):
+        """Returns a new pool entry. It must be called with ``_lock``
+        held."""
+        settings = self._settings
+        self._clients += 1
+        self._counters['created'] += 1
+        return _PoolEntry(InventoryClient(
+            settings.gremlin_endpoint,
+            settings.auth_mode,
+            settings.vid_scheme,
+            settings.asset_keys,
+            settings.label_mode,
+        ))
+
+    def _check(self, entry):
+        """Checks the health of ``entry`` if needed. If the check fails, the
+        client is closed and a new entry is returned."""
+        now = time.monotonic()
+        elapsed = now - entry.last_checked
+        interval = self._settings.health_check_interval
+        if not entry.suspect and elapsed < interval:
+            return entry
+
+        try:
+            entry.cli.ping()
+        except Exception:  # pylint: disable=broad-except
+            entry.cli.close()
+            with self._lock:
+                self._clients -= 1
+                self._counters['replaced'] += 1
+                entry = self._new_entry()
+            return entry
+
+        entry.last_checked = now
+        entry.suspect = False
+        return entry
@@ -0,0 +1,91 @@
+"""This module provides the schemes used to assign IDs to the Team and Asset
+vertices.
+
+By default, the vertices get random IDs, so they can only be looked up by
+their natural key, the identifier of a team or the type and identifier of an
+asset, with a property lookup. With natural IDs, the ID of a vertex is derived
+from its universe and its natural key. Thus, looking up a vertex by its natural
+key is a lookup by ID and concurrent upserts of the same element cannot create
+duplicated vertices, because the graph rejects the second vertex with the same
+ID.
+
+The same schemes apply to the ``parent_of`` and ``owns`` edges. Their natural
+IDs are derived from their label and the IDs of their endpoints, so an
+existing relationship is fetched by ID instead of scanning the edges of one of
+its vertices."""
+
+import json
+import uuid
+
+
+VERTEX_ID_SCHEMES = ('random', 'hybrid', 'natural')
+"""Supported vertex ID schemes.
+
+- ``random``: vertices and edges get random UUIDs.
+- ``hybrid``: vertices and edges get natural IDs. If an element is not found
+  by its natural ID, it is looked up by its properties or endpoints, so the
+  elements created with random IDs are still found. It must be used while
+  migrating a graph.
+- ``natural``: vertices and edges get natural IDs and are only looked up by
+  them."""
+
+NATURAL_VID_NAMESPACE = uuid.uuid5(
+    uuid.NAMESPACE_URL,
+    'https://github.com/adevinta/graph-asset-inventory-api/vertex-ids',
+)
+"""Namespace of the UUIDs used as natural vertex IDs. It must not change, or
+the natural IDs of the existing vertices would not be found."""
+
+
+class NaturalVertexIDs:
+    """Derives the IDs of the Team and Asset vertices from their universe and
+    natural key. If ``fallback`` is ``True``, the vertices that are not found
+    by their natural ID must be looked up by their properties."""
+
+    def __init__(self, fallback=False):
+        self.fallback = fallback
+
+    def __repr__(self):
+        return f'{{fallback: {self.fallback}}}'
+
+    @staticmethod
+    def team(universe, identifier):
+        """Returns the vertex ID of the team with ``identifier`` in
+        ``universe``."""
+        return _natural_vid(universe, 'Team', identifier)
+
+    @staticmethod
+    def asset(universe, asset_id):
+        """Returns the vertex ID of the asset with ``asset_id`` in
+        ``universe``."""
+        return _natural_vid(
+            universe, 'Asset', asset_id.type, asset_id.identifier)
+
+    @staticmethod
+    def edge(label, out_vid, in_vid):
+        """Returns the ID of the edge with ``label`` that goes from the vertex
+        with ID ``out_vid`` to the vertex with ID ``in_vid``. The vertex IDs
+        already identify the universe."""
+        name = json.dumps([label, str(out_vid), str(in_vid)])
+        return str(uuid.uuid5(NATURAL_VID_NAMESPACE, name))
+
+
+def vertex_ids(scheme):
+    """Returns the ``NaturalVertexIDs`` that correspond to the vertex ID
+    ``scheme``, or ``None`` if the vertices get random IDs. If the scheme is
+    not supported, a ``ValueError`` exception is raised."""
+    if scheme not in VERTEX_ID_SCHEMES:
+        raise ValueError(f'unknown vertex ID scheme: {scheme}')
+
+    if scheme == 'random':
+        return None
+    return NaturalVertexIDs(fallback=scheme == 'hybrid')
+
+
+def _natural_vid(universe, label, *key):
+    """Returns the UUID5 of the vertex with ``label`` and natural ``key`` in
+    ``universe``. The fields are encoded as a JSON array, so different keys
+    never have the same representation."""
+    name = json.dumps(
+        [universe.namespace, universe.version.int_version, label, *key])
+    return str(uuid.uuid5(NATURAL_VID_NAMESPACE, name))
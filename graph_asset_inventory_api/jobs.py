@@ -0,0 +1,433 @@
+"""This module provides the asynchronous bulk jobs of the Asset Inventory API.
+
+The payload of every job is stored in a local spool directory as a NDJSON file
+with one asset per line. The progress of the job is recorded in an append-only
+NDJSON log next to it, with one checkpoint per processed batch. Given that the
+payload and the log are persisted before and during the processing, the jobs
+that were not finished when the process stopped are resumed from their last
+checkpoint when it starts again. The finished jobs are kept for a retention
+period, so their state can still be queried, and then deleted."""
+
+import os
+import json
+import uuid
+import fcntl
+import time
+import queue
+import logging
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from gremlin_python.driver.protocol import GremlinServerError
+
+from graph_asset_inventory_api.inventory import NotFoundError
+from graph_asset_inventory_api.inventory.pool import PoolExhaustedError
+from graph_asset_inventory_api.api.assets_bulk import DEFAULT_ACQUIRE_TIMEOUT
+from graph_asset_inventory_api.api.assets_bulk_stream import (
+    ApiBulkAssetStreamInsert,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_JOB_ERRORS = 100
+"""Maximum number of line errors kept in the state of a job. The total number
+of errors is always reported."""
+
+DEFAULT_RETRIES = 3
+"""Default number of times a job is retried after a transient error."""
+
+DEFAULT_RETRY_DELAY = 1
+"""Default delay, in seconds, before the first retry of a job. The delay is
+doubled after every retry."""
+
+DEFAULT_RETENTION = 86400
+"""Default number of seconds a finished job is kept in the spool, so its state
+can still be queried."""
+
+
+class JobSettings(namedtuple(
+    'JobSettings',
+    [
+        'schema',
+        'chunk_size',
+        'concurrency',
+        'acquire_timeout',
+        'retries',
+        'retry_delay',
+        'retention',
+    ],
+    defaults=[
+        DEFAULT_ACQUIRE_TIMEOUT,
+        DEFAULT_RETRIES,
+        DEFAULT_RETRY_DELAY,
+        DEFAULT_RETENTION,
+    ],
+)):
+    """Represents the configuration of a ``BulkJobRunner``. The lines of the
+    jobs are validated against ``schema`` and inserted like in a streaming
+    bulk request, with ``chunk_size``, ``concurrency`` and
+    ``acquire_timeout``. A job that fails with a transient error is retried
+    from its last checkpoint up to ``retries`` times, waiting ``retry_delay``
+    seconds before the first retry and doubling the delay after every retry.
+    The finished jobs are deleted after ``retention`` seconds."""
+
+    __slots__ = ()
+
+
+class _JobLog:
+    """Append-only progress log of a job, stored in the opened file ``f``. The
+    log is locked while it is open, so a job is never processed by two threads
+    or processes at the same time."""
+
+    def __init__(self, f):
+        self._f = f
+        try:
+            fcntl.flock(self._f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._f.close()
+            raise
+        self._repair()
+
+    def _repair(self):
+        """Removes the incomplete last entry left by a process that stopped
+        while writing it, so new entries are not appended to it."""
+        self._f.seek(0)
+        data = self._f.read()
+        if data.endswith('\n') or len(data) == 0:
+            return
+        self._f.truncate(len(data[:data.rfind('\n') + 1].encode()))
+
+    def state(self):
+        """Returns the current state of the job."""
+        self._f.seek(0)
+        return _parse_log(self._f)
+
+    def append(self, entry):
+        """Appends ``entry`` to the log and flushes it to disk."""
+        self._f.write(json.dumps(entry) + '\n')
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self):
+        """Releases the lock and closes the log."""
+        self._f.close()
+
+
+def _parse_log(f):
+    """Returns the state of a job from its progress log ``f``. Only the first
+    ``MAX_JOB_ERRORS`` errors are kept, along with the total number of errors.
+    An incomplete last entry, left by a process that stopped while writing it,
+    is ignored."""
+    state = {
+        'status': 'pending',
+        'assets_total': 0,
+        'assets_done': 0,
+        'edges_done': 0,
+        'errors': [],
+        'errors_total': 0,
+        'line': 0,
+    }
+
+    for line in f:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            break
+
+        if 'assets_total' in entry:
+            state['assets_total'] = entry['assets_total']
+        elif 'line' in entry:
+            state['status'] = 'running'
+            state['line'] = entry['line']
+            state['assets_done'] += entry['assets']
+            state['edges_done'] += entry['edges']
+            state['errors_total'] += len(entry['errors'])
+            room = max(MAX_JOB_ERRORS - len(state['errors']), 0)
+            state['errors'].extend(entry['errors'][:room])
+        elif 'failed' in entry:
+            state['status'] = 'failed'
+            state['detail'] = entry['failed']
+        elif entry.get('done', False):
+            state['status'] = 'done'
+
+    return state
+
+
+class BulkJobSpool:
+    """Local directory where the bulk jobs are stored."""
+
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+
+    def create(self, assets_req):
+        """Stores a new job that inserts the assets in ``assets_req`` and
+        returns its ID. The missing timestamps of the assets and their parents
+        are set to the time the job is created, so they do not depend on when
+        the job is processed or resumed. ``assets_req`` is not modified."""
+        job_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc).isoformat()
+
+        with open(self._log_path(job_id), 'x', encoding='utf-8') as f:
+            f.write(json.dumps({'assets_total': len(assets_req)}) + '\n')
+
+        # The payload is renamed once it is complete, so a job is not visible
+        # until it can be processed.
+        tmp_path = self._payload_path(job_id) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for asset_req in assets_req:
+                f.write(json.dumps(_stamp(asset_req, now)) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tmp_path, self._payload_path(job_id))
+
+        return job_id
+
+    def state(self, job_id):
+        """Returns the state of the job with ID ``job_id``. If the job does not
+        exist, a ``NotFoundError`` exception is raised."""
+        if not self._exists(job_id):
+            raise NotFoundError(job_id)
+
+        try:
+            with open(self._log_path(job_id), encoding='utf-8') as f:
+                return _parse_log(f)
+        except FileNotFoundError as e:
+            # The job has just been pruned.
+            raise NotFoundError(job_id) from e
+
+    def unfinished(self):
+        """Returns the IDs of the jobs that are not finished."""
+        job_ids = []
+        for name in sorted(os.listdir(self.path)):
+            job_id, ext = os.path.splitext(name)
+            if ext != '.ndjson':
+                continue
+            if self.state(job_id)['status'] in ('pending', 'running'):
+                job_ids.append(job_id)
+        return job_ids
+
+    def prune(self, retention):
+        """Deletes the jobs that finished more than ``retention`` seconds ago,
+        along with the jobs whose creation was interrupted more than
+        ``retention`` seconds ago, and returns their IDs. The payload of a job
+        is deleted before its log, so the job is not visible while it is being
+        deleted."""
+        deadline = time.time() - retention
+        job_ids = []
+        for name in sorted(os.listdir(self.path)):
+            job_id, ext = os.path.splitext(name)
+            if ext == '.ndjson':
+                path = self._log_path(job_id)
+            elif ext == '.tmp':
+                job_id = os.path.splitext(job_id)[0]
+                path = os.path.join(self.path, name)
+            else:
+                continue
+
+            try:
+                if os.path.getmtime(path) > deadline:
+                    continue
+                if ext == '.ndjson' and \
+                        self.state(job_id)['status'] not in ('done', 'failed'):
+                    continue
+                os.remove(os.path.join(self.path, name))
+                os.remove(self._log_path(job_id))
+            except (FileNotFoundError, NotFoundError):
+                # The job is being pruned by other process.
+                continue
+            job_ids.append(job_id)
+        return job_ids
+
+    def open_log(self, job_id):
+        """Opens and locks the progress log of the job with ID ``job_id``. If
+        the log is locked by other thread or process, an ``OSError`` exception
+        is raised."""
+        return _JobLog(open(self._log_path(job_id), 'a+', encoding='utf-8'))
+
+    def open_payload(self, job_id):
+        """Opens the payload of the job with ID ``job_id``."""
+        return open(self._payload_path(job_id), 'rb')
+
+    def _exists(self, job_id):
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return False
+        return os.path.exists(self._payload_path(job_id))
+
+    def _payload_path(self, job_id):
+        return os.path.join(self.path, f'{job_id}.ndjson')
+
+    def _log_path(self, job_id):
+        return os.path.join(self.path, f'{job_id}.log')
+
+
+class _JobAssetInsert(ApiBulkAssetStreamInsert):
+    """Streaming bulk insert that records a checkpoint in the progress log of
+    the job after every batch. Only the assets of the lines without errors are
+    counted as done."""
+
+    def __init__(self, job_log, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.job_log = job_log
+
+    def _insert_batch(self, batch, out):
+        edges_done = self.edges_done
+        results = super()._insert_batch(batch, out)
+        errors = [r for r in results if r['status'] != 204]
+        self.job_log.append({
+            'line': batch[-1][0],
+            'assets': len(batch) - len(errors),
+            'edges': self.edges_done - edges_done,
+            'errors': errors,
+        })
+        return results
+
+
+class BulkJobRunner:
+    """Processes the jobs of a ``BulkJobSpool`` in a background thread, using
+    the clients of ``pool`` and the ``JobSettings`` in ``settings``. The
+    finished jobs are pruned from the spool when the runner starts and after
+    every job."""
+
+    def __init__(self, spool, pool, settings):
+        self.spool = spool
+        self.pool = pool
+        self.settings = settings
+
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """Starts the background thread and enqueues the jobs of the spool
+        that are not finished."""
+        self._prune()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        for job_id in self.spool.unfinished():
+            self.submit(job_id)
+
+    def stop(self, timeout=None):
+        """Stops the background thread after finishing the current job."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, job_id):
+        """Enqueues the job with ID ``job_id``."""
+        self._queue.put(job_id)
+
+    def _run(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            try:
+                self.process(job_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Error processing job %s', job_id)
+            self._prune()
+
+    def _prune(self):
+        """Deletes the jobs of the spool that finished more than ``retention``
+        seconds ago."""
+        try:
+            job_ids = self.spool.prune(self.settings.retention)
+        except OSError:
+            logger.exception('Error pruning jobs')
+            return
+        if job_ids:
+            logger.debug('Pruned jobs: %s', job_ids)
+
+    def process(self, job_id):
+        """Processes the job with ID ``job_id`` from its last checkpoint. If
+        the job is being processed by other thread or process, it does
+        nothing. If the job fails with an error that is not transient, or
+        keeps failing after all the retries, it is marked as failed."""
+        try:
+            job_log = self.spool.open_log(job_id)
+        except OSError:
+            logger.debug('Job %s is locked', job_id)
+            return
+
+        retries = self.settings.retries
+        try:
+            retry = 0
+            while True:
+                state = job_log.state()
+                if state['status'] not in ('pending', 'running'):
+                    return
+
+                try:
+                    self._insert(job_id, job_log, state)
+                    break
+                except Exception as e:  # pylint: disable=broad-except
+                    if not _is_transient(e) or retry >= retries:
+                        job_log.append({'failed': str(e)})
+                        raise
+                    retry += 1
+                    logger.warning(
+                        'Retrying job %s (%d/%d): %s',
+                        job_id, retry, retries, e)
+                    time.sleep(self.settings.retry_delay * 2 ** (retry - 1))
+
+            job_log.append({'done': True})
+        finally:
+            job_log.close()
+
+    def _insert(self, job_id, job_log, state):
+        """Inserts the assets of the job with ID ``job_id`` that come after
+        the last checkpoint in ``state``. If no client of the pool is released
+        in ``acquire_timeout`` seconds, a ``PoolExhaustedError`` exception is
+        raised, so the job is retried later."""
+        settings = self.settings
+        cli = self.pool.acquire(settings.acquire_timeout)
+        healthy = False
+        try:
+            bulk = _JobAssetInsert(
+                job_log,
+                cli,
+                settings.schema,
+                settings.chunk_size,
+                settings.concurrency,
+                self.pool,
+                acquire_timeout=settings.acquire_timeout,
+            )
+            with self.spool.open_payload(job_id) as payload:
+                lines = _skip(payload, state['line'])
+                bulk.insert_stream(lines, start=state['line'] + 1)
+            healthy = True
+        finally:
+            self.pool.release(cli, healthy=healthy)
+
+
+def _is_transient(exc):
+    """Returns ``True`` if ``exc`` is an error that can go away by retrying,
+    like a graph error, a network error or the lack of free clients in the
+    pool."""
+    return isinstance(
+        exc, (GremlinServerError, PoolExhaustedError, OSError))
+
+
+def _stamp(asset_req, timestamp):
+    """Returns a copy of ``asset_req`` where the missing timestamps of the
+    asset and its parents are set to ``timestamp``."""
+    asset_req = dict(asset_req)
+    if 'parents' in asset_req:
+        asset_req['parents'] = [dict(p) for p in asset_req['parents']]
+    for req in [asset_req] + asset_req.get('parents', []):
+        req.setdefault('timestamp', timestamp)
+    return asset_req
+
+
+def _skip(lines, n):
+    """Skips the first ``n`` elements of the iterator ``lines``."""
+    for _ in range(n):
+        next(lines, None)
+    return lines
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+
+"""Migrations of the graph of the Asset Inventory. They are run with:
+
+    python -m graph_asset_inventory_api.migrations <migration>
+
+The Gremlin server is configured with the same environment variables used by
+the API: ``GREMLIN_ENDPOINT`` and ``GREMLIN_AUTH_MODE``.
+
+The ``natural-vids`` migration moves a graph from random to natural vertex and
+edge IDs. The API must run with ``VERTEX_IDS=hybrid`` while it is being
+migrated, so the teams, assets and relationships are found regardless of their
+ID. Once the migration finishes without errors, the API can be switched to
+``VERTEX_IDS=natural``. The migration changes the IDs of the teams, assets and
+relationships, so the clients that store them must look them up again.
+
+The ``asset-keys`` migration sets the composite key of the assets created
+before it was introduced. The API must run with ``ASSET_KEYS=hybrid`` until it
+finishes. Then, it can be switched to ``ASSET_KEYS=composite``.
+
+The ``typed-labels`` migration adds the label of their type to the assets
+created with the single label ``Asset``. It requires a graph with multi-label
+support, like Neptune, which must be indicated with
+``GREMLIN_MULTI_LABELS=true``. The API must run with ``ASSET_LABELS=hybrid``
+while it is being migrated. Once the migration finishes without errors, the
+API can be switched to ``ASSET_LABELS=typed``. The labels cannot be modified,
+so the assets are replaced with vertices with the same ID, properties and
+edges."""
+
+import os
+import sys
+import logging
+import argparse
+
+from graph_asset_inventory_api import EnvVarNotSetError
+from graph_asset_inventory_api.inventory import (
+    CURRENT_UNIVERSE,
+    InventoryError,
+    ConflictError,
+)
+from graph_asset_inventory_api.inventory.client import InventoryClient
+from graph_asset_inventory_api.inventory.vids import NaturalVertexIDs
+from graph_asset_inventory_api.inventory.labels import (
+    TypedAssetLabels,
+    has_label,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_natural_vids(
+    cli,
+    universe=CURRENT_UNIVERSE,
+    page_size=100,
+    dry_run=False,
+):
+    """Replaces the team and asset vertices of ``universe`` whose vertex ID is
+    not their natural ID. Then, it replaces the ``parent_of`` and ``owns``
+    edges of the assets whose edge ID is not their natural ID. The elements
+    are listed in pages of ``page_size`` elements. If ``dry_run`` is
+    ``True``, the elements are not replaced. The elements whose natural ID is
+    already taken are skipped. It returns a dict with the number of elements
+    ``migrated``, skipped because of ``conflicts`` and ``failed``. The
+    migrated vertices can be listed again with their new IDs, but they are not
+    migrated twice."""
+    vids = NaturalVertexIDs()
+
+    def replace_vertex(vid, new_vid):
+        cli.replace_vertex(vid, new_vid, vids)
+
+    stats = {'migrated': 0, 'conflicts': 0, 'failed': 0}
+    for team in _elements(cli.teams, universe, page_size):
+        new_vid = vids.team(universe, team.identifier)
+        _migrate(stats, team.vid, new_vid, replace_vertex, dry_run)
+
+    for asset in _elements(cli.assets, universe, page_size):
+        new_vid = vids.asset(universe, asset.asset_id)
+        _migrate(stats, asset.vid, new_vid, replace_vertex, dry_run)
+
+    # The edges of the migrated vertices already have natural IDs. These are
+    # the edges created between vertices that had natural IDs before the
+    # migration, for instance the ones found by their endpoints in hybrid
+    # mode.
+    for asset in _elements(cli.assets, universe, page_size):
+        for parentof in cli.parents(asset.vid):
+            new_eid = vids.edge(
+                'parent_of', parentof.parent_vid, parentof.child_vid)
+            _migrate(
+                stats, parentof.eid, new_eid, cli.replace_edge, dry_run)
+        for owns in cli.owners(asset.vid):
+            new_eid = vids.edge('owns', owns.team_vid, owns.asset_vid)
+            _migrate(stats, owns.eid, new_eid, cli.replace_edge, dry_run)
+
+    return stats
+
+
+def migrate_typed_labels(
+    cli,
+    universe=CURRENT_UNIVERSE,
+    page_size=100,
+    dry_run=False,
+):
+    """Replaces the asset vertices of ``universe`` whose label does not
+    include the label of their type by vertices with the same ID, properties
+    and edges, and the label of their type. The assets are listed in pages of
+    ``page_size`` assets. If ``dry_run`` is ``True``, the assets are not
+    replaced. It returns a dict with the number of assets ``migrated``,
+    skipped because of ``conflicts`` and ``failed``."""
+    labels = TypedAssetLabels()
+
+    def relabel(vid, label):
+        cli.replace_vertex(vid, vid, label=label)
+
+    stats = {'migrated': 0, 'conflicts': 0, 'failed': 0}
+    for page in _pages(cli.assets, universe, page_size):
+        vlabels = cli.vertex_labels([asset.vid for asset in page])
+        for asset in page:
+            # The types that cannot be stored as labels keep the single
+            # label and are listed by their property.
+            type_label = labels.type_label(asset.asset_id.type)
+            if type_label is None or asset.vid not in vlabels or \
+                    has_label(vlabels[asset.vid], type_label):
+                continue
+            label = labels.vertex_label(asset.asset_id.type)
+            _migrate(stats, asset.vid, label, relabel, dry_run)
+
+    return stats
+
+
+def backfill_asset_keys(cli, universe=CURRENT_UNIVERSE, page_size=100):
+    """Sets the composite key of the assets of ``universe`` that do not have
+    it. The assets are listed and updated in pages of ``page_size`` assets. It
+    returns the number of updated assets."""
+    updated = 0
+    for page in _pages(cli.assets, universe, page_size):
+        count = cli.set_asset_keys(page, universe)
+        if count > 0:
+            logger.info('Set the composite key of %d assets', count)
+        updated += count
+    return updated
+
+
+def _pages(listing, universe, page_size):
+    """Yields the pages of elements of ``universe`` returned by ``listing``,
+    the ``teams`` or ``assets`` method of an ``InventoryClient``, requesting
+    them in pages of ``page_size`` elements."""
+    after = None
+    while True:
+        page = listing(page_size=page_size, universe=universe, after=after)
+        if len(page) == 0:
+            return
+        after = page[-1].vid
+        yield page
+
+
+def _elements(listing, universe, page_size):
+    """Yields the elements of the pages returned by ``_pages``."""
+    for page in _pages(listing, universe, page_size):
+        yield from page
+
+
+def _migrate(stats, id_, new_id, replace, dry_run):
+    """Replaces the element with ID ``id_`` calling ``replace(id_, new_id)``,
+    unless it already has ID ``new_id`` or ``dry_run`` is ``True``. The result
+    is recorded in ``stats``."""
+    if str(id_) == new_id:
+        return
+
+    if dry_run:
+        logger.info('Would migrate %s to %s', id_, new_id)
+        stats['migrated'] += 1
+        return
+
+    try:
+        replace(id_, new_id)
+    except ConflictError:
+        logger.warning('Skipping %s: %s already exists', id_, new_id)
+        stats['conflicts'] += 1
+    except InventoryError as e:
+        logger.error('Error migrating %s: %s', id_, e)
+        stats['failed'] += 1
+    else:
+        logger.info('Migrated %s to %s', id_, new_id)
+        stats['migrated'] += 1
+
+
+def main(argv=None):
+    """Runs the migration specified in the command line ``argv``. It returns
+    the exit status of the process."""
+    parser = argparse.ArgumentParser(
+        description='Migrations of the Asset Inventory graph.')
+    subparsers = parser.add_subparsers(dest='migration', required=True)
+    natural_vids = subparsers.add_parser(
+        'natural-vids',
+        help='replace the random vertex IDs with natural IDs',
+    )
+    natural_vids.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='report the vertices to migrate without modifying them',
+    )
+    natural_vids.add_argument(
+        '--page-size',
+        type=int,
+        default=100,
+        help='number of vertices listed by every graph traversal',
+    )
+    asset_keys = subparsers.add_parser(
+        'asset-keys',
+        help='set the composite key of the assets that do not have it',
+    )
+    asset_keys.add_argument(
+        '--page-size',
+        type=int,
+        default=100,
+        help='number of assets updated by every graph traversal',
+    )
+    typed_labels = subparsers.add_parser(
+        'typed-labels',
+        help='add the label of their type to the assets',
+    )
+    typed_labels.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='report the assets to migrate without modifying them',
+    )
+    typed_labels.add_argument(
+        '--page-size',
+        type=int,
+        default=100,
+        help='number of assets listed by every graph traversal',
+    )
+    args = parser.parse_args(argv)
+
+    multi_labels = os.getenv('GREMLIN_MULTI_LABELS', 'false') == 'true'
+    if args.migration == 'typed-labels' and not multi_labels:
+        parser.error('typed-labels requires GREMLIN_MULTI_LABELS=true')
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+
+    gremlin_endpoint = os.getenv('GREMLIN_ENDPOINT', None)
+    if gremlin_endpoint is None:
+        raise EnvVarNotSetError('GREMLIN_ENDPOINT')
+    auth_mode = os.getenv('GREMLIN_AUTH_MODE', 'none')
+
+    cli = InventoryClient(gremlin_endpoint, auth_mode)
+    try:
+        if args.migration == 'asset-keys':
+            updated = backfill_asset_keys(cli, page_size=args.page_size)
+            logger.info('Updated: %d', updated)
+            return 0
+
+        if args.migration == 'typed-labels':
+            stats = migrate_typed_labels(
+                cli, page_size=args.page_size, dry_run=args.dry_run)
+        else:
+            stats = migrate_natural_vids(
+                cli, page_size=args.page_size, dry_run=args.dry_run)
+    finally:
+        cli.close()
+
+    logger.info(
+        'Migrated: %d, conflicts: %d, failed: %d',
+        stats['migrated'], stats['conflicts'], stats['failed'])
+
+    if stats['conflicts'] > 0 or stats['failed'] > 0:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,3 @@
+// Indices of the Asset Inventory graph. Assets are looked up by their
+// composite key, so it is indexed to avoid scanning all the vertices.
+graph.createIndex('asset_key', Vertex.class)
@@ -27,6 +27,7 @@ from graph_asset_inventory_api.inventory import (
     DbAsset,
     DbParentOf,
     DbOwns,
+    ParentOf,
     CURRENT_UNIVERSE,
 )
 from graph_asset_inventory_api.api import (
@@ -51,6 +52,12 @@ def get_auth_mode():
     return os.getenv('GREMLIN_AUTH_MODE', 'none')
 
 
+def get_multi_labels():
+    """Returns ``True`` if the environment indicates that the graph supports
+    multi-labels."""
+    return os.getenv('GREMLIN_MULTI_LABELS', 'false') == 'true'
+
+
 @pytest.fixture
 def g():
     """Returns the graph traversal source. It takes care of closing the gremlin
@@ -86,14 +93,72 @@ def cli(g, universe):  # pylint: disable=unused-argument
 
 
 @pytest.fixture
-def flask_cli(g):  # pylint: disable=unused-argument
-    """Returns a flask test client. It takes care of closing the client after
-    finishing the test."""
+def natural_cli(g, universe):  # pylint: disable=unused-argument
+    """Returns an ``InventoryClient`` that assigns natural IDs to the team and
+    asset vertices. It takes care of closing the client after finishing the
+    test."""
+    cli = InventoryClient(get_gremlin_endpoint(), get_auth_mode(), 'natural')
+
+    yield cli
+
+    cli.close()
+
+
+@pytest.fixture
+def natural_clis(g, universe):  # pylint: disable=unused-argument
+    """Returns two ``InventoryClient`` with natural IDs and their own
+    connections, which can be used to run traversals concurrently. It takes
+    care of closing the clients after finishing the test."""
+    clis = tuple(
+        InventoryClient(get_gremlin_endpoint(), get_auth_mode(), 'natural')
+        for _ in range(2)
+    )
+
+    yield clis
+
+    for cli in clis:
+        cli.close()
+
+
+@pytest.fixture
+def hybrid_cli(g, universe):  # pylint: disable=unused-argument
+    """Returns an ``InventoryClient`` that assigns natural IDs to the team and
+    asset vertices and also finds the vertices with random IDs. It takes care
+    of closing the client after finishing the test."""
+    cli = InventoryClient(get_gremlin_endpoint(), get_auth_mode(), 'hybrid')
+
+    yield cli
+
+    cli.close()
+
+
+@pytest.fixture
+def composite_cli(g, universe):  # pylint: disable=unused-argument
+    """Returns an ``InventoryClient`` that only looks up assets by their
+    composite key. It takes care of closing the client after finishing the
+    test."""
+    cli = InventoryClient(
+        get_gremlin_endpoint(), get_auth_mode(), 'random', 'composite')
+
+    yield cli
+
+    cli.close()
+
+
+@pytest.fixture
+def flask_cli(g, tmp_path, monkeypatch):  # pylint: disable=unused-argument
+    """Returns a flask test client. It takes care of closing the client, the
+    runner of bulk jobs and the pool of Inventory Clients after finishing the
+    test. The bulk jobs are stored in a temporary directory."""
+    monkeypatch.setenv('BULK_JOBS_DIR', str(tmp_path / 'jobs'))
     conn_app = create_app()
 
     with conn_app.app.test_client() as flask_cli:
         yield flask_cli
 
+    conn_app.app.extensions['bulk_job_runner'].stop()
+    conn_app.app.extensions['inventory_client_pool'].close()
+
 
 @pytest.fixture
 def unknown_uuid():
@@ -632,6 +697,33 @@ def init_api_children(init_children):
     yield api_children
 
 
+@pytest.fixture
+def init_lineage(cli, init_assets):
+    """Creates a graph of ``parent_of`` edges with a cycle and yields a dict of
+    the form ``{(parent_idx, child_idx): DbParentOf}``. The indices refer to
+    the assets created by ``init_assets``. The edge ``(3, 1)`` is only valid
+    in August 2021, the rest of edges are valid in July 2021."""
+    edges = [
+        (0, 1, '2021-07-01T01:00:00+00:00', '2021-07-14T01:00:00+00:00'),
+        (1, 2, '2021-07-01T01:00:00+00:00', '2021-07-14T01:00:00+00:00'),
+        (2, 0, '2021-07-01T01:00:00+00:00', '2021-07-14T01:00:00+00:00'),
+        (3, 1, '2021-08-01T01:00:00+00:00', '2021-08-14T01:00:00+00:00'),
+    ]
+
+    lineage = {}
+    for parent_idx, child_idx, timestamp, expiration in edges:
+        parentof = ParentOf(
+            init_assets[parent_idx].vid, init_assets[child_idx].vid)
+        dbparentof, _ = cli.set_parent_of(
+            parentof,
+            datetime.fromisoformat(expiration),
+            datetime.fromisoformat(timestamp),
+        )
+        lineage[(parent_idx, child_idx)] = dbparentof
+
+    yield lineage
+
+
 # Owners.
 
 
@@ -1,6 +1,26 @@
 """Helper functions shared across tests."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 
 def compare_unsorted_list(list_a, list_b, sort_key):
     """Compares two unsorted lists."""
     return sorted(list_a, key=sort_key) == sorted(list_b, key=sort_key)
+
+
+def race(*calls):
+    """Calls the functions in ``calls`` at the same time, every one in its own
+    thread, and returns the list of their results. If a function raises an
+    exception, its result is the exception."""
+    barrier = threading.Barrier(len(calls))
+
+    def run(call):
+        barrier.wait()
+        try:
+            return call()
+        except Exception as e:  # pylint: disable=broad-except
+            return e
+
+    with ThreadPoolExecutor(len(calls)) as executor:
+        return list(executor.map(run, calls))
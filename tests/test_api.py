@@ -2,27 +2,67 @@
 
 import json
 
+import pytest
+
+from graph_asset_inventory_api.api import TeamResp
 from graph_asset_inventory_api.factory import create_app
+from graph_asset_inventory_api.inventory.pool import InventoryClientPool
 
 
-def test_wrong_gremlin_endpoint():
+def test_wrong_gremlin_endpoint(tmp_path, monkeypatch):
     """Tests that an HTTP error is returned by the API if the Gremlin endpoint
     is not valid."""
+    monkeypatch.setenv('BULK_JOBS_DIR', str(tmp_path / 'jobs'))
     conn_app = create_app()
+    conn_app.app.extensions['bulk_job_runner'].stop()
 
     # Do not propagate exceptions. We are checking the returned status code, so
     # the application is the one that should handle the exceptions.
     conn_app.app.testing = False
     conn_app.app.debug = False
 
-    # Set an invalid Gremlin endpoint.
-    conn_app.app.config['GREMLIN_ENDPOINT'] = 'ws://invalid-host:8182/gremlin'
+    # Replace the pool with one that uses an invalid Gremlin endpoint.
+    conn_app.app.extensions['inventory_client_pool'].close()
+    conn_app.app.extensions['inventory_client_pool'] = InventoryClientPool(
+        'ws://invalid-host:8182/gremlin')
 
     with conn_app.app.test_client() as flask_cli:
         resp = flask_cli.get('/v1/teams')
         assert resp.status_code == 500
 
 
+def test_pool_exhausted(g, tmp_path, monkeypatch):
+    """Tests that the API returns a 503 if no graph connection is released in
+    ``GREMLIN_POOL_ACQUIRE_TIMEOUT`` seconds."""
+    # pylint: disable=unused-argument
+    monkeypatch.setenv('BULK_JOBS_DIR', str(tmp_path / 'jobs'))
+    monkeypatch.setenv('GREMLIN_POOL_SIZE', '1')
+    monkeypatch.setenv('GREMLIN_POOL_ACQUIRE_TIMEOUT', '1')
+    conn_app = create_app()
+    pool = conn_app.app.extensions['inventory_client_pool']
+
+    # Hold the only client of the pool.
+    cli = pool.acquire()
+    try:
+        with conn_app.app.test_client() as flask_cli:
+            resp = flask_cli.get('/v1/teams')
+            assert resp.status_code == 503
+    finally:
+        pool.release(cli)
+        conn_app.app.extensions['bulk_job_runner'].stop()
+        pool.close()
+
+
+def test_asset_labels_multi_labels(monkeypatch):
+    """Tests that the API does not start with typed asset labels if the graph
+    does not support multi-labels."""
+    monkeypatch.setenv('ASSET_LABELS', 'typed')
+    monkeypatch.setenv('GREMLIN_MULTI_LABELS', 'false')
+
+    with pytest.raises(ValueError, match='multi-label'):
+        create_app()
+
+
 def test_datetime_validation(flask_cli):
     """Tests the validation of date-time fields."""
 
@@ -113,3 +153,14 @@ def test_datetime_timezone(flask_cli):
     assert resp_data['first_seen'] == '2021-07-01T01:00:00+00:00'
     assert resp_data['last_seen'] == '2021-07-01T01:00:00+00:00'
     assert resp_data['expiration'] == '2021-07-07T01:00:00+00:00'
+
+
+def test_resp_dict():
+    """Tests that the fields of the slotted ``*Resp`` objects are returned by
+    their ``__dict__`` property."""
+    resp = TeamResp('vid', 'identifier', 'name')
+    assert resp.__dict__ == {
+        'id': 'vid',
+        'identifier': 'identifier',
+        'name': 'name',
+    }
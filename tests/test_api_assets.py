@@ -7,7 +7,7 @@ from datetime import datetime
 from helpers import compare_unsorted_list
 
 from graph_asset_inventory_api.inventory import AssetID
-from graph_asset_inventory_api.api import AssetReq
+from graph_asset_inventory_api.api import AssetReq, ParentOfResp
 
 
 def test_get_assets(flask_cli, init_api_assets):
@@ -20,6 +20,49 @@ def test_get_assets(flask_cli, init_api_assets):
     assert compare_unsorted_list(data, init_api_assets, lambda x: x['id'])
 
 
+def test_get_assets_ndjson(flask_cli, init_api_assets):
+    """Tests that the API endpoint ``GET /v1/assets`` streams the assets as a
+    NDJSON document if the client prefers it."""
+    resp = flask_cli.get(
+        '/v1/assets', headers={'Accept': 'application/x-ndjson'})
+
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/x-ndjson'
+
+    data = [json.loads(line) for line in resp.data.splitlines()]
+    assert compare_unsorted_list(data, init_api_assets, lambda x: x['id'])
+
+
+def test_get_assets_empty(flask_cli):
+    """Tests the API endpoint ``GET /v1/assets`` when there are no assets."""
+    resp = flask_cli.get('/v1/assets')
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == []
+
+
+def test_get_assets_fields(flask_cli, init_api_assets):
+    """Tests the API endpoint ``GET /v1/assets`` when only some fields are
+    requested."""
+    resp = flask_cli.get('/v1/assets?fields=type,last_seen')
+
+    assert resp.status_code == 200
+
+    data = json.loads(resp.data)
+    want = [
+        {'id': a['id'], 'type': a['type'], 'last_seen': a['last_seen']}
+        for a in init_api_assets
+    ]
+    assert compare_unsorted_list(data, want, lambda x: x['id'])
+
+
+def test_get_assets_unknown_fields(flask_cli):
+    """Tests the API endpoint ``GET /v1/assets`` when an unknown field is
+    requested."""
+    resp = flask_cli.get('/v1/assets?fields=type,name')
+    assert resp.status_code == 400
+
+
 def test_get_assets_pagination(flask_cli, init_api_assets):
     """Tests the API endpoint ``GET /v1/assets`` with pagination."""
     resp = flask_cli.get('/v1/assets?page=1&size=2')
@@ -108,6 +151,61 @@ def test_get_assets_by_valid_at(flask_cli, init_valid_at_api_assets):
     assert compare_unsorted_list(data, expected, lambda x: x['id'])
 
 
+def test_post_assets_lookup_ids(flask_cli, init_api_assets, unknown_uuid):
+    """Tests the API endpoint ``POST /v1/assets/lookup`` with vertex IDs."""
+    ids = [init_api_assets[1]['id'], unknown_uuid, init_api_assets[0]['id']]
+
+    resp = flask_cli.post(
+        '/v1/assets/lookup',
+        data=json.dumps({'ids': ids}),
+        content_type='application/json',
+    )
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == [
+        init_api_assets[1], None, init_api_assets[0]]
+
+
+def test_post_assets_lookup_asset_ids(flask_cli, init_api_assets):
+    """Tests the API endpoint ``POST /v1/assets/lookup`` with types and
+    identifiers."""
+    asset_ids = [
+        {'type': 'type1', 'identifier': 'identifier0'},
+        {'type': 'type1337', 'identifier': 'identifier0'},
+        {'type': 'type0', 'identifier': 'identifier1'},
+    ]
+
+    resp = flask_cli.post(
+        '/v1/assets/lookup',
+        data=json.dumps({'asset_ids': asset_ids}),
+        content_type='application/json',
+    )
+
+    assert resp.status_code == 200
+
+    def find(asset_id):
+        for asset in init_api_assets:
+            if asset['type'] == asset_id['type'] and \
+                    asset['identifier'] == asset_id['identifier']:
+                return asset
+        return None
+
+    assert json.loads(resp.data) == [find(a) for a in asset_ids]
+    assert json.loads(resp.data)[1] is None
+
+
+def test_post_assets_lookup_bad_request(flask_cli, init_api_assets):
+    """Tests that the API endpoint ``POST /v1/assets/lookup`` requires exactly
+    one of ``ids`` and ``asset_ids``."""
+    for body in [{}, {'ids': [init_api_assets[0]['id']], 'asset_ids': []}]:
+        resp = flask_cli.post(
+            '/v1/assets/lookup',
+            data=json.dumps(body),
+            content_type='application/json',
+        )
+        assert resp.status_code == 400
+
+
 def test_post_assets(flask_cli, init_api_assets):
     """Tests the API endpoint ``POST /v1/assets``."""
     asset_id = AssetID('new_type', 'new_identifier')
@@ -223,6 +321,53 @@ def test_get_assets_id_not_found_error(flask_cli):
     assert resp.status_code == 404
 
 
+def test_get_assets_id_subgraph(flask_cli, init_api_assets, init_lineage):
+    """Tests the API endpoint ``GET /v1/assets/{id}/subgraph``."""
+    asset_id = init_api_assets[2]['id']
+    resp = flask_cli.get(f'/v1/assets/{asset_id}/subgraph')
+
+    assert resp.status_code == 200
+
+    data = json.loads(resp.data)
+    assert data['teams'] == []
+    assert data['owns'] == []
+    assert not data['truncated']
+    assert compare_unsorted_list(
+        data['assets'], init_api_assets[:3], lambda x: x['id'])
+    assert compare_unsorted_list(
+        data['parent_of'],
+        [
+            ParentOfResp.from_dbparentof(init_lineage[k]).__dict__
+            for k in [(0, 1), (1, 2), (2, 0)]
+        ],
+        lambda x: x['id'],
+    )
+
+
+def test_get_assets_id_subgraph_truncated(
+        flask_cli, init_api_assets, init_lineage):
+    """Tests the API endpoint ``GET /v1/assets/{id}/subgraph`` when the
+    neighborhood of the asset has more vertices than ``max_nodes``."""
+    # pylint: disable=unused-argument
+    asset_id = init_api_assets[2]['id']
+    resp = flask_cli.get(
+        f'/v1/assets/{asset_id}/subgraph?depth=2&max_nodes=2')
+
+    assert resp.status_code == 200
+
+    data = json.loads(resp.data)
+    assert data['truncated']
+    assert len(data['assets']) == 2
+
+
+def test_get_assets_id_subgraph_not_found_error(flask_cli):
+    """Tests the API endpoint ``GET /v1/assets/{id}/subgraph`` with an unknown
+    id."""
+    resp = flask_cli.get('/v1/assets/13371337/subgraph')
+
+    assert resp.status_code == 404
+
+
 def test_delete_assets_id(flask_cli, init_api_assets):
     """Tests the API endpoint ``DELETE /v1/assets/{id}``."""
     asset_id = init_api_assets[2]['id']
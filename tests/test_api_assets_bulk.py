@@ -1,9 +1,25 @@
 """Tests for the Asset Inventory API."""
 
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 
-from graph_asset_inventory_api.inventory import AssetID
+import pytest
+
+from conftest import (
+    get_gremlin_endpoint,
+    get_auth_mode,
+)
+
+from graph_asset_inventory_api.inventory import (
+    AssetID,
+    ParentOf,
+    BatchItem,
+)
+from graph_asset_inventory_api.inventory.pool import (
+    InventoryClientPool,
+    PoolExhaustedError,
+)
+from graph_asset_inventory_api.api.assets_bulk import ApiBulkAssetInsert
 
 
 # pylint: disable=too-many-locals
@@ -230,3 +246,243 @@ def test_post_assets_bulk_bad_request_error(flask_cli):
         content_type='application/json',
     )
     assert resp.status_code == 400
+
+
+def test_api_bulk_asset_insert_chunks(cli):
+    """Tests that ``ApiBulkAssetInsert`` creates all the assets when they are
+    sent to the graph in several chunks."""
+    assets_req = [
+        {
+            'type': 'type0',
+            'identifier': f'identifier{i}',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+        }
+        for i in range(5)
+    ]
+    assets_req[4]['parents'] = [
+        {
+            'type': 'type0',
+            'identifier': 'identifier0',
+            'expiration': '2021-07-17T01:00:00+00:00',
+            'timestamp': '2021-07-11T01:00:00+00:00',
+        },
+    ]
+
+    bulk = ApiBulkAssetInsert(cli, chunk_size=2)
+    bulk.insert(assets_req)
+
+    assets = cli.assets()
+    assert len(assets) == len(assets_req)
+
+    for asset in assets:
+        assert bulk.cache[asset.asset_id] == asset.vid
+
+    child = cli.asset_id(AssetID('type0', 'identifier4'))
+    parents = cli.parents(child.vid)
+    assert len(parents) == 1
+    assert parents[0].parent_vid == bulk.cache[AssetID('type0', 'identifier0')]
+
+
+def test_api_bulk_asset_insert_duplicates(cli):
+    """Tests that ``ApiBulkAssetInsert`` merges the assets and relationships
+    that appear several times in the request."""
+    assets_req = [
+        {
+            'type': 'type0',
+            'identifier': 'identifier0',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+            'parents': [
+                {
+                    'type': 'type1',
+                    'identifier': 'identifier1',
+                    'expiration': '2021-07-17T01:00:00+00:00',
+                    'timestamp': '2021-07-11T01:00:00+00:00',
+                },
+            ],
+        },
+        {
+            'type': 'type1',
+            'identifier': 'identifier1',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+        },
+        {
+            'type': 'type0',
+            'identifier': 'identifier0',
+            'expiration': '2021-08-07T01:00:00+00:00',
+            'timestamp': '2021-08-01T01:00:00+00:00',
+            'parents': [
+                {
+                    'type': 'type1',
+                    'identifier': 'identifier1',
+                    'expiration': '2021-06-17T01:00:00+00:00',
+                    'timestamp': '2021-06-11T01:00:00+00:00',
+                },
+            ],
+        },
+        {
+            'type': 'type0',
+            'identifier': 'identifier0',
+            'expiration': '2021-06-07T01:00:00+00:00',
+            'timestamp': '2021-06-01T01:00:00+00:00',
+        },
+    ]
+
+    ApiBulkAssetInsert(cli).insert(assets_req)
+
+    assets = cli.assets()
+    assert len(assets) == 2
+
+    child = cli.asset_id(AssetID('type0', 'identifier0'))
+    assert child.time_attr.first_seen == \
+        datetime.fromisoformat('2021-06-01T01:00:00+00:00')
+    assert child.time_attr.last_seen == \
+        datetime.fromisoformat('2021-08-01T01:00:00+00:00')
+    assert child.time_attr.expiration == \
+        datetime.fromisoformat('2021-08-07T01:00:00+00:00')
+
+    parents = cli.parents(child.vid)
+    assert len(parents) == 1
+    assert parents[0].time_attr.first_seen == \
+        datetime.fromisoformat('2021-06-11T01:00:00+00:00')
+    assert parents[0].time_attr.last_seen == \
+        datetime.fromisoformat('2021-07-11T01:00:00+00:00')
+    assert parents[0].time_attr.expiration == \
+        datetime.fromisoformat('2021-07-17T01:00:00+00:00')
+
+
+def test_api_bulk_asset_insert_parallel(cli):
+    """Tests that ``ApiBulkAssetInsert`` creates all the assets and
+    relationships when the chunks are processed in parallel, even if the same
+    asset appears several times in the request."""
+    assets_req = [
+        {
+            'type': 'type0',
+            'identifier': f'identifier{i % 8}',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+            'parents': [
+                {
+                    'type': 'type1',
+                    'identifier': 'identifier0',
+                    'expiration': '2021-07-17T01:00:00+00:00',
+                    'timestamp': '2021-07-11T01:00:00+00:00',
+                },
+            ],
+        }
+        for i in range(16)
+    ]
+    assets_req.append({
+        'type': 'type1',
+        'identifier': 'identifier0',
+        'expiration': '2021-07-07T01:00:00+00:00',
+        'timestamp': '2021-07-01T01:00:00+00:00',
+    })
+
+    pool = InventoryClientPool(get_gremlin_endpoint(), get_auth_mode(), 3)
+    pool.open()
+
+    bulk = ApiBulkAssetInsert(cli, chunk_size=2, concurrency=3, pool=pool)
+    bulk.insert(assets_req)
+
+    stats = pool.stats()
+    pool.close()
+
+    assert stats['in_use'] == 0
+
+    assets = cli.assets()
+    assert len(assets) == 9
+
+    for asset in assets:
+        assert bulk.cache[asset.asset_id] == asset.vid
+
+    parent_vid = bulk.cache[AssetID('type1', 'identifier0')]
+    children = cli.children(parent_vid)
+    assert len(children) == 8
+
+
+def test_api_bulk_asset_insert_parallel_pool_exhausted(g, universe):
+    """Tests that the parallel mode of ``ApiBulkAssetInsert`` processes a
+    partition with the client it holds and does not wait forever for the
+    clients of the pool held by other bulk inserts."""
+    # pylint: disable=unused-argument
+    assets_req = [
+        {
+            'type': 'type0',
+            'identifier': f'identifier{i}',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+        }
+        for i in range(16)
+    ]
+
+    pool = InventoryClientPool(get_gremlin_endpoint(), get_auth_mode(), 2)
+    pool.open()
+    clis = [pool.acquire(), pool.acquire()]
+
+    try:
+        # Every bulk insert holds one of the clients of the pool, like the
+        # requests do.
+        for cli in clis:
+            bulk = ApiBulkAssetInsert(
+                cli, concurrency=2, pool=pool, acquire_timeout=0.1)
+            with pytest.raises(PoolExhaustedError):
+                bulk.insert(assets_req)
+
+        # Once the other client is released, the bulk insert can acquire it.
+        pool.release(clis.pop())
+        bulk = ApiBulkAssetInsert(
+            clis[0], concurrency=2, pool=pool, acquire_timeout=0.1)
+        bulk.insert(assets_req)
+        assert len(clis[0].assets()) == 16
+    finally:
+        for cli in clis:
+            pool.release(cli)
+        pool.close()
+
+
+class _PartitionRecorder(ApiBulkAssetInsert):
+    """Bulk insert that records the partitions instead of processing them."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.partitions = []
+
+    def _run(self, func, partitions):  # pylint: disable=unused-argument
+        self.partitions.append(partitions)
+        return []
+
+
+def test_api_bulk_asset_insert_partition_parentofs(cli):
+    """Tests that the parallel mode of ``ApiBulkAssetInsert`` puts all the
+    relationships of the same child in the same partition, so the child is
+    not linked to its parents by two threads at the same time."""
+    now = datetime.now(timezone.utc)
+    parentofs = [
+        BatchItem(ParentOf(f'parent{i}', f'child{i % 3}'), now, now)
+        for i in range(30)
+    ]
+
+    bulk = _PartitionRecorder(cli, concurrency=4, pool=object())
+    bulk._set_parents(parentofs)  # pylint: disable=protected-access
+
+    assert len(bulk.partitions) == 1
+    partitions = bulk.partitions[0]
+    assert sum(len(p) for p in partitions) == len(parentofs)
+    for child_vid in ('child0', 'child1', 'child2'):
+        assert len([
+            p for p in partitions
+            if any(item.element.child_vid == child_vid for item in p)
+        ]) == 1
+
+
+def test_api_bulk_asset_insert_wrong_concurrency(cli):
+    """Tests that the parallel mode of ``ApiBulkAssetInsert`` requires a valid
+    concurrency and a pool of clients."""
+    with pytest.raises(ValueError):
+        ApiBulkAssetInsert(cli, concurrency=0)
+
+    with pytest.raises(ValueError):
+        ApiBulkAssetInsert(cli, concurrency=2)
@@ -0,0 +1,207 @@
+"""Tests for the streaming bulk endpoint of the Asset Inventory API."""
+
+import io
+import json
+
+import pytest
+
+from graph_asset_inventory_api.inventory import AssetID
+from graph_asset_inventory_api.api.assets_bulk_stream import (
+    ApiBulkAssetStreamInsert,
+    LRUCache,
+)
+
+
+def ndjson(lines):
+    """Returns the NDJSON document with the objects in ``lines``."""
+    return '\n'.join(json.dumps(line) for line in lines) + '\n'
+
+
+def parse_ndjson(data):
+    """Returns the list of objects of the NDJSON document ``data``."""
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def test_post_assets_bulk_stream(flask_cli, cli):
+    """Tests the API endpoint ``POST /v1/assets/bulk/stream``."""
+    lines = [
+        {
+            'type': 'type0',
+            'identifier': 'identifier0',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+            'parents': [
+                {
+                    'type': 'type1',
+                    'identifier': 'identifier1',
+                    'expiration': '2021-07-17T01:00:00+00:00',
+                    'timestamp': '2021-07-11T01:00:00+00:00',
+                },
+            ],
+        },
+        {
+            'type': 'type1',
+            'identifier': 'identifier1',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+        },
+    ]
+
+    resp = flask_cli.post(
+        '/v1/assets/bulk/stream',
+        data=ndjson(lines),
+        content_type='application/x-ndjson',
+    )
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/x-ndjson'
+    assert parse_ndjson(resp.data) == [
+        {'line': 1, 'status': 204},
+        {'line': 2, 'status': 204},
+    ]
+
+    assets = cli.assets()
+    assert len(assets) == 2
+
+    child = cli.asset_id(AssetID('type0', 'identifier0'))
+    parent = cli.asset_id(AssetID('type1', 'identifier1'))
+    parents = cli.parents(child.vid)
+    assert len(parents) == 1
+    assert parents[0].parent_vid == parent.vid
+
+
+def test_post_assets_bulk_stream_line_errors(flask_cli, cli):
+    """Tests that the API endpoint ``POST /v1/assets/bulk/stream`` reports the
+    lines that could not be inserted without failing the rest."""
+    data = '\n'.join([
+        json.dumps({
+            'type': 'type0',
+            'identifier': 'identifier0',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+        }),
+        '',
+        '{invalid json',
+        json.dumps({
+            'identifier': 'identifier1',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+        }),
+        json.dumps({
+            'type': 'type4',
+            'identifier': 'identifier4',
+            'expiration': '2021-07-07T01:00:00+00:00',
+        }),
+        json.dumps({
+            'type': 'type2',
+            'identifier': 'identifier2',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+            'parents': [
+                {
+                    'type': 'type3',
+                    'identifier': 'identifier3',
+                    'expiration': '2021-07-17T01:00:00+00:00',
+                    'timestamp': '2021-07-11T01:00:00+00:00',
+                },
+            ],
+        }),
+    ])
+
+    resp = flask_cli.post(
+        '/v1/assets/bulk/stream',
+        data=data,
+        content_type='application/x-ndjson',
+    )
+    assert resp.status_code == 200
+
+    results = parse_ndjson(resp.data)
+    assert [(r['line'], r['status']) for r in results] == [
+        (1, 204),
+        (3, 400),
+        (4, 400),
+        (5, 400),
+        (6, 404),
+    ]
+    assert results[3]['detail'] == 'expiration before timestamp'
+    assert results[4]['detail'] == 'not found: type3-identifier3'
+
+    assets = cli.assets()
+    assert len(assets) == 2
+
+
+def test_post_assets_bulk_stream_content_type(flask_cli):
+    """Tests that the API endpoint ``POST /v1/assets/bulk/stream`` only
+    accepts NDJSON documents."""
+    resp = flask_cli.post('/v1/assets/bulk/stream', json={'assets': []})
+    assert resp.status_code == 415
+
+
+def test_post_assets_bulk_stream_stale_cache(flask_cli, cli):
+    """Tests that, if a cached parent is deleted between two batches, only the
+    lines with relationships to it fail."""
+    schema = flask_cli.application.config['BULK_STREAM_SCHEMA']
+    bulk = ApiBulkAssetStreamInsert(cli, schema)
+
+    def line(type_, identifier, parents=()):
+        return json.dumps({
+            'type': type_,
+            'identifier': identifier,
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'timestamp': '2021-07-01T01:00:00+00:00',
+            'parents': [
+                {
+                    'type': parent_type,
+                    'identifier': parent_identifier,
+                    'expiration': '2021-07-17T01:00:00+00:00',
+                    'timestamp': '2021-07-11T01:00:00+00:00',
+                }
+                for parent_type, parent_identifier in parents
+            ],
+        })
+
+    bulk.insert_stream([
+        line('type0', 'identifier0'),
+        line('type1', 'identifier1'),
+        line('type2', 'identifier2', [('type0', 'identifier0')]),
+        line('type3', 'identifier3', [('type1', 'identifier1')]),
+    ])
+    assert bulk.edges_done == 2
+
+    parent = cli.asset_id(AssetID('type0', 'identifier0'))
+    cli.drop_asset(parent.vid)
+
+    out = io.BytesIO()
+    bulk.insert_stream([
+        line('type4', 'identifier4', [('type0', 'identifier0')]),
+        line('type5', 'identifier5', [('type1', 'identifier1')]),
+        line('type6', 'identifier6'),
+    ], out)
+
+    results = parse_ndjson(out.getvalue())
+    assert results == [
+        {'line': 1, 'status': 404, 'detail': 'not found: type0-identifier0'},
+        {'line': 2, 'status': 204},
+        {'line': 3, 'status': 204},
+    ]
+    assert bulk.edges_done == 3
+
+    child = cli.asset_id(AssetID('type5', 'identifier5'))
+    parents = cli.parents(child.vid)
+    assert len(parents) == 1
+
+
+def test_lru_cache():
+    """Tests that ``LRUCache`` evicts the least recently used entry."""
+    cache = LRUCache(2)
+    cache.put('a', 0)
+    cache.put('b', 1)
+    assert cache.get('a') == 0
+
+    cache.put('c', 2)
+    assert len(cache) == 2
+    assert 'b' not in cache
+    assert cache.get('a') == 0
+    assert cache.get('c') == 2
+
+    with pytest.raises(ValueError):
+        LRUCache(0)
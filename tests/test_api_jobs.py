@@ -0,0 +1,296 @@
+"""Tests for the bulk jobs of the Asset Inventory API."""
+
+import os
+import json
+import time
+import uuid
+
+import pytest
+
+from conftest import (
+    get_gremlin_endpoint,
+    get_auth_mode,
+)
+
+from graph_asset_inventory_api.inventory import AssetID, NotFoundError
+from graph_asset_inventory_api.inventory.pool import (
+    InventoryClientPool,
+    PoolExhaustedError,
+)
+from graph_asset_inventory_api.jobs import (
+    BulkJobSpool,
+    BulkJobRunner,
+    JobSettings,
+    MAX_JOB_ERRORS,
+)
+
+
+ASSETS_REQ = [
+    {
+        'type': 'type0',
+        'identifier': 'identifier0',
+        'expiration': '2021-07-07T01:00:00+00:00',
+        'timestamp': '2021-07-01T01:00:00+00:00',
+        'parents': [
+            {
+                'type': 'type1',
+                'identifier': 'identifier1',
+                'expiration': '2021-07-17T01:00:00+00:00',
+                'timestamp': '2021-07-11T01:00:00+00:00',
+            },
+        ],
+    },
+    {
+        'type': 'type1',
+        'identifier': 'identifier1',
+        'expiration': '2021-07-07T01:00:00+00:00',
+        'timestamp': '2021-07-01T01:00:00+00:00',
+    },
+    {
+        'type': 'type2',
+        'identifier': 'identifier2',
+        'expiration': '2021-07-07T01:00:00+00:00',
+        'timestamp': '2021-07-01T01:00:00+00:00',
+        'parents': [
+            {
+                'type': 'type3',
+                'identifier': 'identifier3',
+                'expiration': '2021-07-17T01:00:00+00:00',
+                'timestamp': '2021-07-11T01:00:00+00:00',
+            },
+        ],
+    },
+]
+
+
+def wait_job(flask_cli, job_id, timeout=10):
+    """Polls the API endpoint ``GET /v1/jobs/{id}`` until the job is finished
+    and returns the last response."""
+    deadline = time.monotonic() + timeout
+    while True:
+        resp = flask_cli.get(f'/v1/jobs/{job_id}')
+        if resp.json['status'] in ('done', 'failed') or \
+                time.monotonic() > deadline:
+            return resp
+        time.sleep(0.1)
+
+
+def test_post_assets_bulk_jobs(flask_cli, cli):
+    """Tests the API endpoints ``POST /v1/assets/bulk/jobs`` and ``GET
+    /v1/jobs/{id}``."""
+    resp = flask_cli.post('/v1/assets/bulk/jobs', json={'assets': ASSETS_REQ})
+    assert resp.status_code == 202
+    assert resp.json['progress']['assets_total'] == 3
+
+    job_id = resp.json['id']
+    assert resp.headers['Location'].endswith(f'/v1/jobs/{job_id}')
+
+    resp = wait_job(flask_cli, job_id)
+    assert resp.status_code == 200
+    assert resp.json['id'] == job_id
+    assert resp.json['status'] == 'done'
+    assert resp.json['progress'] == {
+        'assets_total': 3,
+        'assets_done': 2,
+        'edges_done': 1,
+    }
+    assert resp.json['errors'] == [
+        {'line': 3, 'status': 404, 'detail': 'not found: type3-identifier3'},
+    ]
+    assert resp.json['errors_total'] == 1
+
+    assets = cli.assets()
+    assert len(assets) == 3
+
+    child = cli.asset_id(AssetID('type0', 'identifier0'))
+    parents = cli.parents(child.vid)
+    assert len(parents) == 1
+
+
+def test_get_jobs_id_not_found(flask_cli, unknown_uuid):
+    """Tests that the API endpoint ``GET /v1/jobs/{id}`` returns 404 if the
+    job does not exist."""
+    resp = flask_cli.get(f'/v1/jobs/{unknown_uuid}')
+    assert resp.status_code == 404
+
+
+def test_bulk_job_resume(cli, tmp_path, flask_cli):
+    """Tests that a job is resumed from its last checkpoint."""
+    schema = flask_cli.application.config['BULK_STREAM_SCHEMA']
+
+    spool = BulkJobSpool(str(tmp_path / 'resume'))
+    job_id = spool.create(ASSETS_REQ)
+    assert spool.unfinished() == [job_id]
+
+    # Simulate a process that stopped after processing the first asset and
+    # while writing the next checkpoint.
+    job_log = spool.open_log(job_id)
+    job_log.append({'line': 1, 'assets': 1, 'edges': 0, 'errors': []})
+    job_log.close()
+    with open(tmp_path / 'resume' / f'{job_id}.log', 'a',
+              encoding='utf-8') as f:
+        f.write('{"line": 2, "ass')
+
+    pool = InventoryClientPool(get_gremlin_endpoint(), get_auth_mode(), 2)
+    pool.open()
+
+    BulkJobRunner(spool, pool, JobSettings(schema, 10, 1)).process(job_id)
+
+    pool.close()
+
+    # The third asset failed, because its parent does not exist.
+    state = spool.state(job_id)
+    assert state['status'] == 'done'
+    assert state['assets_done'] == 2
+    assert spool.unfinished() == []
+
+    # The first asset was skipped.
+    assets = cli.assets()
+    assert len(assets) == 2
+
+
+def test_bulk_job_spool_create_timestamps(tmp_path):
+    """Tests that the missing timestamps are set when the job is created, so
+    they do not depend on when the job is processed."""
+    assets_req = [
+        {
+            'type': 'type0',
+            'identifier': 'identifier0',
+            'expiration': '2021-07-07T01:00:00+00:00',
+            'parents': [
+                {
+                    'type': 'type1',
+                    'identifier': 'identifier1',
+                    'expiration': '2021-07-17T01:00:00+00:00',
+                    'timestamp': '2021-07-11T01:00:00+00:00',
+                },
+            ],
+        },
+    ]
+
+    spool = BulkJobSpool(str(tmp_path / 'timestamps'))
+    job_id = spool.create(assets_req)
+
+    with spool.open_payload(job_id) as payload:
+        stored = [json.loads(line) for line in payload]
+
+    assert len(stored) == 1
+    assert 'timestamp' in stored[0]
+    assert stored[0]['parents'][0]['timestamp'] == \
+        '2021-07-11T01:00:00+00:00'
+
+    # The request is not modified.
+    assert 'timestamp' not in assets_req[0]
+
+
+def test_bulk_job_errors_limit(tmp_path):
+    """Tests that only the first ``MAX_JOB_ERRORS`` errors of a job are kept
+    in its state, along with the total number of errors."""
+    spool = BulkJobSpool(str(tmp_path / 'errors'))
+    job_id = spool.create(ASSETS_REQ)
+
+    errors = [
+        {'line': i, 'status': 400, 'detail': 'invalid'}
+        for i in range(1, MAX_JOB_ERRORS + 11)
+    ]
+    job_log = spool.open_log(job_id)
+    job_log.append({'line': 1, 'assets': 1, 'edges': 0, 'errors': errors})
+    job_log.append({'line': 2, 'assets': 1, 'edges': 0, 'errors': errors})
+    job_log.close()
+
+    state = spool.state(job_id)
+    assert state['errors'] == errors[:MAX_JOB_ERRORS]
+    assert state['errors_total'] == 2 * len(errors)
+
+
+class _FlakyPool(InventoryClientPool):
+    """Pool that fails to hand out a client the first ``failures`` times."""
+
+    def __init__(self, failures, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures = failures
+
+    def acquire(self, timeout=None):
+        if self.failures > 0:
+            self.failures -= 1
+            raise PoolExhaustedError('no client available')
+        return super().acquire(timeout)
+
+
+def test_bulk_job_retry(cli, tmp_path, flask_cli):
+    """Tests that a job that fails with a transient error is retried."""
+    schema = flask_cli.application.config['BULK_STREAM_SCHEMA']
+
+    spool = BulkJobSpool(str(tmp_path / 'retry'))
+    job_id = spool.create(ASSETS_REQ)
+
+    pool = _FlakyPool(2, get_gremlin_endpoint(), get_auth_mode(), 2)
+    pool.open()
+
+    settings = JobSettings(schema, 10, 1, retries=2, retry_delay=0)
+    BulkJobRunner(spool, pool, settings).process(job_id)
+
+    pool.close()
+
+    state = spool.state(job_id)
+    assert state['status'] == 'done'
+    assert state['assets_done'] == 2
+
+    assets = cli.assets()
+    assert len(assets) == 3
+
+
+def test_bulk_job_retry_exhausted(tmp_path, flask_cli):
+    """Tests that a job is marked as failed when it keeps failing after all
+    the retries."""
+    schema = flask_cli.application.config['BULK_STREAM_SCHEMA']
+
+    spool = BulkJobSpool(str(tmp_path / 'exhausted'))
+    job_id = spool.create(ASSETS_REQ)
+
+    pool = _FlakyPool(3, get_gremlin_endpoint(), get_auth_mode(), 2)
+    pool.open()
+
+    settings = JobSettings(schema, 10, 1, retries=2, retry_delay=0)
+    with pytest.raises(PoolExhaustedError):
+        BulkJobRunner(spool, pool, settings).process(job_id)
+
+    pool.close()
+
+    state = spool.state(job_id)
+    assert state['status'] == 'failed'
+    assert spool.unfinished() == []
+
+
+def test_bulk_job_spool_prune(tmp_path):
+    """Tests that only the jobs that finished more than ``retention`` seconds
+    ago, and the jobs whose creation was interrupted, are pruned."""
+    spool = BulkJobSpool(str(tmp_path / 'prune'))
+    done_id = spool.create(ASSETS_REQ)
+    failed_id = spool.create(ASSETS_REQ)
+    pending_id = spool.create(ASSETS_REQ)
+
+    job_log = spool.open_log(done_id)
+    job_log.append({'done': True})
+    job_log.close()
+    job_log = spool.open_log(failed_id)
+    job_log.append({'failed': 'error'})
+    job_log.close()
+
+    # Simulate a process that stopped while creating a job.
+    tmp_id = str(uuid.uuid4())
+    (tmp_path / 'prune' / f'{tmp_id}.log').write_text('{}\n')
+    (tmp_path / 'prune' / f'{tmp_id}.ndjson.tmp').write_text('{}\n')
+
+    assert spool.prune(3600) == []
+
+    pruned = spool.prune(-1)
+    assert sorted(pruned) == sorted([done_id, failed_id, tmp_id])
+    assert sorted(os.listdir(tmp_path / 'prune')) == [
+        f'{pending_id}.log',
+        f'{pending_id}.ndjson',
+    ]
+
+    with pytest.raises(NotFoundError):
+        spool.state(done_id)
+    assert spool.unfinished() == [pending_id]
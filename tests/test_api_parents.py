@@ -5,7 +5,7 @@ from datetime import datetime
 
 from helpers import compare_unsorted_list
 
-from graph_asset_inventory_api.api import ParentOfReq
+from graph_asset_inventory_api.api import ParentOfReq, ParentOfResp
 
 
 def test_get_assets_id_parents(flask_cli, init_api_parents):
@@ -20,6 +20,22 @@ def test_get_assets_id_parents(flask_cli, init_api_parents):
         assert compare_unsorted_list(data, parents, lambda x: x['id'])
 
 
+def test_get_assets_id_parents_fields(flask_cli, init_api_parents):
+    """Tests the API endpoint ``GET /v1/assets/{id}/parents`` when only some
+    fields are requested."""
+    for child_id, parents in init_api_parents.items():
+        resp = flask_cli.get(
+            f'/v1/assets/{child_id}/parents?fields=parent_id')
+
+        assert resp.status_code == 200
+
+        data = json.loads(resp.data)
+        want = [
+            {'id': p['id'], 'parent_id': p['parent_id']} for p in parents
+        ]
+        assert compare_unsorted_list(data, want, lambda x: x['id'])
+
+
 def test_get_assets_id_parents_pagination(flask_cli, init_api_parents):
     """Tests the API endpoint ``GET /v1/assets/{id}/parents`` with
     pagination."""
@@ -53,6 +69,27 @@ def test_get_assets_id_parents_pagination_missing_size(
         data, init_api_parents[child], lambda x: x['id'])
 
 
+def test_get_assets_id_parents_cursor(flask_cli, init_api_parents):
+    """Tests the API endpoint ``GET /v1/assets/{id}/parents`` with cursor
+    pagination."""
+    child = list(init_api_parents)[0]
+    child_id = init_api_parents[child][0]['child_id']
+
+    resp = flask_cli.get(f'/v1/assets/{child_id}/parents?page=0&size=3')
+    data = json.loads(resp.data)
+    cursor = resp.headers['X-Next-Cursor']
+
+    while cursor is not None:
+        resp = flask_cli.get(
+            f'/v1/assets/{child_id}/parents?cursor={cursor}&size=3')
+        assert resp.status_code == 200
+        data += json.loads(resp.data)
+        cursor = resp.headers.get('X-Next-Cursor')
+
+    assert compare_unsorted_list(
+        data, init_api_parents[child], lambda x: x['id'])
+
+
 def test_get_assets_id_parents_not_found_error(flask_cli):
     """Tests the API endpoint ``GET /v1/assets/{id}/parents``."""
 
@@ -241,3 +278,59 @@ def test_get_assets_id_children(flask_cli, init_api_children):
 
         data = json.loads(resp.data)
         assert compare_unsorted_list(data, children, lambda x: x['id'])
+
+
+def test_get_assets_id_ancestors(flask_cli, init_lineage):
+    """Tests the API endpoint ``GET /v1/assets/{id}/ancestors``."""
+    vid = init_lineage[(1, 2)].child_vid
+    api_lineage = {
+        k: ParentOfResp.from_dbparentof(v).__dict__
+        for k, v in init_lineage.items()
+    }
+
+    resp = flask_cli.get(f'/v1/assets/{vid}/ancestors')
+
+    assert resp.status_code == 200
+
+    data = json.loads(resp.data)
+    assert compare_unsorted_list(
+        data, list(api_lineage.values()), lambda x: x['id'])
+
+    resp = flask_cli.get(
+        f'/v1/assets/{vid}/ancestors?max_depth=2'
+        '&valid_at=2021-07-05T01:00:00Z')
+
+    assert resp.status_code == 200
+
+    data = json.loads(resp.data)
+    assert compare_unsorted_list(
+        data, [api_lineage[(1, 2)], api_lineage[(0, 1)]], lambda x: x['id'])
+
+
+def test_get_assets_id_descendants(flask_cli, init_lineage):
+    """Tests the API endpoint ``GET /v1/assets/{id}/descendants``."""
+    vid = init_lineage[(2, 0)].child_vid
+
+    resp = flask_cli.get(f'/v1/assets/{vid}/descendants?max_depth=1')
+
+    assert resp.status_code == 200
+
+    data = json.loads(resp.data)
+    assert data == [
+        ParentOfResp.from_dbparentof(init_lineage[(0, 1)]).__dict__,
+    ]
+
+
+def test_get_assets_id_descendants_not_found_error(flask_cli, unknown_uuid):
+    """Tests the API endpoint ``GET /v1/assets/{id}/descendants`` when the
+    asset does not exist."""
+    resp = flask_cli.get(f'/v1/assets/{unknown_uuid}/descendants')
+    assert resp.status_code == 404
+
+
+def test_get_assets_id_ancestors_max_depth_too_big(flask_cli, init_lineage):
+    """Tests the API endpoint ``GET /v1/assets/{id}/ancestors`` when the
+    requested depth is over the allowed maximum."""
+    vid = init_lineage[(1, 2)].child_vid
+    resp = flask_cli.get(f'/v1/assets/{vid}/ancestors?max_depth=21')
+    assert resp.status_code == 400
@@ -0,0 +1,96 @@
+"""Tests for the serializers of the Asset Inventory API."""
+
+from datetime import datetime
+
+import pytest
+from gremlin_python.process.traversal import T, Direction
+
+from graph_asset_inventory_api.inventory import (
+    DbAsset,
+    DbOwns,
+    DbParentOf,
+    DbTeam,
+    InventoryError,
+)
+from graph_asset_inventory_api.api import (
+    AssetResp,
+    OwnsResp,
+    ParentOfResp,
+    TeamResp,
+)
+from graph_asset_inventory_api.api.serializers import (
+    asset_dict,
+    owns_dict,
+    parent_of_dict,
+    serializer,
+    team_dict,
+)
+
+
+VTEAM = {
+    T.id: 'vid0',
+    T.label: 'Team',
+    'identifier': 'identifier0',
+    'name': 'name0',
+}
+
+VASSET = {
+    T.id: 'vid0',
+    T.label: 'Asset',
+    'type': 'type0',
+    'identifier': 'identifier0',
+    'first_seen': datetime(2021, 7, 1, 1, 0, 0, 123),
+    'last_seen': datetime(2021, 7, 7, 1),
+    'expiration': datetime(2021, 7, 14, 1),
+}
+
+EPARENTOF = {
+    T.id: 'eid0',
+    T.label: 'parent_of',
+    Direction.OUT: {T.id: 'vid0', T.label: 'Asset'},
+    Direction.IN: {T.id: 'vid1', T.label: 'Asset'},
+    'first_seen': datetime(2021, 7, 1, 1),
+    'last_seen': datetime(2021, 7, 7, 1),
+    'expiration': datetime(2021, 7, 14, 1),
+}
+
+EOWNS = {
+    T.id: 'eid0',
+    T.label: 'owns',
+    Direction.OUT: {T.id: 'vid0', T.label: 'Team'},
+    Direction.IN: {T.id: 'vid1', T.label: 'Asset'},
+    'start_time': datetime(2021, 7, 1, 1),
+}
+
+
+@pytest.mark.parametrize('trusted', [False, True])
+def test_serializers(trusted):
+    """Tests that the serializers return the same dicts as the ``*Resp``
+    objects."""
+    assert serializer(team_dict, trusted)(VTEAM) == \
+        TeamResp.from_dbteam(DbTeam.from_vteam(VTEAM)).__dict__
+    assert serializer(asset_dict, trusted)(VASSET) == \
+        AssetResp.from_dbasset(DbAsset.from_vasset(VASSET)).__dict__
+    assert serializer(parent_of_dict, trusted)(EPARENTOF) == \
+        ParentOfResp.from_dbparentof(
+            DbParentOf.from_eparentof(EPARENTOF)).__dict__
+    assert serializer(owns_dict, trusted)(EOWNS) == \
+        OwnsResp.from_dbowns(DbOwns.from_eowns(EOWNS)).__dict__
+
+    eowns = {**EOWNS, 'end_time': datetime(2021, 7, 7, 1)}
+    assert serializer(owns_dict, trusted)(eowns) == \
+        OwnsResp.from_dbowns(DbOwns.from_eowns(eowns)).__dict__
+
+
+def test_serializer_validation():
+    """Tests that the elements are only validated if the graph is not
+    trusted."""
+    vasset = {**VASSET, 'first_seen': '2021-07-01T01:00:00'}
+
+    with pytest.raises(InventoryError):
+        serializer(asset_dict)(vasset)
+    with pytest.raises(InventoryError):
+        serializer(team_dict)({**VTEAM, T.label: 'Asset'})
+
+    assert serializer(asset_dict, True)(
+        {**VASSET, 'type': 0})['type'] == 0
@@ -16,6 +16,17 @@ def test_get_teams(flask_cli, init_api_teams):
         data, init_api_teams, lambda x: x['id'])
 
 
+def test_get_teams_ndjson(flask_cli, init_api_teams):
+    """Tests that the API endpoint ``GET /v1/teams`` streams the teams as a
+    NDJSON document if the client prefers it."""
+    resp = flask_cli.get(
+        '/v1/teams', headers={'Accept': 'application/x-ndjson'})
+    assert resp.mimetype == 'application/x-ndjson'
+
+    data = [json.loads(line) for line in resp.data.splitlines()]
+    assert compare_unsorted_list(data, init_api_teams, lambda x: x['id'])
+
+
 def test_get_teams_pagination(flask_cli, init_api_teams):
     """Tests the API endpoint ``GET /v1/teams`` with pagination."""
     resp = flask_cli.get('/v1/teams?page=1&size=2')
@@ -32,6 +43,49 @@ def test_get_teams_pagination_missing_size(flask_cli, init_api_teams):
     assert compare_unsorted_list(data, init_api_teams, lambda x: x['id'])
 
 
+def test_get_teams_cursor(flask_cli, init_api_teams):
+    """Tests the API endpoint ``GET /v1/teams`` with cursor pagination."""
+    resp = flask_cli.get('/v1/teams?page=0&size=2')
+    data = json.loads(resp.data)
+    cursor = resp.headers['X-Next-Cursor']
+
+    while cursor is not None:
+        resp = flask_cli.get(f'/v1/teams?cursor={cursor}&size=2')
+        assert resp.status_code == 200
+        page = json.loads(resp.data)
+        assert len(page) <= 2
+        data += page
+        cursor = resp.headers.get('X-Next-Cursor')
+
+    assert compare_unsorted_list(data, init_api_teams, lambda x: x['id'])
+
+
+def test_get_teams_cursor_not_paginated(flask_cli, init_api_teams):
+    """Tests that the API endpoint ``GET /v1/teams`` does not return a cursor
+    when the request is not paginated."""
+    resp = flask_cli.get('/v1/teams')
+    assert len(json.loads(resp.data)) == len(init_api_teams)
+    assert 'X-Next-Cursor' not in resp.headers
+
+
+def test_get_teams_invalid_cursor(flask_cli):
+    """Tests the API endpoint ``GET /v1/teams`` with an invalid cursor."""
+    resp = flask_cli.get('/v1/teams?cursor=invalid')
+    assert resp.status_code == 400
+
+
+def test_get_teams_fields(flask_cli, init_api_teams):
+    """Tests the API endpoint ``GET /v1/teams`` with pagination when only some
+    fields are requested."""
+    resp = flask_cli.get('/v1/teams?page=0&size=100&fields=name')
+
+    assert resp.status_code == 200
+
+    data = json.loads(resp.data)
+    want = [{'id': t['id'], 'name': t['name']} for t in init_api_teams]
+    assert compare_unsorted_list(data, want, lambda x: x['id'])
+
+
 def test_get_teams_by_identifier(flask_cli, init_api_teams):
     """Tests the API endpoint ``GET /v1/teams`` filtering by a concrete team
     identifier."""
@@ -61,6 +115,30 @@ def test_get_teams_by_identifier_pagination(flask_cli, init_api_teams):
     assert compare_unsorted_list(data, expected, lambda x: x['id'])
 
 
+def test_post_teams_lookup(flask_cli, init_api_teams, unknown_uuid):
+    """Tests the API endpoint ``POST /v1/teams/lookup``."""
+    ids = [init_api_teams[2]['id'], unknown_uuid, init_api_teams[2]['id']]
+    resp = flask_cli.post(
+        '/v1/teams/lookup',
+        data=json.dumps({'ids': ids}),
+        content_type='application/json',
+    )
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == [
+        init_api_teams[2], None, init_api_teams[2]]
+
+    identifiers = ['identifier1337', init_api_teams[0]['identifier']]
+    resp = flask_cli.post(
+        '/v1/teams/lookup',
+        data=json.dumps({'identifiers': identifiers}),
+        content_type='application/json',
+    )
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == [None, init_api_teams[0]]
+
+
 def test_post_teams(flask_cli, init_api_teams):
     """Tests the API endpoint ``POST /v1/teams``."""
     team_req = TeamReq('new_identifier', 'new_name')
@@ -158,6 +236,41 @@ def test_get_teams_id_not_found_error(flask_cli):
     assert resp.status_code == 404
 
 
+def test_get_teams_id_assets(
+        flask_cli, init_api_teams, init_api_assets, init_owners):
+    """Tests the API endpoint ``GET /v1/teams/{id}/assets``."""
+    # pylint: disable=unused-argument
+    team_id = init_api_teams[1]['id']
+    resp = flask_cli.get(f'/v1/teams/{team_id}/assets')
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == [init_api_assets[0]]
+
+
+def test_get_teams_id_assets_active_at(
+        flask_cli, init_api_teams, init_api_assets, init_owners):
+    """Tests the API endpoint ``GET /v1/teams/{id}/assets`` with the
+    parameter ``active_at``."""
+    # pylint: disable=unused-argument
+    team_id = init_api_teams[1]['id']
+
+    active_at = urllib.parse.quote('2021-07-03T01:00:00+00:00')
+    resp = flask_cli.get(f'/v1/teams/{team_id}/assets?active_at={active_at}')
+    assert json.loads(resp.data) == [init_api_assets[0]]
+
+    active_at = urllib.parse.quote('2021-08-01T01:00:00+00:00')
+    resp = flask_cli.get(f'/v1/teams/{team_id}/assets?active_at={active_at}')
+    assert json.loads(resp.data) == []
+
+
+def test_get_teams_id_assets_not_found_error(flask_cli):
+    """Tests the API endpoint ``GET /v1/teams/{id}/assets`` with an unknown
+    id."""
+    resp = flask_cli.get('/v1/teams/13371337/assets')
+
+    assert resp.status_code == 404
+
+
 def test_delete_teams_id(flask_cli, init_api_teams):
     """Tests the API endpoint ``DELETE /v1/teams/{id}``."""
     team_id = init_api_teams[2]['id']
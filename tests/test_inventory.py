@@ -1,10 +1,22 @@
 """Tests for the ``inventory`` module."""
 
+from datetime import datetime, timezone
+
 import pytest
 
 from graph_asset_inventory_api.inventory import (
+    AssetID,
+    AssetTimeAttr,
+    Asset,
+    BatchItem,
+    DbAsset,
     NotFoundError,
     ConflictError,
+    CURRENT_UNIVERSE,
+)
+from graph_asset_inventory_api.inventory.universe import (
+    UniverseVersion,
+    Universe,
 )
 
 
@@ -19,6 +31,51 @@ def test_exception_NotFoundError():  # pylint: disable=invalid-name
     assert exc_info.value.name == 'identifier_1337'
 
 
+def test_asset_id_key():
+    """Tests the method ``key`` of the class ``AssetID``."""
+    universe = Universe(UniverseVersion('1.0.0'))
+    asset_id = AssetID('type0', 'identifier0')
+
+    assert asset_id.key(CURRENT_UNIVERSE) == \
+        AssetID('type0', 'identifier0').key(CURRENT_UNIVERSE)
+    assert asset_id.key(CURRENT_UNIVERSE) != asset_id.key(universe)
+    assert asset_id.key(CURRENT_UNIVERSE) != \
+        AssetID('type0', 'identifier1').key(CURRENT_UNIVERSE)
+
+    # The fields cannot be confused by concatenating them.
+    assert AssetID('a|b', 'c').key(CURRENT_UNIVERSE) != \
+        AssetID('a', 'b|c').key(CURRENT_UNIVERSE)
+
+
+def test_db_asset_slots():
+    """Tests that the ``DbAsset`` objects keep their fields in slots and are
+    compared by value."""
+    now = datetime.now(timezone.utc)
+    asset = DbAsset(AssetID('type', 'id'), 'vid', AssetTimeAttr(now, now, now))
+
+    assert not hasattr(asset, '__dict__')
+    assert not hasattr(asset.time_attr, '__dict__')
+    assert asset == DbAsset(
+        AssetID('type', 'id'), 'vid', AssetTimeAttr(now, now, now))
+    assert asset != DbAsset(
+        AssetID('type', 'id'), 'vid2', AssetTimeAttr(now, now, now))
+
+
+def test_batch_item():
+    """Tests that ``first_seen`` is optional in a ``BatchItem`` and that it
+    can be built from a plain tuple."""
+    now = datetime.now(timezone.utc)
+    asset = Asset(AssetID('type', 'id'))
+
+    item = BatchItem(asset, now, now)
+    assert item.first_seen is None
+    assert item == BatchItem(*(asset, now, now, None))
+    assert tuple(item) == (asset, now, now, None)
+
+    with pytest.raises(TypeError):
+        BatchItem(*(asset, now, now, now, now))
+
+
 def test_exception_ConflictError():  # pylint: disable=invalid-name
     """Tests the ConflictError exception."""
 
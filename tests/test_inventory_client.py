@@ -2,11 +2,19 @@
 
 # pylint: disable=too-many-lines
 
+import uuid
+import functools
 from datetime import datetime
 
 import pytest
+from gremlin_python.process.traversal import T
 
-from helpers import compare_unsorted_list
+from conftest import (
+    get_gremlin_endpoint,
+    get_auth_mode,
+    get_multi_labels,
+)
+from helpers import compare_unsorted_list, race
 
 from graph_asset_inventory_api.inventory.client import InventoryClient
 from graph_asset_inventory_api.inventory import (
@@ -15,15 +23,24 @@ from graph_asset_inventory_api.inventory import (
     Team,
     ParentOf,
     Owns,
+    DbSubgraph,
     NotFoundError,
     ConflictError,
+    InventoryError,
     CURRENT_UNIVERSE
 )
+from graph_asset_inventory_api.inventory.dsl import InventoryTraversalSource
+from graph_asset_inventory_api.inventory.labels import has_label
 
 from graph_asset_inventory_api.inventory.universe import (
     UniverseVersion,
     Universe,
 )
+from graph_asset_inventory_api.inventory.vids import NaturalVertexIDs
+
+
+RACE_ROUNDS = 10
+"""Number of times the tests of concurrent upserts repeat the race."""
 
 # Gremlin server connection.
 
@@ -70,6 +87,29 @@ def test_teams_pagination(cli, init_teams):
         cli.teams(0, 1000), init_teams, lambda x: x.vid)
 
 
+def test_teams_pagination_after(cli, init_teams):
+    """Tests the keyset pagination mode of the method ``teams`` of the class
+    ``InventoryClient``."""
+    assert compare_unsorted_list(
+        cli.teams(page_size=2, after=init_teams[1].vid),
+        init_teams[2:4],
+        lambda x: x.vid,
+    )
+    assert compare_unsorted_list(
+        cli.teams(page_size=2, after=init_teams[3].vid),
+        init_teams[4:5],
+        lambda x: x.vid,
+    )
+    assert cli.teams(page_size=2, after=init_teams[4].vid) == []
+
+    # ``after`` takes precedence over ``page_idx``.
+    assert compare_unsorted_list(
+        cli.teams(5, 2, after=init_teams[0].vid),
+        init_teams[1:3],
+        lambda x: x.vid,
+    )
+
+
 def test_teams_identifier(cli, init_teams):
     """Tests the filter ``identifier`` of the method ``teams`` of the class
     ``InventoryClient``."""
@@ -95,6 +135,18 @@ def test_teams_identifier_pagination(cli, init_teams):
     )
 
 
+def test_stream_teams(cli, init_teams):
+    """Tests the method ``stream_teams`` of the class ``InventoryClient``."""
+    assert compare_unsorted_list(
+        list(cli.stream_teams()), init_teams, lambda x: x.vid)
+
+    expected = [
+        team for team in init_teams if team.identifier == 'identifier0'
+    ]
+    assert compare_unsorted_list(
+        list(cli.stream_teams('identifier0')), expected, lambda x: x.vid)
+
+
 def test_team(cli, init_teams):
     """Tests the method ``team`` of the class ``InventoryClient``."""
     team = cli.team(init_teams[2].vid)
@@ -110,6 +162,30 @@ def test_team_not_found_error(cli, unknown_uuid):
     assert exc_info.value.name == unknown_uuid
 
 
+def test_team_vids(cli, init_teams, unknown_uuid):
+    """Tests the method ``team_vids`` of the class ``InventoryClient``."""
+    vids = [init_teams[1].vid, unknown_uuid, init_teams[0].vid]
+
+    teams = cli.team_vids(vids)
+
+    assert teams == {t.vid: t for t in init_teams[0:2]}
+    assert cli.team_vids([]) == {}
+
+
+def test_team_identifiers(cli, init_teams):
+    """Tests the method ``team_identifiers`` of the class
+    ``InventoryClient``."""
+    identifiers = ['identifier3', 'identifier1337', 'identifier0']
+
+    teams = cli.team_identifiers(identifiers)
+
+    expected = {
+        t.identifier: t for t in init_teams if t.identifier in identifiers
+    }
+    assert teams == expected
+    assert cli.team_identifiers([]) == {}
+
+
 def test_team_identifier(cli, init_teams):
     """Tests the method ``team_identifier`` of the class
     ``InventoryClient``."""
@@ -306,6 +382,29 @@ def test_assets(cli, init_assets):
     assert compare_unsorted_list(assets, init_assets, lambda x: x.vid)
 
 
+def test_assets_fields(cli, init_assets):
+    """Tests the method ``assets`` of the class ``InventoryClient`` when only
+    some fields are requested."""
+    assets = cli.assets(fields=('id', 'type', 'last_seen'))
+    want = [
+        {
+            'id': a.vid,
+            'type': a.asset_id.type,
+            'last_seen': a.time_attr.last_seen,
+        }
+        for a in init_assets
+    ]
+    assert compare_unsorted_list(assets, want, lambda x: x['id'])
+
+
+def test_assets_convert(cli, init_assets):
+    """Tests the method ``assets`` of the class ``InventoryClient`` when the
+    asset vertices are converted with a custom function."""
+    vids = cli.assets(convert=lambda va: va[T.id])
+    assert compare_unsorted_list(
+        vids, [a.vid for a in init_assets], lambda x: x)
+
+
 def test_assets_universe(cli, new_universe, init_new_universe_assets):
     """Tests the method ``assets`` of the class ``InventoryClient`` when a
     universe is specified."""
@@ -401,6 +500,21 @@ def test_assets_valid_at(cli, init_valid_at_assets):
     )
 
 
+def test_stream_assets(cli, init_assets):
+    """Tests the method ``stream_assets`` of the class ``InventoryClient``."""
+    assert compare_unsorted_list(
+        list(cli.stream_assets()), init_assets, lambda x: x.vid)
+
+    expected = [
+        asset for asset in init_assets if asset.asset_id.type == 'type0'
+    ]
+    assert compare_unsorted_list(
+        list(cli.stream_assets(asset_type='type0')),
+        expected,
+        lambda x: x.vid,
+    )
+
+
 def test_asset(cli, init_assets):
     """Tests the method ``asset`` of the class ``InventoryClient``."""
     asset = cli.asset(init_assets[2].vid)
@@ -451,6 +565,56 @@ def test_asset_id_not_found_error(cli):
     assert exc_info.value.name == asset_id
 
 
+def test_asset_ids(cli, init_assets):
+    """Tests the method ``asset_ids`` of the class ``InventoryClient``."""
+    # ``type0-identifier1`` and ``type1-identifier0`` also exist, but they
+    # must not be returned because they are not requested.
+    asset_ids = [
+        AssetID('type0', 'identifier0'),
+        AssetID('type1', 'identifier1'),
+        AssetID('type1337', 'identifier1337'),
+    ]
+
+    assets = cli.asset_ids(asset_ids)
+
+    expected = {
+        a.asset_id: a for a in init_assets if a.asset_id in asset_ids
+    }
+    assert assets == expected
+
+
+def test_asset_vids(cli, init_assets, unknown_uuid):
+    """Tests the method ``asset_vids`` of the class ``InventoryClient``."""
+    vids = [init_assets[2].vid, unknown_uuid, init_assets[0].vid]
+
+    assets = cli.asset_vids(vids)
+
+    assert assets == {a.vid: a for a in (init_assets[0], init_assets[2])}
+    assert cli.asset_vids([]) == {}
+
+
+def test_asset_ids_universe(
+    cli,
+    new_universe,
+    init_new_universe_assets,
+):
+    """Tests that the method ``asset_ids`` of the class ``InventoryClient``
+    only returns assets linked to the specified ``universe``."""
+    asset_ids = [a.asset_id for a in init_new_universe_assets]
+
+    assert cli.asset_ids(asset_ids) == {}
+
+    assets = cli.asset_ids(asset_ids, new_universe)
+    expected = {a.asset_id: a for a in init_new_universe_assets}
+    assert assets == expected
+
+
+def test_asset_ids_empty(cli, init_assets):  # pylint: disable=unused-argument
+    """Tests the method ``asset_ids`` of the class ``InventoryClient`` with an
+    empty list of asset ids."""
+    assert cli.asset_ids([]) == {}
+
+
 def test_drop_asset(cli, init_assets):
     """Tests the method ``drop_asset`` of the class ``InventoryClient``."""
     cli.drop_asset(init_assets[2].vid)
@@ -761,6 +925,113 @@ def test_set_asset_update_in_between_timestamp(cli, init_assets):
     assert compare_unsorted_list(cli.assets(), init_assets, lambda x: x.vid)
 
 
+def test_set_assets(cli, init_assets):
+    """Tests the method ``set_assets`` of the class ``InventoryClient``."""
+    past_timestamp = datetime.fromisoformat('2000-01-01T01:00:00+00:00')
+    future_timestamp = datetime.fromisoformat('2024-01-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2024-01-07T01:00:00+00:00')
+
+    new_asset = Asset(AssetID('type_created', 'identifier_created'))
+
+    upserts = [
+        (Asset(init_assets[2].asset_id), expiration, past_timestamp),
+        (new_asset, expiration, future_timestamp),
+        (Asset(init_assets[3].asset_id), expiration, future_timestamp),
+    ]
+
+    updated_assets = cli.set_assets(upserts)
+
+    assert len(updated_assets) == 3
+    assert updated_assets[0] == (init_assets[2].vid, True)
+    assert updated_assets[1][0] is not None
+    assert not updated_assets[1][1]
+    assert updated_assets[2] == (init_assets[3].vid, True)
+
+    asset2 = cli.asset(init_assets[2].vid)
+    assert asset2.time_attr.first_seen == past_timestamp
+    assert asset2.time_attr.last_seen == init_assets[2].time_attr.last_seen
+    assert asset2.time_attr.expiration == init_assets[2].time_attr.expiration
+
+    created_asset = cli.asset(updated_assets[1][0])
+    assert created_asset.asset_id == new_asset.asset_id
+    assert created_asset.time_attr.first_seen == future_timestamp
+    assert created_asset.time_attr.last_seen == future_timestamp
+    assert created_asset.time_attr.expiration == expiration
+
+    asset3 = cli.asset(init_assets[3].vid)
+    assert asset3.time_attr.first_seen == init_assets[3].time_attr.first_seen
+    assert asset3.time_attr.last_seen == future_timestamp
+    assert asset3.time_attr.expiration == expiration
+
+    assert len(cli.assets()) == len(init_assets) + 1
+
+
+def test_set_assets_first_seen(cli, init_assets):
+    """Tests the method ``set_assets`` of the class ``InventoryClient`` when
+    ``first_seen`` is specified."""
+    first_seen = datetime.fromisoformat('2000-01-01T01:00:00+00:00')
+    timestamp = datetime.fromisoformat('2024-01-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2024-01-07T01:00:00+00:00')
+
+    new_asset = Asset(AssetID('type_created', 'identifier_created'))
+
+    upserts = [
+        (Asset(init_assets[2].asset_id), expiration, timestamp, first_seen),
+        (new_asset, expiration, timestamp, first_seen),
+    ]
+
+    updated_assets = cli.set_assets(upserts)
+
+    asset2 = cli.asset(updated_assets[0][0])
+    assert asset2.time_attr.first_seen == first_seen
+    assert asset2.time_attr.last_seen == timestamp
+    assert asset2.time_attr.expiration == expiration
+
+    created_asset = cli.asset(updated_assets[1][0])
+    assert created_asset.time_attr.first_seen == first_seen
+    assert created_asset.time_attr.last_seen == timestamp
+    assert created_asset.time_attr.expiration == expiration
+
+
+def test_set_assets_empty(cli, init_assets):
+    """Tests the method ``set_assets`` of the class ``InventoryClient`` with
+    an empty list of assets."""
+    assert cli.set_assets([]) == []
+    assert compare_unsorted_list(cli.assets(), init_assets, lambda x: x.vid)
+
+
+def test_set_assets_value_error(cli, init_assets):
+    """Tests that the method ``set_assets`` of the class ``InventoryClient``
+    does not modify any asset if any of them is not valid."""
+    timestamp = datetime.fromisoformat('2022-01-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2022-01-07T01:00:00+00:00')
+
+    upserts = [
+        (Asset(AssetID('type_created', 'identifier_created')),
+         expiration, timestamp),
+        (Asset(AssetID('type_created', '')), expiration, timestamp),
+    ]
+    with pytest.raises(ValueError, match='.*empty.*'):
+        cli.set_assets(upserts)
+    assert compare_unsorted_list(cli.assets(), init_assets, lambda x: x.vid)
+
+    upserts = [
+        (Asset(AssetID('type_created', 'identifier_created')),
+         timestamp, expiration),
+    ]
+    with pytest.raises(ValueError, match='.*expiration before timestamp.*'):
+        cli.set_assets(upserts)
+    assert compare_unsorted_list(cli.assets(), init_assets, lambda x: x.vid)
+
+    upserts = [
+        (Asset(AssetID('type_created', 'identifier_created')),
+         expiration, timestamp, expiration),
+    ]
+    with pytest.raises(ValueError, match='.*first_seen after timestamp.*'):
+        cli.set_assets(upserts)
+    assert compare_unsorted_list(cli.assets(), init_assets, lambda x: x.vid)
+
+
 # Parents.
 
 
@@ -789,6 +1060,32 @@ def test_parents_pagination(cli, init_parents):
         cli.parents(vid, 0, 1000), parents, lambda x: x.eid)
 
 
+def test_parents_pagination_after(cli, init_parents):
+    """Tests the keyset pagination mode of the method ``parents`` of the class
+    ``InventoryClient``."""
+    vid = list(init_parents)[0]
+    parents = sorted(init_parents[vid], key=lambda x: x.eid)
+
+    assert compare_unsorted_list(
+        cli.parents(vid, page_size=2, after=parents[0].eid),
+        parents[1:3],
+        lambda x: x.eid,
+    )
+    assert cli.parents(vid, page_size=2, after=parents[-1].eid) == []
+
+
+def test_parents_fields(cli, init_parents):
+    """Tests the method ``parents`` of the class ``InventoryClient`` when only
+    some fields are requested."""
+    vid = list(init_parents)[0]
+    parents = cli.parents(vid, fields=('id', 'parent_id', 'child_id'))
+    want = [
+        {'id': po.eid, 'parent_id': po.parent_vid, 'child_id': po.child_vid}
+        for po in init_parents[vid]
+    ]
+    assert compare_unsorted_list(parents, want, lambda x: x['id'])
+
+
 def test_parents_not_found_error(cli, unknown_uuid):
     """Tests the method ``parents`` of the class ``InventoryClient`` with an
     unknown ``vid``."""
@@ -934,6 +1231,88 @@ def test_set_parent_of_not_found_error(cli, init_assets, unknown_uuid):
 
     assert exc_info.value.name == unknown_uuid
 
+    # Unknown parent_vid and child_vid. The child is reported first.
+    other_uuid = str(uuid.uuid4())
+    with pytest.raises(NotFoundError) as exc_info:
+        cli.set_parent_of(
+            ParentOf(other_uuid, unknown_uuid), expiration, timestamp)
+
+    assert exc_info.value.name == unknown_uuid
+
+
+def test_set_parent_ofs(cli, init_parents, init_assets, unknown_uuid):
+    """Tests the method ``set_parent_ofs`` of the class ``InventoryClient``."""
+    vid = list(init_parents)[0]
+    parents = init_parents[vid]
+
+    timestamp = datetime.fromisoformat('2024-01-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2024-01-07T01:00:00+00:00')
+
+    upserts = [
+        # Existing edge.
+        (ParentOf(parents[0].parent_vid, vid), expiration, timestamp),
+        # New edge.
+        (ParentOf(init_assets[8].vid, vid), expiration, timestamp),
+        # Unknown parent.
+        (ParentOf(unknown_uuid, vid), expiration, timestamp),
+    ]
+
+    results, missing = cli.set_parent_ofs(upserts)
+
+    assert missing == {unknown_uuid}
+    assert len(results) == 3
+    assert results[0] == (parents[0].eid, True)
+    assert results[1][0] is not None
+    assert not results[1][1]
+    assert results[2] is None
+
+    updated_parents = cli.parents(vid)
+    assert len(updated_parents) == len(parents) + 1
+    for parent in updated_parents:
+        if parent.eid not in (parents[0].eid, results[1][0]):
+            continue
+        assert parent.time_attr.last_seen == timestamp
+        assert parent.time_attr.expiration == expiration
+
+
+def test_set_parent_ofs_first_seen(cli, init_assets):
+    """Tests the method ``set_parent_ofs`` of the class ``InventoryClient``
+    when ``first_seen`` is specified."""
+    first_seen = datetime.fromisoformat('2000-01-01T01:00:00+00:00')
+    timestamp = datetime.fromisoformat('2024-01-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2024-01-07T01:00:00+00:00')
+
+    parentof = ParentOf(init_assets[8].vid, init_assets[0].vid)
+    results, missing = cli.set_parent_ofs(
+        [(parentof, expiration, timestamp, first_seen)])
+
+    assert missing == set()
+    assert not results[0][1]
+
+    parents = cli.parents(init_assets[0].vid)
+    parent = next(p for p in parents if p.eid == results[0][0])
+    assert parent.time_attr.first_seen == first_seen
+    assert parent.time_attr.last_seen == timestamp
+    assert parent.time_attr.expiration == expiration
+
+
+def test_set_parent_ofs_empty(cli):
+    """Tests the method ``set_parent_ofs`` of the class ``InventoryClient``
+    with an empty list of relationships."""
+    assert cli.set_parent_ofs([]) == ([], set())
+
+
+def test_set_parent_ofs_same_child_parent(cli, init_assets):
+    """Tests the method ``set_parent_ofs`` of the class ``InventoryClient``
+    when the child and the parent of a relationship are the same."""
+    vid = init_assets[0].vid
+
+    timestamp = datetime.fromisoformat('2022-01-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2022-01-07T01:00:00+00:00')
+
+    with pytest.raises(ValueError, match='.*are the same.*'):
+        cli.set_parent_ofs([(ParentOf(vid, vid), expiration, timestamp)])
+
 
 def test_drop_parent_of(cli, init_parents):
     """Tests the method ``drop_parent_of`` of the class ``InventoryClient``."""
@@ -956,6 +1335,27 @@ def test_drop_parent_of_not_found_error(cli, unknown_uuid):
     assert exc_info.value.name == unknown_uuid
 
 
+def test_drop_parent_of_between(cli, init_parents, unknown_uuid):
+    """Tests the method ``drop_parent_of_between`` of the class
+    ``InventoryClient``."""
+    vid = list(init_parents)[0]
+    parents = init_parents[vid]
+
+    cli.drop_parent_of_between(parents[2].parent_vid, vid)
+
+    final_parents = parents[:2] + parents[3:]
+    assert compare_unsorted_list(
+        cli.parents(vid), final_parents, lambda x: x.eid)
+
+    with pytest.raises(NotFoundError) as exc_info:
+        cli.drop_parent_of_between(parents[2].parent_vid, vid)
+    assert exc_info.value.name == parents[2].parent_vid
+
+    with pytest.raises(NotFoundError) as exc_info:
+        cli.drop_parent_of_between(parents[0].parent_vid, unknown_uuid)
+    assert exc_info.value.name == unknown_uuid
+
+
 def test_children(cli, init_children):
     """Tests the method ``children`` of the class ``InventoryClient`."""
     for vid, children in init_children.items():
@@ -963,6 +1363,182 @@ def test_children(cli, init_children):
             cli.children(vid), children, lambda x: x.eid)
 
 
+def test_children_not_found_error(cli, init_teams, unknown_uuid):
+    """Tests the method ``children`` of the class ``InventoryClient`` with an
+    unknown ``vid`` and with the ``vid`` of a vertex that is not an asset."""
+    with pytest.raises(NotFoundError, match=f'.*{unknown_uuid}.*') as exc_info:
+        cli.children(unknown_uuid)
+
+    assert exc_info.value.name == unknown_uuid
+
+    with pytest.raises(NotFoundError):
+        cli.children(init_teams[0].vid)
+
+
+def test_ancestors(cli, init_lineage):
+    """Tests the method ``ancestors`` of the class ``InventoryClient``. The
+    edges of the cycle are returned once."""
+    vid = init_lineage[(1, 2)].child_vid
+
+    assert compare_unsorted_list(
+        cli.ancestors(vid), list(init_lineage.values()), lambda x: x.eid)
+    assert cli.ancestors(vid, max_depth=1) == [init_lineage[(1, 2)]]
+    assert compare_unsorted_list(
+        cli.ancestors(vid, max_depth=2),
+        [init_lineage[k] for k in [(1, 2), (0, 1), (3, 1)]],
+        lambda x: x.eid,
+    )
+
+
+def test_ancestors_valid_at(cli, init_lineage):
+    """Tests that the method ``ancestors`` of the class ``InventoryClient``
+    only follows the edges valid at the specified time."""
+    vid = init_lineage[(1, 2)].child_vid
+    valid_at = datetime.fromisoformat('2021-07-05T01:00:00+00:00')
+
+    assert compare_unsorted_list(
+        cli.ancestors(vid, valid_at=valid_at),
+        [init_lineage[k] for k in [(1, 2), (0, 1), (2, 0)]],
+        lambda x: x.eid,
+    )
+
+
+def test_ancestors_pagination(cli, init_lineage):
+    """Tests the pagination mode of the method ``ancestors`` of the class
+    ``InventoryClient``."""
+    vid = init_lineage[(1, 2)].child_vid
+    edges = sorted(init_lineage.values(), key=lambda x: x.eid)
+
+    assert cli.ancestors(vid, page_idx=0, page_size=3) == edges[0:3]
+    assert cli.ancestors(vid, page_idx=1, page_size=3) == edges[3:]
+    assert cli.ancestors(vid, page_size=2, after=edges[1].eid) == edges[2:4]
+
+
+def test_ancestors_not_found_error(cli, unknown_uuid):
+    """Tests that the method ``ancestors`` of the class ``InventoryClient``
+    raises a ``NotFoundError`` if the asset does not exist."""
+    with pytest.raises(NotFoundError):
+        cli.ancestors(unknown_uuid)
+
+
+def test_descendants(cli, init_lineage):
+    """Tests the method ``descendants`` of the class ``InventoryClient``."""
+    vid = init_lineage[(1, 2)].parent_vid
+
+    assert compare_unsorted_list(
+        cli.descendants(vid),
+        [init_lineage[k] for k in [(1, 2), (2, 0), (0, 1)]],
+        lambda x: x.eid,
+    )
+    assert cli.descendants(vid, max_depth=1) == [init_lineage[(1, 2)]]
+
+
+def set_diamond(cli, assets, edges):
+    """Creates the ``parent_of`` edges ``edges``, a list of ``(parent_idx,
+    child_idx)`` tuples of indices of ``assets``, and returns a dict of the
+    form ``{(parent_idx, child_idx): DbParentOf}``."""
+    expiration = datetime.fromisoformat('2021-07-14T01:00:00+00:00')
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+
+    diamond = {}
+    for parent_idx, child_idx in edges:
+        parentof = ParentOf(assets[parent_idx].vid, assets[child_idx].vid)
+        diamond[(parent_idx, child_idx)], _ = cli.set_parent_of(
+            parentof, expiration, timestamp)
+    return diamond
+
+
+def test_ancestors_diamond(cli, init_assets):
+    """Tests that the method ``ancestors`` of the class ``InventoryClient``
+    follows the edges reached at ``max_depth`` by a long path when they are
+    also reached by a shorter one."""
+    # The edge (3, 2) is at the third level through (1, 0) and (2, 1), and at
+    # the second level through the shortcut (2, 0).
+    diamond = set_diamond(
+        cli, init_assets, [(1, 0), (2, 1), (2, 0), (3, 2), (4, 3)])
+    vid = init_assets[0].vid
+
+    assert compare_unsorted_list(
+        cli.ancestors(vid, max_depth=3),
+        list(diamond.values()),
+        lambda x: x.eid,
+    )
+    assert compare_unsorted_list(
+        cli.ancestors(vid, max_depth=2),
+        [diamond[k] for k in [(1, 0), (2, 1), (2, 0), (3, 2)]],
+        lambda x: x.eid,
+    )
+
+
+def test_subgraph(cli, init_assets, init_teams, init_lineage, init_owners):
+    """Tests the method ``subgraph`` of the class ``InventoryClient``. The
+    edges between the vertices of the subgraph are returned, even if they
+    are not in the paths from the asset."""
+    vid = init_assets[2].vid
+    parentofs = sorted(init_lineage.values(), key=lambda x: x.eid)
+    owns = sorted(
+        [o for v in init_owners.values() for o in v], key=lambda x: x.eid)
+
+    assert cli.subgraph(vid) == DbSubgraph(
+        [],
+        sorted(init_assets[:3], key=lambda x: x.vid),
+        sorted(
+            [init_lineage[k] for k in [(0, 1), (1, 2), (2, 0)]],
+            key=lambda x: x.eid,
+        ),
+        [],
+        False,
+    )
+    assert cli.subgraph(vid, depth=2) == DbSubgraph(
+        init_teams[1:5],
+        sorted(init_assets[:4], key=lambda x: x.vid),
+        parentofs,
+        owns,
+        False,
+    )
+
+
+def test_subgraph_diamond(cli, init_assets):
+    """Tests that the method ``subgraph`` of the class ``InventoryClient``
+    follows the vertices reached at ``depth`` by a long path when they are
+    also reached by a shorter one."""
+    # The asset 2 is two edges away through (0, 1) and (1, 2), and one edge
+    # away through the shortcut (0, 2).
+    diamond = set_diamond(cli, init_assets, [(0, 1), (1, 2), (0, 2), (2, 3)])
+
+    assert cli.subgraph(init_assets[0].vid, depth=2) == DbSubgraph(
+        [],
+        sorted(init_assets[:4], key=lambda x: x.vid),
+        sorted(diamond.values(), key=lambda x: x.eid),
+        [],
+        False,
+    )
+
+
+def test_subgraph_truncated(cli, init_assets, init_lineage, init_owners):
+    """Tests that the method ``subgraph`` of the class ``InventoryClient``
+    returns at most ``max_nodes`` teams and assets and only the edges
+    between them."""
+    # pylint: disable=unused-argument
+    subgraph = cli.subgraph(init_assets[2].vid, depth=2, max_nodes=3)
+
+    assert subgraph.truncated
+    vids = {t.vid for t in subgraph.teams} | {a.vid for a in subgraph.assets}
+    assert len(vids) == 3
+    assert init_assets[2].vid in vids
+    for parentof in subgraph.parentofs:
+        assert {parentof.parent_vid, parentof.child_vid} <= vids
+    for owns in subgraph.owns:
+        assert {owns.team_vid, owns.asset_vid} <= vids
+
+
+def test_subgraph_not_found_error(cli, unknown_uuid):
+    """Tests that the method ``subgraph`` of the class ``InventoryClient``
+    raises a ``NotFoundError`` if the asset does not exist."""
+    with pytest.raises(NotFoundError):
+        cli.subgraph(unknown_uuid)
+
+
 # Owners.
 
 
@@ -998,6 +1574,62 @@ def test_owners_not_found_error(cli, unknown_uuid):
     assert exc_info.value.name == unknown_uuid
 
 
+def test_owned_assets(cli, init_teams, init_assets, init_owners):
+    """Tests the method ``owned_assets`` of the class ``InventoryClient``."""
+    # pylint: disable=unused-argument
+    assert cli.owned_assets(init_teams[1].vid) == [init_assets[0]]
+    assert cli.owned_assets(init_teams[4].vid) == [init_assets[1]]
+    assert cli.owned_assets(init_teams[0].vid) == []
+
+
+def test_owned_assets_active_at(cli, init_teams, init_assets, init_owners):
+    """Tests that the method ``owned_assets`` of the class ``InventoryClient``
+    only returns the assets owned at the specified time. The relationships
+    without ``end_time`` have not ended."""
+    # pylint: disable=unused-argument
+    team_vid = init_teams[1].vid
+    cli.set_owns(
+        Owns(team_vid, init_assets[2].vid),
+        datetime.fromisoformat('2021-07-01T01:00:00+00:00'),
+    )
+
+    def owned_at(active_at):
+        return cli.owned_assets(
+            team_vid, datetime.fromisoformat(active_at))
+
+    assert compare_unsorted_list(
+        owned_at('2021-07-03T01:00:00+00:00'),
+        init_assets[0:3:2],
+        lambda x: x.vid,
+    )
+    assert owned_at('2021-08-01T01:00:00+00:00') == [init_assets[2]]
+    assert owned_at('2021-06-01T01:00:00+00:00') == []
+
+
+def test_owned_assets_pagination(cli, init_teams, init_assets, init_owners):
+    """Tests the pagination mode of the method ``owned_assets`` of the class
+    ``InventoryClient``."""
+    # pylint: disable=unused-argument
+    team_vid = init_teams[1].vid
+    cli.set_owns(
+        Owns(team_vid, init_assets[2].vid),
+        datetime.fromisoformat('2021-07-01T01:00:00+00:00'),
+    )
+    assets = sorted(init_assets[0:3:2], key=lambda x: x.vid)
+
+    assert cli.owned_assets(team_vid, page_idx=0, page_size=1) == assets[:1]
+    assert cli.owned_assets(team_vid, page_idx=1, page_size=1) == assets[1:]
+    assert cli.owned_assets(
+        team_vid, page_size=1, after=assets[0].vid) == assets[1:]
+
+
+def test_owned_assets_not_found_error(cli, unknown_uuid):
+    """Tests the method ``owned_assets`` of the class ``InventoryClient``
+    with an unknown ``team_vid``."""
+    with pytest.raises(NotFoundError, match=f'.*{unknown_uuid}.*'):
+        cli.owned_assets(unknown_uuid)
+
+
 def test_set_owns(cli, init_owners):
     """Tests the method ``set_owns`` of the class ``InventoryClient``."""
     asset_vid = list(init_owners)[0]
@@ -1145,6 +1777,27 @@ def test_drop_owns_not_found_error(cli, unknown_uuid):
     assert exc_info.value.name == unknown_uuid
 
 
+def test_drop_owns_between(cli, init_owners, unknown_uuid):
+    """Tests the method ``drop_owns_between`` of the class
+    ``InventoryClient``."""
+    vid = list(init_owners)[0]
+    owners = init_owners[vid]
+
+    cli.drop_owns_between(owners[1].team_vid, vid)
+
+    final_owners = owners[:1] + owners[2:]
+    assert compare_unsorted_list(
+        cli.owners(vid), final_owners, lambda x: x.eid)
+
+    with pytest.raises(NotFoundError) as exc_info:
+        cli.drop_owns_between(owners[1].team_vid, vid)
+    assert exc_info.value.name == owners[1].team_vid
+
+    with pytest.raises(NotFoundError) as exc_info:
+        cli.drop_owns_between(owners[0].team_vid, unknown_uuid)
+    assert exc_info.value.name == unknown_uuid
+
+
 # Universe
 
 
@@ -1155,6 +1808,424 @@ def test_current_universe(cli):
     assert universe.namespace == CURRENT_UNIVERSE.namespace
     assert universe.version.sem_version == CURRENT_UNIVERSE.version.sem_version
 
+
+def test_universe_cache(
+    cli,
+    init_teams,
+    new_universe,
+    init_new_universe_teams,
+):
+    """Tests that the ``InventoryClient`` returns the elements of the right
+    universe after caching and invalidating the universes."""
+    for _ in range(2):
+        assert compare_unsorted_list(
+            cli.teams(), init_teams, lambda x: x.vid)
+        assert compare_unsorted_list(
+            cli.teams(universe=new_universe),
+            init_new_universe_teams,
+            lambda x: x.vid,
+        )
+        cli.invalidate_universes()
+
+
+def test_ensure_universe_cache(cli, init_teams, new_universe):
+    """Tests that the method ``ensure_universe`` of the class
+    ``InventoryClient`` creates the universe only once and caches it."""
+    cli.ensure_universe(new_universe)
+    cli.ensure_universe(new_universe)
+
+    team = Team('identifier_created', 'name_created')
+    created_team = cli.add_team(team, universe=new_universe)
+
+    assert cli.teams(universe=new_universe) == [created_team]
+    assert compare_unsorted_list(cli.teams(), init_teams, lambda x: x.vid)
+
+
+# Vertex IDs.
+
+
+def test_natural_vids(natural_cli):
+    """Tests that an ``InventoryClient`` with natural vertex IDs creates the
+    teams and assets with their natural IDs and looks them up by ID."""
+    vids = NaturalVertexIDs()
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+
+    team = natural_cli.add_team(Team('identifier0', 'name0'))
+    assert team.vid == vids.team(CURRENT_UNIVERSE, 'identifier0')
+    assert natural_cli.team_identifier('identifier0') == team
+
+    with pytest.raises(ConflictError):
+        natural_cli.add_team(Team('identifier0', 'name0'))
+
+    asset_id = AssetID('type0', 'identifier0')
+    upserts = [(Asset(asset_id), expiration, timestamp)]
+    assert natural_cli.set_assets(upserts) == \
+        [(vids.asset(CURRENT_UNIVERSE, asset_id), False)]
+    assert natural_cli.set_assets(upserts) == \
+        [(vids.asset(CURRENT_UNIVERSE, asset_id), True)]
+
+    asset = natural_cli.asset_id(asset_id)
+    assert asset.vid == vids.asset(CURRENT_UNIVERSE, asset_id)
+    assert natural_cli.asset_ids([asset_id, AssetID('type1', 'x')]) == \
+        {asset_id: asset}
+    assert len(natural_cli.assets()) == 1
+
+
+def test_natural_vids_concurrent_upserts(natural_clis):
+    """Tests that concurrent upserts of the same asset with natural IDs do not
+    fail. If both miss the asset, the one rejected by the server is retried
+    and updates the asset created by the other one."""
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+
+    # The race is repeated to make it likely that both upserts miss the
+    # asset at least once.
+    for i in range(RACE_ROUNDS):
+        asset = Asset(AssetID('type0', f'identifier{i}'))
+
+        results = race(*[
+            functools.partial(cli.set_asset, asset, expiration, timestamp)
+            for cli in natural_clis
+        ])
+        assert sorted(exists for _, exists in results) == [False, True]
+        assert results[0][0] == results[1][0]
+
+        asset = Asset(AssetID('type1', f'identifier{i}'))
+        upserts = [(asset, expiration, timestamp)]
+
+        results = race(*[
+            functools.partial(cli.set_assets, upserts)
+            for cli in natural_clis
+        ])
+        assert sorted(r[0][1] for r in results) == [False, True]
+        assert results[0][0][0] == results[1][0][0]
+
+    assert len(natural_clis[0].assets()) == 2 * RACE_ROUNDS
+
+
+def test_natural_vids_concurrent_add_team(natural_clis):
+    """Tests that, with natural IDs, only one of two concurrent creations of
+    the same team succeeds and the other raises a ``ConflictError``."""
+    for i in range(RACE_ROUNDS):
+        team = Team(f'identifier{i}', f'name{i}')
+
+        results = race(*[
+            functools.partial(cli.add_team, team) for cli in natural_clis
+        ])
+        errors = [r for r in results if isinstance(r, Exception)]
+        assert len(errors) == 1
+        assert isinstance(errors[0], ConflictError)
+
+    assert len(natural_clis[0].teams()) == RACE_ROUNDS
+
+
+def test_hybrid_vids(hybrid_cli, init_assets):
+    """Tests that an ``InventoryClient`` with hybrid vertex IDs finds the
+    assets with random IDs and creates the new ones with natural IDs."""
+    vids = NaturalVertexIDs()
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+
+    new_asset_id = AssetID('type_created', 'identifier_created')
+    upserts = [
+        (Asset(init_assets[0].asset_id), expiration, timestamp),
+        (Asset(new_asset_id), expiration, timestamp),
+    ]
+    assert hybrid_cli.set_assets(upserts) == [
+        (init_assets[0].vid, True),
+        (vids.asset(CURRENT_UNIVERSE, new_asset_id), False),
+    ]
+
+    assert hybrid_cli.asset_id(init_assets[1].asset_id).vid == \
+        init_assets[1].vid
+
+
+def test_natural_eids(natural_cli):
+    """Tests that an ``InventoryClient`` with natural IDs creates the
+    ``parent_of`` and ``owns`` edges with their natural IDs and finds them by
+    ID."""
+    vids = NaturalVertexIDs()
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+
+    team = natural_cli.add_team(Team('identifier0', 'name0'))
+    (parent_vid, _), (child_vid, _) = natural_cli.set_assets([
+        (Asset(AssetID('type0', 'identifier0')), expiration, timestamp),
+        (Asset(AssetID('type1', 'identifier1')), expiration, timestamp),
+    ])
+
+    eid = vids.edge('parent_of', parent_vid, child_vid)
+    parentof = ParentOf(parent_vid, child_vid)
+    dbparentof, exists = natural_cli.set_parent_of(
+        parentof, expiration, timestamp)
+    assert dbparentof.eid == eid
+    assert not exists
+
+    # A batch with the same relationship twice does not duplicate it. The
+    # relationship in the opposite direction is a different one.
+    reversed_parentof = ParentOf(  # pylint: disable=arguments-out-of-order
+        child_vid, parent_vid)
+    assert natural_cli.set_parent_ofs([
+        (parentof, expiration, timestamp),
+        (reversed_parentof, expiration, timestamp),
+        (reversed_parentof, expiration, timestamp),
+    ]) == ([
+        (eid, True),
+        (vids.edge('parent_of', child_vid, parent_vid), False),
+        (vids.edge('parent_of', child_vid, parent_vid), True),
+    ], set())
+    assert len(natural_cli.parents(child_vid)) == 1
+
+    dbowns, exists = natural_cli.set_owns(Owns(team.vid, child_vid), timestamp)
+    assert dbowns.eid == vids.edge('owns', team.vid, child_vid)
+    assert not exists
+
+    _, exists = natural_cli.set_owns(Owns(team.vid, child_vid), timestamp)
+    assert exists
+    assert len(natural_cli.owners(child_vid)) == 1
+
+
+def test_natural_eids_concurrent_upserts(natural_clis):
+    """Tests that concurrent upserts of the same ``parent_of`` or ``owns``
+    relationship with natural IDs do not fail. If both miss the edge, the one
+    rejected by the server is retried and updates the edge created by the
+    other one."""
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+    cli = natural_clis[0]
+
+    team = cli.add_team(Team('identifier0', 'name0'))
+    (parent_vid, _), = cli.set_assets([
+        (Asset(AssetID('type0', 'parent')), expiration, timestamp),
+    ])
+
+    # The race is repeated to make it likely that both upserts miss the edge
+    # at least once.
+    for i in range(RACE_ROUNDS):
+        (child_vid, _), = cli.set_assets([
+            (Asset(AssetID('type1', f'child{i}')), expiration, timestamp),
+        ])
+        parentof = ParentOf(parent_vid, child_vid)
+        owns = Owns(team.vid, child_vid)
+
+        results = race(*[
+            functools.partial(c.set_parent_of, parentof, expiration, timestamp)
+            for c in natural_clis
+        ])
+        assert sorted(exists for _, exists in results) == [False, True]
+
+        # The relationship in the opposite direction has not been created
+        # yet, so the batched upserts race on it too.
+        reversed_parentof = ParentOf(  # pylint: disable=arguments-out-of-order
+            child_vid, parent_vid)
+        results = race(*[
+            functools.partial(
+                c.set_parent_ofs,
+                [(reversed_parentof, expiration, timestamp)],
+            )
+            for c in natural_clis
+        ])
+        assert sorted(r[0][0][1] for r in results) == [False, True]
+
+        results = race(*[
+            functools.partial(c.set_owns, owns, timestamp)
+            for c in natural_clis
+        ])
+        assert sorted(exists for _, exists in results) == [False, True]
+
+        assert len(cli.parents(child_vid)) == 1
+        assert len(cli.children(child_vid)) == 1
+        assert len(cli.owners(child_vid)) == 1
+
+
+def test_hybrid_eids(hybrid_cli, init_assets, init_parents):
+    """Tests that an ``InventoryClient`` with hybrid IDs finds the edges with
+    random IDs."""
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+
+    child_vid = init_assets[0].vid
+    init_parentof = init_parents[child_vid][0]
+    dbparentof, exists = hybrid_cli.set_parent_of(
+        ParentOf(init_parentof.parent_vid, child_vid), expiration, timestamp)
+    assert dbparentof.eid == init_parentof.eid
+    assert exists
+
+
+def test_replace_vertex(cli, init_assets, init_parents):
+    """Tests the method ``replace_vertex`` of the class
+    ``InventoryClient``."""
+    child = init_assets[0]
+    new_vid = str(uuid.uuid4())
+
+    cli.replace_vertex(child.vid, new_vid)
+
+    with pytest.raises(NotFoundError):
+        cli.asset(child.vid)
+
+    asset = cli.asset(new_vid)
+    assert asset.asset_id == child.asset_id
+    assert asset.time_attr == child.time_attr
+    assert cli.asset_id(child.asset_id) == asset
+
+    parents = cli.parents(new_vid)
+    assert sorted((p.parent_vid, p.time_attr) for p in parents) == \
+        sorted((p.parent_vid, p.time_attr) for p in init_parents[child.vid])
+
+
+def test_replace_vertex_errors(cli, init_assets, unknown_uuid):
+    """Tests that the method ``replace_vertex`` of the class
+    ``InventoryClient`` does not replace the vertex if it does not exist or
+    the new ID is taken."""
+    with pytest.raises(NotFoundError):
+        cli.replace_vertex(unknown_uuid, str(uuid.uuid4()))
+
+    with pytest.raises(ConflictError):
+        cli.replace_vertex(init_assets[0].vid, init_assets[1].vid)
+
+    assert cli.asset(init_assets[0].vid) == init_assets[0]
+
+
+def test_replace_vertex_in_place(cli, init_assets, init_parents):
+    """Tests that the method ``replace_vertex`` of the class
+    ``InventoryClient`` replaces a vertex in place if the new ID is equal to
+    the old one, keeping the IDs of its edges."""
+    child = init_assets[0]
+
+    cli.replace_vertex(child.vid, child.vid, label='Asset')
+
+    assert cli.asset(child.vid) == child
+    parents = cli.parents(child.vid)
+    assert compare_unsorted_list(
+        parents, init_parents[child.vid], lambda x: x.eid)
+
+
+def test_replace_vertex_modified_edge(
+    cli,
+    init_assets,
+    init_parents,
+    monkeypatch,
+):
+    """Tests that the method ``replace_vertex`` of the class
+    ``InventoryClient`` does not replace the vertex if the properties of its
+    edges are modified while it is being replaced."""
+    child = init_assets[0]
+    parentof = init_parents[child.vid][0]
+    expiration = datetime.fromisoformat('2021-07-21T01:00:00+00:00')
+    timestamp = datetime.fromisoformat('2021-07-14T01:00:00+00:00')
+
+    replace_vertex = InventoryTraversalSource.replace_vertex
+
+    def update_and_replace(self, *args):
+        cli.set_parent_of(
+            ParentOf(parentof.parent_vid, child.vid), expiration, timestamp)
+        return replace_vertex(self, *args)
+
+    monkeypatch.setattr(
+        InventoryTraversalSource, 'replace_vertex', update_and_replace)
+
+    with pytest.raises(InventoryError):
+        cli.replace_vertex(child.vid, str(uuid.uuid4()))
+
+    assert cli.asset(child.vid) == child
+    updated = [p for p in cli.parents(child.vid) if p.eid == parentof.eid]
+    assert len(updated) == 1
+    assert updated[0].time_attr.last_seen == timestamp
+
+
+def test_vertex_labels(cli, init_teams, init_assets, unknown_uuid):
+    """Tests the method ``vertex_labels`` of the class ``InventoryClient``."""
+    vids = [init_teams[0].vid, init_assets[0].vid, unknown_uuid]
+
+    assert cli.vertex_labels(vids) == {
+        init_teams[0].vid: 'Team',
+        init_assets[0].vid: 'Asset',
+    }
+    assert cli.vertex_labels([]) == {}
+
+
+@pytest.mark.skipif(
+    not get_multi_labels(), reason='the graph does not support multi-labels')
+def test_typed_asset_labels(cli):
+    """Tests that an ``InventoryClient`` in ``typed`` label mode labels the
+    assets with their type and lists them by that label. The assets still
+    match the label ``Asset``."""
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+
+    typed_cli = InventoryClient(
+        get_gremlin_endpoint(), get_auth_mode(), label_mode='typed')
+    try:
+        dbasset, _ = typed_cli.set_asset(
+            Asset(AssetID('type0', 'identifier0')), expiration, timestamp)
+
+        # The assets labeled before are not listed by their type.
+        cli.set_asset(
+            Asset(AssetID('type0', 'identifier1')), expiration, timestamp)
+
+        vlabels = typed_cli.vertex_labels([dbasset.vid])
+        assert has_label(vlabels[dbasset.vid], 'Asset')
+        assert has_label(vlabels[dbasset.vid], 'AssetType:type0')
+        assert typed_cli.assets(asset_type='type0') == [dbasset]
+        assert len(cli.assets()) == 2
+    finally:
+        typed_cli.close()
+
+
+# Asset keys.
+
+
+def test_composite_asset_keys(cli, composite_cli):
+    """Tests that an ``InventoryClient`` in ``composite`` mode looks up the
+    assets by their composite key."""
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+    asset_id = AssetID('type0', 'identifier0')
+
+    dbasset = composite_cli.add_asset(Asset(asset_id), expiration, timestamp)
+
+    assert composite_cli.asset_id(asset_id) == dbasset
+    assert composite_cli.asset_ids([asset_id]) == {asset_id: dbasset}
+    assert composite_cli.assets(
+        asset_type='type0', asset_identifier='identifier0') == [dbasset]
+    assert cli.asset_id(asset_id) == dbasset
+
+    dbasset2, exists = composite_cli.set_asset(
+        Asset(asset_id), expiration, timestamp)
+    assert dbasset2 == dbasset
+    assert exists
+
+
+def test_hybrid_asset_keys(cli, composite_cli, init_assets):
+    """Tests that an ``InventoryClient`` in ``hybrid`` mode finds the assets
+    without composite key, while one in ``composite`` mode does not."""
+    asset = init_assets[0]
+
+    assert cli.asset_id(asset.asset_id) == asset
+    assert cli.asset_ids([asset.asset_id]) == {asset.asset_id: asset}
+    assert cli.assets(
+        asset_type=asset.asset_id.type,
+        asset_identifier=asset.asset_id.identifier,
+    ) == [asset]
+
+    with pytest.raises(NotFoundError):
+        composite_cli.asset_id(asset.asset_id)
+    assert composite_cli.asset_ids([asset.asset_id]) == {}
+
+    assert cli.set_asset_keys(init_assets) == len(init_assets)
+    assert cli.set_asset_keys(init_assets) == 0
+    assert composite_cli.asset_id(asset.asset_id) == asset
+
+
+def test_asset_keys_mode():
+    """Tests that an ``InventoryClient`` cannot be created with an unknown
+    asset key mode."""
+    with pytest.raises(ValueError):
+        InventoryClient(
+            'ws://invalid-host:8182/gremlin', 'none', 'random', 'unknown')
+
+
 # Misc.
 
 
@@ -0,0 +1,46 @@
+"""Tests for the ``fields`` module."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from graph_asset_inventory_api.inventory.fields import (
+    ASSET_FIELDS,
+    TEAM_FIELDS,
+    check_fields,
+    from_projection,
+)
+
+
+def test_check_fields():
+    """Tests that the requested fields are returned in order and always
+    include the ``id`` field."""
+    assert check_fields(['name'], TEAM_FIELDS) == ('id', 'name')
+    assert check_fields(['name', 'id', 'identifier'], TEAM_FIELDS) == \
+        TEAM_FIELDS
+    assert check_fields(['last_seen', 'type'], ASSET_FIELDS) == \
+        ('id', 'type', 'last_seen')
+    assert check_fields([], ASSET_FIELDS) == ('id',)
+
+
+def test_check_fields_unknown():
+    """Tests that requesting fields of another kind of element raises a
+    ``ValueError`` exception."""
+    with pytest.raises(ValueError):
+        check_fields(['name', 'type'], TEAM_FIELDS)
+
+
+def test_from_projection():
+    """Tests the function ``from_projection``."""
+    projection = {
+        'id': 'vid',
+        'type': ['type0'],
+        'first_seen': [datetime(2021, 7, 1, 1)],
+        'expiration': [],
+    }
+    assert from_projection(projection) == {
+        'id': 'vid',
+        'type': 'type0',
+        'first_seen': datetime(2021, 7, 1, 1, tzinfo=timezone.utc),
+        'expiration': None,
+    }
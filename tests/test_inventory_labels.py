@@ -0,0 +1,58 @@
+"""Tests for the ``labels`` module."""
+
+import pytest
+
+from graph_asset_inventory_api.inventory.labels import (
+    TypedAssetLabels,
+    asset_labels,
+    check_asset_labels,
+    has_label,
+)
+
+
+def test_typed_asset_labels():
+    """Tests that the labels of the assets are derived from their type."""
+    labels = TypedAssetLabels()
+
+    assert labels.type_label('Hostname') == 'AssetType:Hostname'
+    assert labels.vertex_label('Hostname') == 'Asset::AssetType:Hostname'
+    assert labels.type_label('Team') != 'Team'
+
+    # Types with the multi-label separator only get the label ``Asset``.
+    assert labels.type_label('type::0') is None
+    assert labels.vertex_label('type::0') == 'Asset'
+
+
+def test_asset_labels():
+    """Tests the function ``asset_labels``."""
+    assert asset_labels('single') is None
+    assert not asset_labels('hybrid').scan
+    assert asset_labels('typed').scan
+
+    with pytest.raises(ValueError):
+        asset_labels('multi')
+
+
+def test_check_asset_labels():
+    """Tests that the function ``check_asset_labels`` rejects the modes that
+    label the assets with their type if the graph does not support
+    multi-labels."""
+    check_asset_labels('single', False)
+    check_asset_labels('hybrid', True)
+    check_asset_labels('typed', True)
+
+    with pytest.raises(ValueError):
+        check_asset_labels('hybrid', False)
+    with pytest.raises(ValueError):
+        check_asset_labels('typed', False)
+    with pytest.raises(ValueError):
+        check_asset_labels('multi', True)
+
+
+def test_has_label():
+    """Tests the function ``has_label``."""
+    assert has_label('Asset', 'Asset')
+    assert has_label('Asset::AssetType:Hostname', 'Asset')
+    assert has_label('AssetType:Hostname::Asset', 'AssetType:Hostname')
+    assert not has_label('Asset::AssetType:Hostname', 'AssetType:Host')
+    assert not has_label('Team', 'Asset')
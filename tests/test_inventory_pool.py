@@ -0,0 +1,111 @@
+"""Tests for the class ``InventoryClientPool``."""
+
+# pylint: disable=redefined-outer-name
+
+import pytest
+
+from conftest import (
+    get_gremlin_endpoint,
+    get_auth_mode,
+)
+
+from graph_asset_inventory_api.inventory.pool import (
+    InventoryClientPool,
+    PoolExhaustedError,
+)
+
+
+@pytest.fixture
+def pool(g, universe):  # pylint: disable=unused-argument
+    """Returns an opened ``InventoryClientPool`` of size 2. It takes care of
+    closing the pool after finishing the test."""
+    pool = InventoryClientPool(
+        get_gremlin_endpoint(),
+        get_auth_mode(),
+        size=2,
+        health_check_interval=30,
+    )
+    pool.open()
+
+    yield pool
+
+    pool.close()
+
+
+def test_pool_open(pool):
+    """Tests that the method ``open`` of the class ``InventoryClientPool``
+    creates all the clients of the pool."""
+    assert pool.size == 2
+
+    stats = pool.stats()
+    assert stats['size'] == 2
+    assert stats['clients'] == 2
+    assert stats['idle'] == 2
+    assert stats['in_use'] == 0
+    assert stats['created'] == 2
+
+
+def test_pool_acquire_release(pool, init_teams):
+    """Tests the methods ``acquire`` and ``release`` of the class
+    ``InventoryClientPool``."""
+    cli = pool.acquire()
+    assert len(cli.teams()) == len(init_teams)
+
+    stats = pool.stats()
+    assert stats['idle'] == 1
+    assert stats['in_use'] == 1
+    assert stats['acquired'] == 1
+
+    pool.release(cli)
+
+    stats = pool.stats()
+    assert stats['idle'] == 2
+    assert stats['in_use'] == 0
+    assert stats['created'] == 2
+
+
+def test_pool_exhausted_error(pool):
+    """Tests that a ``PoolExhaustedError`` exception is raised when all the
+    clients are in use and none is released before the timeout."""
+    cli0 = pool.acquire()
+    cli1 = pool.acquire()
+
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire(timeout=0.1)
+
+    pool.release(cli0)
+    pool.release(cli1)
+
+
+def test_pool_release_unknown_client(pool, cli):
+    """Tests that a client that does not belong to the pool cannot be
+    released."""
+    with pytest.raises(ValueError):
+        pool.release(cli)
+
+
+def test_pool_replace_dead_client(pool, init_teams):
+    """Tests that a client that fails the health check is replaced."""
+    cli = pool.acquire()
+    cli.close()
+    pool.release(cli, healthy=False)
+
+    # Acquire both clients to make sure the dead one is checked.
+    cli0 = pool.acquire()
+    cli1 = pool.acquire()
+    assert len(cli0.teams()) == len(init_teams)
+    assert len(cli1.teams()) == len(init_teams)
+
+    stats = pool.stats()
+    assert stats['clients'] == 2
+    assert stats['created'] == 3
+    assert stats['replaced'] == 1
+
+    pool.release(cli0)
+    pool.release(cli1)
+
+
+def test_pool_wrong_size():
+    """Tests that the size of the pool must be greater than zero."""
+    with pytest.raises(ValueError):
+        InventoryClientPool(get_gremlin_endpoint(), get_auth_mode(), size=0)
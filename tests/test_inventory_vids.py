@@ -0,0 +1,57 @@
+"""Tests for the ``vids`` module."""
+
+import pytest
+
+from graph_asset_inventory_api.inventory import AssetID, CURRENT_UNIVERSE
+from graph_asset_inventory_api.inventory.universe import (
+    Universe,
+    UniverseVersion,
+)
+from graph_asset_inventory_api.inventory.vids import (
+    NaturalVertexIDs,
+    vertex_ids,
+)
+
+
+def test_natural_vids():
+    """Tests that the natural vertex IDs only depend on the universe, the kind
+    of vertex and its natural key."""
+    vids = NaturalVertexIDs()
+    other_universe = Universe(UniverseVersion.from_int_version(
+        CURRENT_UNIVERSE.version.int_version + 1))
+
+    team_vid = vids.team(CURRENT_UNIVERSE, 'identifier0')
+    asset_vid = vids.asset(CURRENT_UNIVERSE, AssetID('type0', 'identifier0'))
+
+    assert team_vid == vids.team(CURRENT_UNIVERSE, 'identifier0')
+    assert asset_vid == \
+        vids.asset(CURRENT_UNIVERSE, AssetID('type0', 'identifier0'))
+
+    assert team_vid != vids.team(CURRENT_UNIVERSE, 'identifier1')
+    assert team_vid != vids.team(other_universe, 'identifier0')
+    assert asset_vid != \
+        vids.asset(other_universe, AssetID('type0', 'identifier0'))
+    assert asset_vid != \
+        vids.asset(CURRENT_UNIVERSE, AssetID('type0-identifier0', ''))
+    assert team_vid != asset_vid
+
+
+def test_natural_eids():
+    """Tests that the natural edge IDs only depend on the label of the edge
+    and the IDs of its endpoints, in order."""
+    vids = NaturalVertexIDs()
+
+    eid = vids.edge('parent_of', 'vid0', 'vid1')
+    assert eid == vids.edge('parent_of', 'vid0', 'vid1')
+    assert eid != vids.edge('parent_of', 'vid1', 'vid0')
+    assert eid != vids.edge('owns', 'vid0', 'vid1')
+
+
+def test_vertex_ids():
+    """Tests the function ``vertex_ids``."""
+    assert vertex_ids('random') is None
+    assert not vertex_ids('natural').fallback
+    assert vertex_ids('hybrid').fallback
+
+    with pytest.raises(ValueError):
+        vertex_ids('sequential')
@@ -0,0 +1,145 @@
+"""Tests for the migrations of the graph."""
+
+from datetime import datetime
+
+import pytest
+
+from helpers import compare_unsorted_list
+
+from graph_asset_inventory_api.inventory import (
+    Asset,
+    ParentOf,
+    NotFoundError,
+    CURRENT_UNIVERSE,
+)
+from graph_asset_inventory_api.inventory.vids import NaturalVertexIDs
+from graph_asset_inventory_api.migrations import (
+    migrate_natural_vids,
+    migrate_typed_labels,
+    backfill_asset_keys,
+)
+
+
+def test_migrate_natural_vids(
+    cli,
+    natural_cli,
+    init_teams,
+    init_assets,
+    init_parents,
+):
+    """Tests that the ``natural-vids`` migration replaces the random IDs of
+    the teams, assets and relationships with their natural IDs."""
+    total = len(init_teams) + len(init_assets)
+    total_edges = sum(len(parents) for parents in init_parents.values())
+
+    # The edges are reported too, because their vertices are not migrated.
+    stats = migrate_natural_vids(cli, page_size=2, dry_run=True)
+    assert stats == {
+        'migrated': total + total_edges,
+        'conflicts': 0,
+        'failed': 0,
+    }
+    assert compare_unsorted_list(cli.teams(), init_teams, lambda x: x.vid)
+
+    stats = migrate_natural_vids(cli, page_size=2)
+    assert stats == {
+        'migrated': total,
+        'conflicts': 0,
+        'failed': 0,
+    }
+    check_natural_vids(natural_cli, init_teams, init_assets, init_parents)
+
+    stats = migrate_natural_vids(cli)
+    assert stats == {
+        'migrated': 0,
+        'conflicts': 0,
+        'failed': 0,
+    }
+
+
+def check_natural_vids(natural_cli, init_teams, init_assets, init_parents):
+    """Checks that the teams, assets and relationships created by the
+    fixtures ``init_teams``, ``init_assets`` and ``init_parents`` have their
+    natural IDs and keep their fields."""
+    vids = NaturalVertexIDs()
+
+    for team in init_teams:
+        dbteam = natural_cli.team_identifier(team.identifier)
+        assert dbteam.vid == vids.team(CURRENT_UNIVERSE, team.identifier)
+        assert dbteam.name == team.name
+
+    for asset in init_assets:
+        dbasset = natural_cli.asset_id(asset.asset_id)
+        assert dbasset.vid == vids.asset(CURRENT_UNIVERSE, asset.asset_id)
+        assert dbasset.time_attr == asset.time_attr
+
+    vid_assets = {a.vid: a for a in init_assets}
+    for child_vid, parents in init_parents.items():
+        child_id = vid_assets[child_vid].asset_id
+        dbparents = natural_cli.parents(
+            vids.asset(CURRENT_UNIVERSE, child_id))
+        assert sorted(p.parent_vid for p in dbparents) == sorted(
+            vids.asset(CURRENT_UNIVERSE, vid_assets[p.parent_vid].asset_id)
+            for p in parents
+        )
+        for dbparent in dbparents:
+            assert dbparent.eid == vids.edge(
+                'parent_of', dbparent.parent_vid, dbparent.child_vid)
+
+
+def test_migrate_natural_edge_ids(cli, hybrid_cli, init_assets):
+    """Tests that the ``natural-vids`` migration replaces the random IDs of
+    the relationships between assets that already had natural IDs."""
+    vids = NaturalVertexIDs()
+    timestamp = datetime.fromisoformat('2021-07-01T01:00:00+00:00')
+    expiration = datetime.fromisoformat('2021-07-07T01:00:00+00:00')
+
+    # Create the assets with natural IDs and the relationship with a random
+    # ID.
+    upserts = [
+        (Asset(init_assets[0].asset_id), expiration, timestamp),
+        (Asset(init_assets[1].asset_id), expiration, timestamp),
+    ]
+    stats = migrate_natural_vids(cli)
+    assert stats['migrated'] == len(init_assets)
+    (parent_vid, _), (child_vid, _) = hybrid_cli.set_assets(upserts)
+    dbparentof, _ = cli.set_parent_of(
+        ParentOf(parent_vid, child_vid), expiration, timestamp)
+
+    stats = migrate_natural_vids(cli)
+    assert stats == {'migrated': 1, 'conflicts': 0, 'failed': 0}
+
+    dbparents = hybrid_cli.parents(child_vid)
+    assert len(dbparents) == 1
+    assert dbparents[0].eid == \
+        vids.edge('parent_of', parent_vid, child_vid)
+    assert dbparents[0].eid != dbparentof.eid
+    assert dbparents[0].time_attr == dbparentof.time_attr
+
+
+def test_backfill_asset_keys(cli, composite_cli, init_assets):
+    """Tests that the ``asset-keys`` migration sets the composite key of the
+    assets that do not have it."""
+    for asset in init_assets:
+        with pytest.raises(NotFoundError):
+            composite_cli.asset_id(asset.asset_id)
+
+    assert backfill_asset_keys(cli, page_size=2) == len(init_assets)
+
+    for asset in init_assets:
+        assert composite_cli.asset_id(asset.asset_id) == asset
+
+    assert backfill_asset_keys(cli) == 0
+
+
+def test_migrate_typed_labels_dry_run(cli, init_assets):
+    """Tests that the ``typed-labels`` migration reports the assets without
+    the label of their type. The migration itself requires a graph with
+    multi-label support."""
+    stats = migrate_typed_labels(cli, page_size=2, dry_run=True)
+    assert stats == {
+        'migrated': len(init_assets),
+        'conflicts': 0,
+        'failed': 0,
+    }
+    assert compare_unsorted_list(cli.assets(), init_assets, lambda x: x.vid)